@@ -0,0 +1,358 @@
+from collections import deque
+from string import ascii_uppercase
+from Literal import SymbolTable
+from Clause import Clause
+
+class _Partition:
+    """
+    Ordered partition of the vertices of a clause set's graph, refined in place.
+    
+    Vertices 0 .. 2 * num_vars - 1 are the literals (2 * v is variable v positive, 2 * v + 1
+    negated) and the rest are the clauses; a literal is joined to its complement and to its
+    clauses. Cells are runs of one ordered list, and a vertex's color is the position where
+    its cell starts, so the colors order the cells the same way under any renaming.
+    """
+    
+    def __init__(self, order: list, color: list, position: list, end: dict):
+        self.__order = order
+        self.__color = color
+        self.__position = position
+        # Maps the start of every cell to the position after its last vertex
+        self.__end = end
+    
+    @classmethod
+    def unit(cls, num_literals: int, num_clauses: int) -> '_Partition':
+        """Return the partition with one cell of literals followed by one cell of clauses"""
+        size = num_literals + num_clauses
+        color = [0] * num_literals + [num_literals] * num_clauses
+        end = {num_literals: size}
+        if num_literals:
+            end[0] = num_literals
+        return cls(list(range(size)), color, list(range(size)), end)
+    
+    def copy(self) -> '_Partition':
+        return _Partition(self.__order[:], self.__color[:], self.__position[:], dict(self.__end))
+    
+    @property
+    def colors(self) -> list:
+        """The color of every vertex"""
+        return self.__color
+    
+    def cells(self) -> list:
+        """Return the starts of all cells, in order"""
+        return sorted(self.__end)
+    
+    def first_open_cell(self, start: int, stop: int):
+        """Return the vertices of the first cell with several vertices between positions start and stop, or None"""
+        end = self.__end
+        while start < stop:
+            if end[start] - start > 1:
+                return self.__order[start:end[start]]
+            start = end[start]
+        return None
+    
+    def individualize(self, vertex: int) -> int:
+        """Split vertex off into a cell of its own, right after the rest of its cell, and return that cell"""
+        order, position = self.__order, self.__position
+        start = self.__color[vertex]
+        last = self.__end[start] - 1
+        other = order[last]
+        order[position[vertex]], position[other] = other, position[vertex]
+        order[last], position[vertex] = vertex, last
+        self.__end[start] = last
+        self.__end[last] = last + 1
+        self.__color[vertex] = last
+        return last
+    
+    def refine(self, adjacency: list, splitters: list) -> None:
+        """
+        Refine the partition until every vertex of a cell has as many neighbours in each
+        cell as the other vertices of its cell.
+        
+        splitters are the cells the partition may not be stable against yet. Each one in
+        turn splits the cells of its neighbours by their number of neighbours in it, and the
+        new cells become splitters, except for the largest part of a cell that was already
+        stable: vertices of that part are told apart by the other parts. Only the cells
+        next to a splitter are touched, so refining after an individualization costs
+        little more than the split it causes.
+        """
+        order, color, position, end = self.__order, self.__color, self.__position, self.__end
+        queue = deque(splitters)
+        queued = set(splitters)
+        while queue:
+            splitter = queue.popleft()
+            queued.discard(splitter)
+            counts = {}
+            for u in order[splitter:end[splitter]]:
+                for v in adjacency[u]:
+                    counts[v] = counts.get(v, 0) + 1
+            touched = {}
+            for v in counts:
+                touched.setdefault(color[v], []).append(v)
+            for cell in sorted(touched):
+                members = touched[cell]
+                cell_end = end[cell]
+                if len(members) == cell_end - cell and len({counts[v] for v in members}) == 1:
+                    continue
+                # Gather the touched vertices at the end of the cell, fewest neighbours first;
+                # untouched ones (no neighbour in the splitter) stay in front
+                tail = cell_end - len(members)
+                member_set = set(members)
+                outside = [v for v in members if position[v] < tail]
+                spots = [p for p in range(tail, cell_end) if order[p] not in member_set]
+                for v, p in zip(outside, spots):
+                    u = order[p]
+                    order[position[v]], position[u] = u, position[v]
+                    order[p], position[v] = v, p
+                members.sort(key=counts.__getitem__)
+                starts = [cell] if tail > cell else []
+                previous = None
+                for offset, v in enumerate(members):
+                    p = tail + offset
+                    order[p], position[v] = v, p
+                    if counts[v] != previous:
+                        previous = counts[v]
+                        starts.append(p)
+                bounds = starts + [cell_end]
+                for k, start in enumerate(starts):
+                    end[start] = bounds[k + 1]
+                    if start != cell:
+                        for p in range(start, bounds[k + 1]):
+                            color[order[p]] = start
+                if cell in queued:
+                    fresh = starts[1:]
+                else:
+                    largest = max(starts, key=lambda start: end[start] - start)
+                    fresh = [start for start in starts if start != largest]
+                for start in fresh:
+                    queued.add(start)
+                    queue.append(start)
+
+
+def _certificate(literal_colors: list, clause_literals: list) -> tuple:
+    """Describe the clause set in terms of the positions given by a discrete literal coloring"""
+    complements = tuple(sorted((min(literal_colors[2 * v], literal_colors[2 * v + 1]),
+                                max(literal_colors[2 * v], literal_colors[2 * v + 1]))
+                               for v in range(len(literal_colors) // 2)))
+    clauses = tuple(sorted(tuple(sorted(literal_colors[literal] for literal in literals))
+                           for literals in clause_literals))
+    return complements, clauses
+
+
+class _Orbits:
+    """Union-find over the members of a cell, merging the orbits of automorphisms as they are found"""
+    
+    def __init__(self, cell: list, fixed: list):
+        self.__parent = {literal: literal for literal in cell}
+        self.__fixed = set(fixed)
+        self.__seen = 0
+    
+    def find(self, literal: int) -> int:
+        parent = self.__parent
+        while parent[literal] != literal:
+            parent[literal] = parent[parent[literal]]
+            literal = parent[literal]
+        return literal
+    
+    def update(self, automorphisms: list) -> None:
+        """
+        Merge orbits under the automorphisms added since the last update that fix every
+        literal in fixed. Each automorphism maps only the literals it moves.
+        """
+        parent = self.__parent
+        for k in range(self.__seen, len(automorphisms)):
+            automorphism = automorphisms[k]
+            if any(literal in self.__fixed for literal in automorphism):
+                continue
+            for literal, image in automorphism.items():
+                if literal in parent:
+                    parent[self.find(image)] = self.find(literal)
+        self.__seen = len(automorphisms)
+
+
+def _components(num_vars: int, clause_literals: list) -> list:
+    """Group the clauses into connected components (clauses sharing a variable), as lists of clause indices"""
+    parent = list(range(num_vars))
+    
+    def find(v):
+        while parent[v] != v:
+            parent[v] = parent[parent[v]]
+            v = parent[v]
+        return v
+    
+    for literals in clause_literals:
+        for literal in literals[1:]:
+            parent[find(literal >> 1)] = find(literals[0] >> 1)
+    groups = {}
+    for c, literals in enumerate(clause_literals):
+        # The empty clause shares no variable, so it is a component of its own
+        groups.setdefault(find(literals[0] >> 1) if literals else -1, []).append(c)
+    return list(groups.values())
+
+
+def _canonical_coloring(num_vars: int, clause_literals: list, max_nodes: int = None) -> tuple:
+    """
+    Search for the canonical discrete coloring of the literals of one clause set.
+    
+    Each node of the search refines the partition and individualizes, in turn, each member
+    of the first cell with several literals. The search runs on an explicit stack, so deep
+    individualization sequences do not hit the recursion limit. With max_nodes, the search
+    stops after that many nodes once it has reached a leaf and keeps the best leaf so far.
+    
+    Returns:
+        A (certificate, literal_colors, complete) triple for the leaf with the smallest
+        certificate; complete is False if max_nodes cut the search short
+    """
+    num_literals = 2 * num_vars
+    adjacency = [[literal ^ 1] for literal in range(num_literals)]
+    adjacency += [[] for _ in clause_literals]
+    for c, literals in enumerate(clause_literals):
+        for literal in literals:
+            adjacency[literal].append(num_literals + c)
+            adjacency[num_literals + c].append(literal)
+    
+    best = None
+    automorphisms = []
+    nodes = 0
+    # One frame per inner node: [partition, fixed, target cell, orbits, explored, position]
+    stack = []
+    
+    def enter(partition, fixed):
+        """Push a refined node, or score it if it is a leaf; return where to backjump to, or None"""
+        nonlocal best, nodes
+        nodes += 1
+        target = partition.first_open_cell(0, num_literals)
+        if target is not None:
+            stack.append([partition, fixed, target, _Orbits(target, fixed), set(), 0])
+            return None
+        literal_colors = partition.colors[:num_literals]
+        certificate = _certificate(literal_colors, clause_literals)
+        if best is None or certificate < best[0]:
+            best = (certificate, literal_colors, fixed)
+        elif certificate == best[0]:
+            # Both leaves describe the same clause set, so mapping each literal to the
+            # one in the same position of the best leaf is an automorphism. It fixes the
+            # literals both paths individualized first and maps the rest of this branch
+            # onto the already explored branch of the best leaf, so return to where
+            # the two paths split
+            by_position = {color: literal for literal, color in enumerate(best[1])}
+            automorphisms.append({literal: by_position[color] for literal, color in enumerate(literal_colors)
+                                  if by_position[color] != literal})
+            split = 0
+            while fixed[split] == best[2][split]:
+                split += 1
+            return split
+        return None
+    
+    root = _Partition.unit(num_literals, len(clause_literals))
+    root.refine(adjacency, root.cells())
+    split = enter(root, [])
+    while stack:
+        if max_nodes is not None and nodes >= max_nodes and best is not None:
+            return best[0], best[1], False
+        frame = stack[-1]
+        partition, fixed, target, orbits, explored, position = frame
+        if split is not None and split < len(fixed):
+            stack.pop()
+            continue
+        split = None
+        # Skip members that an automorphism fixing this node maps to an explored member
+        literal = None
+        while position < len(target):
+            candidate = target[position]
+            position += 1
+            if explored:
+                orbits.update(automorphisms)
+                root = orbits.find(candidate)
+                if any(orbits.find(other) == root for other in explored):
+                    continue
+            literal = candidate
+            break
+        frame[5] = position
+        if literal is None:
+            stack.pop()
+            continue
+        explored.add(literal)
+        child = partition.copy()
+        child.refine(adjacency, [child.individualize(literal)])
+        split = enter(child, fixed + [literal])
+    return best[0], best[1], True
+
+
+def canonical_form(clauses: list, max_nodes: int = None) -> tuple:
+    """
+    Compute a canonical form of a set of clauses, invariant under renaming variables,
+    flipping the polarity of variables and reordering clauses or literals.
+    
+    Literals and clauses are the nodes of a graph (literals joined to their clauses and to
+    their complement) whose coloring is refined until it is stable. Whenever a cell of
+    literals is left with several members, each member is individualized in turn and the
+    search continues; the leaf with the smallest certificate gives the canonical order.
+    Automorphisms found along the way (leaves with equal certificates) prune branches that
+    would only repeat earlier ones. Each connected component of the clause set is
+    canonized on its own and the components are then ordered by certificate, so
+    repeated independent parts do not multiply the search.
+    
+    Highly symmetric connected clause sets can still need many search nodes; max_nodes
+    bounds them per component. A search cut short keeps the best leaf found, so the result
+    is still the clause set under some renaming, only not necessarily the canonical one.
+    
+    Args:
+        clauses: Iterable of Clause objects (duplicates are ignored)
+        max_nodes: Optional cap on the search nodes per connected component
+    
+    Returns:
+        A (canonical_clauses, renaming) pair: canonical_clauses is a sorted list of Clauses
+        over the letters A, B, ... (x_1, x_2, ... for more than 26 variables), equal for two
+        clause sets exactly when they are the same up to renaming, polarity and order; renaming
+        maps the positive Literal of every original variable to the canonical Literal it
+        becomes (negated if the variable's polarity was flipped)
+    """
+    clauses = list(dict.fromkeys(clauses))
+    # Positive literal of each variable, by letter
+    positives = {}
+    for clause in clauses:
+        for lit in clause.get_literals():
+            positives.setdefault(lit.letter, lit.negate() if lit.is_negated else lit)
+    variables = sorted(positives.values(), key=lambda lit: (lit.var_id, lit.letter))
+    dense = {lit.letter: v for v, lit in enumerate(variables)}
+    # Literal 2*v is variable v positive, 2*v + 1 is v negated
+    clause_literals = [[2 * dense[lit.letter] + lit.is_negated for lit in clause.get_literals()]
+                       for clause in clauses]
+    
+    parts = []
+    for members in _components(len(variables), clause_literals):
+        # Number the component's variables 0, 1, ... in a local copy of its clauses
+        local = {}
+        for c in members:
+            for literal in clause_literals[c]:
+                local.setdefault(literal >> 1, len(local))
+        component_literals = [[2 * local[literal >> 1] + (literal & 1) for literal in clause_literals[c]]
+                              for c in members]
+        certificate, literal_colors, _ = _canonical_coloring(len(local), component_literals, max_nodes)
+        parts.append((certificate, list(local), literal_colors))
+    parts.sort(key=lambda part: part[0])
+    
+    # Canonical variable k is taken component by component; within a component, variables
+    # come in the order of their smaller position, which is the canonical positive literal
+    def name(k):
+        return ascii_uppercase[k] if len(variables) <= len(ascii_uppercase) else f"x_{k + 1}"
+    
+    # The canonical names get a table of their own rather than growing SymbolTable.default
+    table = SymbolTable()
+    canonical = [None] * (2 * len(variables))
+    renaming = {}
+    k = 0
+    for _, component_variables, literal_colors in parts:
+        order = sorted(range(len(component_variables)),
+                       key=lambda u: min(literal_colors[2 * u], literal_colors[2 * u + 1]))
+        for u in order:
+            v = component_variables[u]
+            flipped = literal_colors[2 * u + 1] < literal_colors[2 * u]
+            canonical[2 * v] = table.literal(flipped, name(k))
+            canonical[2 * v + 1] = canonical[2 * v].negate()
+            renaming[variables[v]] = canonical[2 * v]
+            k += 1
+    canonical_clauses = sorted((Clause({canonical[literal] for literal in literals}) for literals in clause_literals),
+                               key=lambda clause: sorted((lit.letter, lit.is_negated) for lit in clause.get_literals()))
+    return canonical_clauses, renaming
@@ -1,42 +1,219 @@
-from Literal import Literal
+from Literal import Literal, SymbolTable
+
+
+def _signature(positive: int, negative: int) -> int:
+    """
+    Fold the letter bitmasks of a clause into a 64-bit signature.
+    
+    Positive letters land in the low 32 bits and negated letters in the high 32 bits,
+    with letter i on bit i % 32. If clause C subsumes clause D then every bit of C's
+    signature is set in D's, so a missing bit rules subsumption out cheaply.
+    """
+    return _fold(positive) | (_fold(negative) << 32)
+
+
+def _fold(mask: int) -> int:
+    """OR the 32-bit words of mask together"""
+    if mask.bit_length() <= 64:
+        return (mask | (mask >> 32)) & 0xFFFFFFFF
+    # Shifting a long mask word by word is quadratic in its length, while clauses only
+    # have a few letters, so fold one set bit at a time instead
+    folded = 0
+    while mask:
+        low = mask & -mask
+        folded |= 1 << ((low.bit_length() - 1) & 31)
+        mask ^= low
+    return folded
+
+
+def resolve_masks(positive1: int, negative1: int, positive2: int, negative2: int, bit: int) -> tuple:
+    """
+    Return the (positive, negative) masks of the resolvent of two clauses on a letter bit.
+    
+    Every other letter is kept from both clauses, while the resolved letter only survives
+    in a polarity that both clauses share.
+    """
+    positive = ((positive1 | positive2) & ~bit) | (positive1 & positive2)
+    negative = ((negative1 | negative2) & ~bit) | (negative1 & negative2)
+    return positive, negative
+
+
+def single_clash_resolvents(given: tuple, partners: list) -> list:
+    """
+    Resolve one clause against a list of partners, using the mask encoding.
+    
+    Args:
+        given: (positive, negative) masks of the given clause
+        partners: List of (index, positive, negative) partner encodings
+    
+    Returns:
+        List of (index, bit, positive, negative) tuples, one per partner clashing with the
+        given clause on exactly one letter: the partner index, the letter bit resolved on
+        and the resolvent masks. Pairs clashing on several letters only have tautological
+        resolvents and are left out.
+    """
+    given_positive, given_negative = given
+    results = []
+    for index, positive, negative in partners:
+        clash = (given_positive & negative) | (given_negative & positive)
+        if clash == 0 or clash & (clash - 1):
+            continue
+        results.append((index, clash) + resolve_masks(given_positive, given_negative, positive, negative, clash))
+    return results
+
 
 class Clause:
         """Inner class representing a Clause (a set of Literals)"""
         
-        def __init__(self, literals: set = None, leftParent = None, rightParent = None):
+        def __init__(self, literals: set = None, leftParent = None, rightParent = None, table: SymbolTable = None):
             """
             Initialize a Clause with a set of Literals.
             
+            The literals are stored as two integer bitmasks, one for the letters that
+            occur positively and one for the letters that occur negated, where bit i
+            stands for the letter whose var_id is i in the clause's symbol table (bit 0
+            is A, bit 25 is Z).
+            
             Args:
                 literals: Set of Literal objects (defaults to empty set)
                 leftParent: Optional Clause representing the left parent in a resolution
                 rightParent: Optional Clause representing the right parent in a resolution
+                table: SymbolTable numbering the letters (defaults to the table of the
+                    first literal, or SymbolTable.default); literals of other tables are
+                    translated into it
             """
-            self.__literals = literals if literals is not None else set()
+            positive = 0
+            negative = 0
+            if literals is not None:
+                for lit in literals:
+                    if table is None:
+                        table = lit.table
+                    elif lit.table is not table:
+                        lit = table.translate(lit)
+                    if lit.is_negated:
+                        negative |= 1 << lit.var_id
+                    else:
+                        positive |= 1 << lit.var_id
+            if table is None:
+                table = SymbolTable.default
+            self.__positive = positive
+            self.__negative = negative
+            self.__table = table
+            self.__hash = table.hash_masks(positive, negative)
+            self.__signature = _signature(positive, negative)
             self.__leftParent = leftParent
             self.__rightParent = rightParent
-    
-    
+        
+        @classmethod
+        def from_masks(cls, positive: int, negative: int, leftParent = None, rightParent = None,
+                       table: SymbolTable = None) -> 'Clause':
+            """
+            Build a Clause directly from its positive and negative letter bitmasks.
+            
+            Args:
+                positive: Bitmask of the letters occurring as positive literals
+                negative: Bitmask of the letters occurring as negated literals
+                leftParent: Optional Clause representing the left parent in a resolution
+                rightParent: Optional Clause representing the right parent in a resolution
+                table: SymbolTable the masks refer to (defaults to the table of leftParent,
+                    or SymbolTable.default)
+            
+            Returns:
+                A new Clause with the given literals and parents
+            """
+            if table is None:
+                table = leftParent.__table if leftParent is not None else SymbolTable.default
+            clause = cls.__new__(cls)
+            clause.__positive = positive
+            clause.__negative = negative
+            clause.__table = table
+            clause.__hash = table.hash_masks(positive, negative)
+            clause.__signature = _signature(positive, negative)
+            clause.__leftParent = leftParent
+            clause.__rightParent = rightParent
+            return clause
+        
+        def in_table(self, table: SymbolTable) -> 'Clause':
+            """Return this clause with its letters numbered by table (self if it already is) and the same parents"""
+            if self.__table is table:
+                return self
+            return Clause(self.get_literals(), self.__leftParent, self.__rightParent, table)
+        
+        
         def get_parents(self) -> tuple:
             """Return a tuple of the left and right parent Clauses (or None if not applicable)"""
             return (self.__leftParent, self.__rightParent)
-
+        
+        @property
+        def positive_mask(self) -> int:
+            """Get the bitmask of letters occurring as positive literals"""
+            return self.__positive
+        
+        @property
+        def negative_mask(self) -> int:
+            """Get the bitmask of letters occurring as negated literals"""
+            return self.__negative
+        
+        @property
+        def table(self) -> SymbolTable:
+            """Get the SymbolTable numbering the letters of the masks"""
+            return self.__table
+        
+        @property
+        def signature(self) -> int:
+            """Get the 64-bit subsumption signature of this clause"""
+            return self.__signature
+        
         def get_literals(self) -> set:
             """Get the set of literals in this clause"""
-            return self.__literals.copy()
+            return set(self.__iter_literals())
+        
+        def __iter_literals(self):
+            """Yield the literals of this clause ordered by var_id, positive before negated"""
+            letters = self.__positive | self.__negative
+            while letters:
+                low = letters & -letters
+                positive = self.__table.from_var_id(low.bit_length() - 1)
+                if self.__positive & low:
+                    yield positive
+                if self.__negative & low:
+                    yield positive.negate()
+                letters ^= low
+        
+        def __len__(self) -> int:
+            """Return the number of literals in this clause"""
+            return self.__positive.bit_count() + self.__negative.bit_count()
+        
+        def is_tautology(self) -> bool:
+            """Return True if some letter occurs both positive and negated in this clause"""
+            return (self.__positive & self.__negative) != 0
+        
+        def subsumes(self, other: 'Clause') -> bool:
+            """Return True if every literal of this clause also occurs in other"""
+            other = other.in_table(self.__table)
+            if self.__signature & ~other.__signature:
+                return False
+            return not (self.__positive & ~other.__positive) and not (self.__negative & ~other.__negative)
+        
+        def clash_mask(self, other: 'Clause') -> int:
+            """Return the bitmask of letters occurring with opposite signs in this clause and other"""
+            other = other.in_table(self.__table)
+            return (self.__positive & other.__negative) | (self.__negative & other.__positive)
         
         def __repr__(self) -> str:
-            return f"{{{', '.join(str(lit) for lit in self.__literals)}}}"
+            return f"{{{', '.join(str(lit) for lit in self.__iter_literals())}}}"
         
         def __eq__(self, other) -> bool:
             """Check equality between two Clauses"""
             if not isinstance(other, Clause):
                 return False
-            return self.__literals == other.__literals
+            if other.__table is not self.__table:
+                return self.__hash == other.__hash and self.get_literals() == other.get_literals()
+            return self.__positive == other.__positive and self.__negative == other.__negative
         
         def __hash__(self) -> int:
             """Make Clause hashable for use in sets"""
-            return hash(frozenset(self.__literals))
+            return self.__hash
         
         @staticmethod
         def resolve(clause1: 'Clause', clause2: 'Clause', literal: 'Literal') -> 'Clause':
@@ -47,67 +224,43 @@ class Clause:
                 clause1: First clause
                 clause2: Second clause
                 literal: The literal to resolve on
-                
+            
             Returns:
                 A new Clause containing all literals from both clauses except the literal and its negation
                 (unless they appear in both clauses, in which case they are kept)
-                
+            
             Raises:
                 ValueError: If the literal doesn't appear as positive in one clause and negative in the other
             """
-            literals1 = clause1.get_literals()
-            literals2 = clause2.get_literals()
-            
-            # Check if literal is in clause1 and its negation is in clause2, or vice versa
-            # Create lookup maps for efficiency
-            lit_map1 = {(lit.letter, lit.is_negated): lit for lit in literals1}
-            lit_map2 = {(lit.letter, lit.is_negated): lit for lit in literals2}
-            
-            lit_key = (literal.letter, literal.is_negated)
-            neg_key = (literal.letter, not literal.is_negated)
-            
-            literal_in_clause1 = lit_key in lit_map1
-            negated_in_clause2 = neg_key in lit_map2
-            literal_in_clause2 = lit_key in lit_map2
-            negated_in_clause1 = neg_key in lit_map1
-            
-            if not ((literal_in_clause1 and negated_in_clause2) or (literal_in_clause2 and negated_in_clause1)):
+            bit = 1 << clause1.__table.translate(literal).var_id
+            if not (clause1.clash_mask(clause2) & bit):
                 raise ValueError(
                     f"Cannot resolve on literal {literal}: "
                     f"literal must appear positive in one clause and negative in the other"
                 )
+            return Clause.resolve_bit(clause1, clause2, bit)
+        
+        @staticmethod
+        def resolve_bit(clause1: 'Clause', clause2: 'Clause', bit: int) -> 'Clause':
+            """
+            Resolve two clauses on the letter given by a single-bit mask, without checking
+            that the letter clashes. Callers must make sure bit is set in clause1.clash_mask(clause2).
+            
+            Args:
+                clause1: First clause
+                clause2: Second clause
+                bit: Single-bit mask of the letter to resolve on
             
-            # Create the resolvent by combining both sets and removing literals appropriately
-            resolvent_literals = set()
-            
-            # If literal_in_clause1 and negated_in_clause2
-            if literal_in_clause1 and negated_in_clause2:
-                # Keep literals from clause1 except the literal being resolved (unless it's also in clause2)
-                for lit in literals1:
-                    if lit.letter != literal.letter or lit in literals2:
-                        resolvent_literals.add(lit)
-                
-                # Keep literals from clause2 except the negated literal being resolved (unless it's also in clause1)
-                for lit in literals2:
-                    if lit.letter != literal.letter or lit in literals1:
-                        resolvent_literals.add(lit)
-            
-            # If literal_in_clause2 and negated_in_clause1
-            elif literal_in_clause2 and negated_in_clause1:
-                # Keep literals from clause2 except the literal being resolved (unless it's also in clause1)
-                for lit in literals2:
-                    if lit.letter != literal.letter or lit in literals1:
-                        resolvent_literals.add(lit)
-                
-                # Keep literals from clause1 except the negated literal being resolved (unless it's also in clause2)
-                for lit in literals1:
-                    if lit.letter != literal.letter or lit in literals2:
-                        resolvent_literals.add(lit)
-            
-            return Clause(resolvent_literals, clause1, clause2)
+            Returns:
+                The resolvent, with clause1 and clause2 as its parents
+            """
+            other = clause2.in_table(clause1.__table)
+            positive, negative = resolve_masks(clause1.__positive, clause1.__negative,
+                                               other.__positive, other.__negative, bit)
+            return Clause.from_masks(positive, negative, clause1, clause2)
         
         @staticmethod
-        def parse(s: str) -> 'Clause':
+        def parse(s: str, table: SymbolTable = None) -> 'Clause':
             """
             Parse a string and return the corresponding Clause object.
             
@@ -117,10 +270,11 @@ class Clause:
             
             Args:
                 s: String to parse
-                
+                table: SymbolTable to number the letters in (default: SymbolTable.default)
+            
             Returns:
                 A Clause object containing the parsed literals
-                
+            
             Raises:
                 ValueError: If the string is not in the correct format or contains invalid literals
             """
@@ -149,7 +303,7 @@ class Clause:
                 if not literal_str:  # Skip empty strings
                     continue
                 try:
-                    literal = Literal.parse(literal_str)
+                    literal = (table or SymbolTable.default).parse(literal_str)
                     literals_set.add(literal)
                 except ValueError as e:
                     raise ValueError(f"Invalid literal in clause: {e}")
@@ -157,4 +311,4 @@ class Clause:
             if not literals_set:
                 raise ValueError("parse() resulted in an empty clause with no valid literals")
             
-            return Clause(literals_set)
+            return Clause(literals_set, table=table)
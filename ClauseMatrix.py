@@ -0,0 +1,189 @@
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is optional: the rest of the engine works without it, only ClauseMatrix needs it
+    np = None
+
+def _popcount(words):
+    """Count the set bits of every element of a uint64 array"""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words)
+    # NumPy before 2.0: add up the counts of the eight bytes of each word
+    table = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+    return table[words.view(np.uint8)].reshape(*words.shape, 8).sum(axis=-1, dtype=np.uint8)
+
+
+def _group_offsets(sizes):
+    """For groups of the given sizes laid out one after another, return each element's index in its group"""
+    starts = np.cumsum(sizes) - sizes
+    return np.arange(sizes.sum()) - np.repeat(starts, sizes)
+
+
+class ClauseMatrix:
+    """
+    NumPy view of a list of clauses as a packed polarity matrix, for analysis over all pairs.
+    
+    Each clause is a row of 64-bit words, one bit per letter, for its positive and for its
+    negated letters. The letters two clauses clash on are the bits of (positive of one AND
+    negated of the other), so a block of rows is compared against every clause with a few
+    vectorized ANDs and popcounts. Lists of clashing pairs are instead built from the
+    clauses containing each letter, in time proportional to the number of clashes, which
+    suits models with many clauses over many letters.
+    
+    Resolving two clauses that clash on two or more letters always gives a tautology, so the
+    counts also tell which pairs are worth resolving (assuming no clause is a tautology itself).
+    """
+    
+    # Rows per block of clash_counts(); a block needs about 8 * BLOCK_ROWS * len(self) bytes per word
+    BLOCK_ROWS = 1024
+    
+    def __init__(self, clauses: list):
+        """
+        Build the matrix of clauses.
+        
+        Args:
+            clauses: List of Clause objects; row i of the matrix is clauses[i]
+        
+        Raises:
+            ImportError: If NumPy is not installed
+        """
+        if np is None:
+            raise ImportError("ClauseMatrix needs NumPy, which is not installed (pip install numpy)")
+        # One column per letter, in var_id order
+        positives = {}
+        for clause in clauses:
+            for lit in clause.get_literals():
+                positives.setdefault(lit.letter, lit.negate() if lit.is_negated else lit)
+        letters = sorted(positives.values(), key=lambda lit: (lit.var_id, lit.letter))
+        column = {lit.letter: c for c, lit in enumerate(letters)}
+        rows = ([], [])
+        columns = ([], [])
+        for i, clause in enumerate(clauses):
+            for lit in clause.get_literals():
+                rows[lit.is_negated].append(i)
+                columns[lit.is_negated].append(column[lit.letter])
+        self.__letters = letters
+        self.__size = len(clauses)
+        words = max(1, (len(letters) + 63) // 64)
+        # Occurrences of each polarity as (row, column) arrays sorted by column
+        self.__occurrences = []
+        self.__words = []
+        for negated in (False, True):
+            row = np.array(rows[negated], dtype=np.intp)
+            col = np.array(columns[negated], dtype=np.intp)
+            order = np.argsort(col, kind="stable")
+            self.__occurrences.append((row[order], col[order]))
+            packed = np.zeros((len(clauses), words), dtype=np.uint64)
+            np.bitwise_or.at(packed, (row, col // 64), np.left_shift(np.uint64(1), (col % 64).astype(np.uint64)))
+            self.__words.append(packed)
+        # Smallest unsigned type holding a count of up to every letter
+        self.__count_type = np.min_scalar_type(len(letters))
+        self.__pairs = None
+    
+    def __len__(self) -> int:
+        """Return the number of clauses (rows)"""
+        return self.__size
+    
+    def letters(self) -> list:
+        """Return the positive Literal of every letter column, in column order"""
+        return list(self.__letters)
+    
+    def polarity(self):
+        """
+        Return the clauses x letters matrix of polarities as an int8 NumPy array: 1 where the
+        clause contains the letter, -1 where it contains its negation and 0 otherwise.
+        """
+        matrix = np.zeros((self.__size, len(self.__letters)), dtype=np.int8)
+        for value, (row, col) in zip((1, -1), self.__occurrences):
+            matrix[row, col] += value
+        return matrix
+    
+    def clash_counts(self, rows=None):
+        """
+        Return the number of letters each pair of clauses clashes on.
+        
+        Dense models are counted with the packed rows, sparse ones by scattering the counts
+        of clashing_pairs(), whichever means less work.
+        
+        Args:
+            rows: Optional sequence of row indices to restrict the first clause of the pairs to
+        
+        Returns:
+            A len(rows) x len(self) NumPy array of unsigned integers (len(self) x len(self)
+            by default): entry (r, j) counts the letters positive in one of clause rows[r] and
+            clause j and negated in the other. A clause paired with itself counts every
+            letter it holds in both polarities twice, as numResolveLiterals() does, so the
+            diagonal is 0 except for tautologies
+        """
+        rows = np.arange(self.__size) if rows is None else np.asarray(rows, dtype=np.intp)
+        positive, negative = self.__words
+        result = np.zeros((len(rows), self.__size), dtype=self.__count_type)
+        if self.__clash_incidences() * 16 < len(rows) * self.__size * positive.shape[1]:
+            # Few clashes for the size of the matrix: scatter the pair counts instead
+            pairs, counts = self.clashing_pairs()
+            position = np.full(self.__size, -1, dtype=np.intp)
+            position[rows] = np.arange(len(rows))
+            for here, there in ((0, 1), (1, 0)):
+                selected = position[pairs[:, here]] >= 0
+                result[position[pairs[selected, here]], pairs[selected, there]] = counts[selected]
+            # A tautology clashes with itself, once in each direction, as the packed rows count it
+            both = np.zeros(len(rows), dtype=self.__count_type)
+            for word in range(positive.shape[1]):
+                both += _popcount(positive[rows, word] & negative[rows, word]).astype(self.__count_type)
+            result[np.arange(len(rows)), rows] = 2 * both
+            return result
+        for start in range(0, len(rows), self.BLOCK_ROWS):
+            block = rows[start:start + self.BLOCK_ROWS]
+            counts = result[start:start + len(block)]
+            for word in range(positive.shape[1]):
+                counts += _popcount(positive[block, word, None] & negative[None, :, word])
+                counts += _popcount(negative[block, word, None] & positive[None, :, word])
+        return result
+    
+    def __clash_incidences(self) -> int:
+        """Return the number of (clause, clause, letter) clashes, counting each pair in one order"""
+        letters = len(self.__letters)
+        positive_sizes = np.bincount(self.__occurrences[0][1], minlength=letters)
+        negative_sizes = np.bincount(self.__occurrences[1][1], minlength=letters)
+        return int(positive_sizes @ negative_sizes)
+    
+    def clashing_pairs(self) -> tuple:
+        """
+        Return every pair of clauses sharing a complementary letter.
+        
+        Returns:
+            A (pairs, counts) pair of NumPy arrays: pairs is k x 2 and holds the (i, j) pairs
+            with i < j in row order, counts[k] is the number of letters pair k clashes on
+        """
+        if self.__pairs is None:
+            (positive_rows, positive_cols), (negative_rows, negative_cols) = self.__occurrences
+            letters = len(self.__letters)
+            negative_sizes = np.bincount(negative_cols, minlength=letters)
+            negative_starts = np.cumsum(negative_sizes) - negative_sizes
+            # Pair every positive occurrence with each negated occurrence of its letter
+            sizes = negative_sizes[positive_cols]
+            first = np.repeat(positive_rows, sizes)
+            second = negative_rows[np.repeat(negative_starts[positive_cols], sizes) + _group_offsets(sizes)]
+            distinct = first != second
+            low = np.minimum(first, second)[distinct]
+            high = np.maximum(first, second)[distinct]
+            keys, counts = np.unique(low * self.__size + high, return_counts=True)
+            pairs = np.column_stack((keys // self.__size, keys % self.__size)) if len(keys) else np.empty((0, 2), dtype=np.intp)
+            self.__pairs = (pairs, counts.astype(self.__count_type))
+        return self.__pairs
+    
+    def resolvable_pairs(self):
+        """
+        Return the pairs (i, j), i < j, of clauses that clash on exactly one letter, whose
+        resolvent is therefore not a tautology, as a k x 2 NumPy array in row order.
+        """
+        pairs, counts = self.clashing_pairs()
+        return pairs[counts == 1]
+    
+    def tautology_pairs(self):
+        """
+        Return the pairs (i, j), i < j, of clauses that clash on two or more letters, so that
+        resolving them on any letter gives a tautology, as a k x 2 NumPy array in row order.
+        """
+        pairs, counts = self.clashing_pairs()
+        return pairs[counts >= 2]
@@ -0,0 +1,77 @@
+from Clause import Clause
+
+class ClauseStore:
+    """
+    An insertion-ordered collection of unique Clauses.
+    
+    Clauses are kept in a list for index -> clause lookups and in a dict for
+    clause -> index lookups, so membership tests and deduplication are O(1).
+    """
+    
+    def __init__(self, clauses: list = None):
+        """
+        Initialize a ClauseStore, dropping duplicate clauses but keeping first-seen order.
+        
+        Args:
+            clauses: Optional iterable of Clause objects
+        """
+        self.__clauses = []
+        self.__indices = {}
+        if clauses is not None:
+            for clause in clauses:
+                self.add(clause)
+    
+    def add(self, clause: Clause) -> int:
+        """
+        Add a clause if it is not already stored.
+        
+        Args:
+            clause: The clause to add
+        
+        Returns:
+            The index of the clause (its existing index if an equal clause was already stored)
+        """
+        index = self.__indices.get(clause)
+        if index is None:
+            index = len(self.__clauses)
+            self.__clauses.append(clause)
+            self.__indices[clause] = index
+        return index
+    
+    def truncate(self, size: int) -> None:
+        """Remove every clause from index size on"""
+        for clause in self.__clauses[size:]:
+            del self.__indices[clause]
+        del self.__clauses[size:]
+    
+    def get_index(self, clause: Clause):
+        """Return the index of an equal stored clause, or None if there is none"""
+        return self.__indices.get(clause)
+    
+    def to_list(self) -> list:
+        """Return a new list of the stored clauses in insertion order"""
+        return self.__clauses.copy()
+    
+    def __getitem__(self, index: int) -> Clause:
+        return self.__clauses[index]
+    
+    def __len__(self) -> int:
+        return len(self.__clauses)
+    
+    def __iter__(self):
+        return iter(self.__clauses)
+    
+    def __contains__(self, clause) -> bool:
+        return clause in self.__indices
+    
+    def __eq__(self, other) -> bool:
+        """Two stores are equal if they hold equal clauses in the same order"""
+        if not isinstance(other, ClauseStore):
+            return False
+        return self.__clauses == other.__clauses
+    
+    def __hash__(self) -> int:
+        return hash(tuple(self.__clauses))
+    
+    def __repr__(self) -> str:
+        return f"ClauseStore({self.__clauses!r})"
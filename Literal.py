@@ -1,22 +1,54 @@
+import re
+import threading
+from string import ascii_uppercase
+
+# Valid variable names: a capital letter, or a letter followed by an index, like P12 or x_3
+_NAME = re.compile(r'[A-Z]|[A-Za-z]_?[0-9]+')
+
 class Literal:
-    """Class representing a Literal"""
+    """
+    Class representing a Literal.
     
-    def __init__(self, is_negated: bool, letter: str):
+    The letter of a literal is the name of its variable: a single capital letter, or a
+    letter followed by a numeric index (optionally after an underscore), such as P12 or
+    x_3. Every name gets a dense integer ID from a SymbolTable. Each ResolutionModel
+    numbers its own variables, and literals built on their own come from the shared
+    SymbolTable.default; in every table A to Z are IDs 0 to 25.
+    
+    Literals are interned per table: a table holds exactly one Literal object per
+    (letter, polarity), so constructing or parsing the same literal twice returns the same
+    object. Literals of different tables are equal when their letter and polarity are.
+    """
+    
+    __slots__ = ('__is_negated', '__letter', '__var_id', '__hash', '__complement', '__table')
+    
+    def __new__(cls, is_negated: bool, letter: str):
         """
-        Initialize a Literal with private variables.
+        Return the Literal of SymbolTable.default for the given polarity and letter.
         
         Args:
             is_negated: Boolean indicating if the literal is negated
-            letter: String representing the letter (must be a single capital letter)
-            
+            letter: String naming the variable (a single capital letter, or an indexed name like P12)
+        
         Raises:
-            ValueError: If letter is not exactly one capital letter
+            ValueError: If letter is not a valid variable name
         """
-        if not isinstance(letter, str) or len(letter) != 1 or not letter.isalpha() or not letter.isupper():
-            raise ValueError(f"letter must be a single capital letter, got: {letter}")
-        
-        self.__is_negated = is_negated
-        self.__letter = letter
+        return SymbolTable.default.literal(is_negated, letter)
+    
+    @classmethod
+    def _variable(cls, letter: str, var_id: int, table: 'SymbolTable') -> 'Literal':
+        """Create both polarities of a new variable of table and return the positive one (for SymbolTable)"""
+        # Create both polarities together so that negate() never allocates
+        positive = object.__new__(cls)
+        negative = object.__new__(cls)
+        for lit, negated, complement in ((positive, False, negative), (negative, True, positive)):
+            lit.__is_negated = negated
+            lit.__letter = letter
+            lit.__var_id = var_id
+            lit.__hash = hash((negated, letter))
+            lit.__complement = complement
+            lit.__table = table
+        return positive
     
     @property
     def is_negated(self) -> bool:
@@ -28,42 +60,180 @@ class Literal:
         """Get the letter of the literal"""
         return self.__letter
     
+    @property
+    def var_id(self) -> int:
+        """Get the integer ID of the literal's letter in its table (0 for A, 1 for B, ..., 26 and up for other names)"""
+        return self.__var_id
+    
+    @property
+    def table(self) -> 'SymbolTable':
+        """Get the SymbolTable this literal belongs to"""
+        return self.__table
+    
+    @staticmethod
+    def from_var_id(var_id: int, is_negated: bool = False) -> 'Literal':
+        """
+        Return the Literal of SymbolTable.default for a letter given by its integer ID.
+        
+        Raises:
+            ValueError: If no variable has the given ID
+        """
+        return SymbolTable.default.from_var_id(var_id, is_negated)
+    
+    @staticmethod
+    def num_vars() -> int:
+        """Return the number of variable IDs handed out so far by SymbolTable.default"""
+        return len(SymbolTable.default)
+    
+    def negate(self) -> 'Literal':
+        """Return the complementary Literal (same letter, opposite polarity)"""
+        return self.__complement
+    
     def __repr__(self) -> str:
         negation_symbol = "~" if self.__is_negated else ""
         return f"{negation_symbol}{self.__letter}"
     
     def __eq__(self, other) -> bool:
-        """Check equality between two Literals"""
-        if not isinstance(other, Literal):
+        """Check equality between two Literals (identity within a table)"""
+        if self is other:
+            return True
+        if not isinstance(other, Literal) or other.__table is self.__table:
             return False
         return self.__is_negated == other.__is_negated and self.__letter == other.__letter
     
     def __hash__(self) -> int:
         """Make Literal hashable for use in sets"""
-        return hash((self.__is_negated, self.__letter))
+        return self.__hash
+    
+    def __reduce__(self):
+        """Pickle by value, so that unpickling returns the Literal of SymbolTable.default"""
+        return (Literal, (self.__is_negated, self.__letter))
     
     @staticmethod
     def parse(s: str) -> 'Literal':
         """
-        Parse a string and return the corresponding Literal.
+        Parse a string and return the corresponding Literal of SymbolTable.default.
         
         Expected format:
             - Single letter (uppercase or lowercase): "A", "a", "B", etc. (positive literal)
             - Tilde followed by letter: "~A", "~a", "~B", etc. (negated literal)
-            - Lowercase letters are automatically converted to uppercase
+            - Lowercase single letters are automatically converted to uppercase
+            - Indexed names, kept as written: "P12", "~x_3", etc.
         
         Args:
             s: String to parse
-            
+        
         Returns:
             A Literal object corresponding to the parsed string
-            
+        
         Raises:
             ValueError: If the string is not in the correct format
         """
+        return SymbolTable.default.parse(s)
+
+
+class SymbolTable:
+    """
+    Dense numbering of variable names, giving the bit of each letter in clause bitmasks.
+    
+    A clause's masks are as wide as the largest ID among its letters, so each
+    ResolutionModel numbers its variables in a table of its own: its clauses do not grow
+    with the names other models (or other sessions of the app) have used, and the table
+    goes away with the model. A to Z are always IDs 0 to 25. Registering a name is guarded
+    by a lock, so a table may be shared between threads.
+    """
+    
+    # Shared by literals and clauses built outside a model; set below the class
+    default = None
+    
+    def __init__(self):
+        self.__names = []
+        self.__positives = []
+        # Hash of each literal, positive at 2 * var_id and negated at 2 * var_id + 1
+        self.__hashes = []
+        # Maps each name to its ID; a name is only added once its Literal is in place
+        self.__ids = {}
+        # Literals already produced by parse(), keyed by the parsed string
+        self.__parsed = {}
+        self.__lock = threading.Lock()
+        for letter in ascii_uppercase:
+            self.literal(False, letter)
+    
+    def __len__(self) -> int:
+        """Return the number of variable IDs handed out so far"""
+        return len(self.__names)
+    
+    def literal(self, is_negated: bool, letter: str) -> Literal:
+        """
+        Return the Literal of this table for the given polarity and letter, registering
+        the letter if it is new.
+        
+        Raises:
+            ValueError: If letter is not a valid variable name
+        """
+        try:
+            positive = self.__positives[self.__ids[letter]]
+        except (KeyError, TypeError):
+            positive = self.__register(letter)
+        return positive.negate() if is_negated else positive
+    
+    def __register(self, letter) -> Literal:
+        if not isinstance(letter, str) or not _NAME.fullmatch(letter):
+            raise ValueError(f"letter must be a single capital letter or an indexed name like P12 or x_3, got: {letter}")
+        with self.__lock:
+            var_id = self.__ids.get(letter)
+            if var_id is not None:
+                return self.__positives[var_id]
+            var_id = len(self.__names)
+            positive = Literal._variable(letter, var_id, self)
+            self.__names.append(letter)
+            self.__positives.append(positive)
+            self.__hashes += (hash(positive), hash(positive.negate()))
+            self.__ids[letter] = var_id
+            return positive
+    
+    def translate(self, literal: Literal) -> Literal:
+        """Return the Literal of this table with the letter and polarity of literal"""
+        if literal.table is self:
+            return literal
+        return self.literal(literal.is_negated, literal.letter)
+    
+    def from_var_id(self, var_id: int, is_negated: bool = False) -> Literal:
+        """
+        Return the Literal for a letter given by its integer ID.
+        
+        Raises:
+            ValueError: If no variable has the given ID
+        """
+        if not isinstance(var_id, int) or not 0 <= var_id < len(self.__positives):
+            raise ValueError(f"var_id must be between 0 and {len(self.__positives) - 1}, got: {var_id}")
+        positive = self.__positives[var_id]
+        return positive.negate() if is_negated else positive
+    
+    def hash_masks(self, positive: int, negative: int) -> int:
+        """
+        Hash a clause given by its letter bitmasks through the hashes of its literals, so
+        that equal clauses of different tables hash alike.
+        """
+        hashes = self.__hashes
+        result = 0
+        # The literals of the letter with bit_length() b are at 2 * b - 2 and 2 * b - 1
+        for mask, offset in ((positive, 2), (negative, 1)):
+            while mask:
+                low = mask & -mask
+                result ^= hashes[2 * low.bit_length() - offset]
+                mask ^= low
+        return hash(result)
+    
+    def parse(self, s: str) -> Literal:
+        """Parse a string in the format of Literal.parse() into a Literal of this table"""
         if not isinstance(s, str):
             raise ValueError(f"parse() requires a string, got: {type(s).__name__}")
         
+        literal = self.__parsed.get(s)
+        if literal is not None:
+            return literal
+        
         if len(s) == 0:
             raise ValueError("parse() requires a non-empty string")
         
@@ -75,11 +245,17 @@ class Literal:
             is_negated = True
             letter_part = s[1:]
         
-        # Validate the letter part (must be alphabetic)
-        if len(letter_part) != 1 or not letter_part.isalpha():
-            raise ValueError(f"Invalid literal format: '{s}'. Expected format: 'A' or '~A' where A is a letter")
+        # Convert single letters to uppercase
+        if len(letter_part) == 1:
+            letter_part = letter_part.upper()
         
-        # Convert to uppercase
-        letter_part = letter_part.upper()
+        # Validate the letter part (a letter or an indexed name)
+        if not _NAME.fullmatch(letter_part):
+            raise ValueError(f"Invalid literal format: '{s}'. Expected format: 'A', '~A', 'P12' or '~x_3'")
         
-        return Literal(is_negated, letter_part)
\ No newline at end of file
+        literal = self.literal(is_negated, letter_part)
+        self.__parsed[s] = literal
+        return literal
+
+
+SymbolTable.default = SymbolTable()
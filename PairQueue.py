@@ -0,0 +1,95 @@
+import heapq
+from bisect import bisect_left, bisect_right
+from Clause import Clause
+
+class PairQueue:
+    """
+    Passive queue of clause pairs for ResolutionModel.saturate(), generated lazily.
+    
+    Instead of holding every candidate pair, the queue holds one cursor per clause over its
+    partners: the older clauses containing the complement of one of its literals. Those are
+    looked up in occurrence lists split by clause size and walked smallest partner first, so
+    the estimated resolvent size (the two sizes minus the two clashing literals) never drops
+    along a cursor. Keying each cursor on the estimate of its next pair, then on the clause's
+    depth and age, makes the heap yield pairs best first while its memory grows with the
+    number of clauses rather than the number of pairs.
+    
+    Pairs involving a retired clause go stale and are dropped when they come up, as is the
+    cursor of a retired clause.
+    """
+    
+    def __init__(self):
+        self.__heap = []
+        # Maps each clause index to its list of (bit, is_negated) literals
+        self.__literals = {}
+        # Maps (bit, is_negated) to {clause size: sorted indices of the clauses with that literal}
+        self.__occurrences = {}
+        self.__sizes = []
+        self.__retired = set()
+        # Number of pairs handed out and number of stale pairs dropped
+        self.generated = 0
+        self.stale = 0
+    
+    def push(self, index: int, clause: Clause, depth: int) -> None:
+        """Add the clause at index, to be paired with every clause added before it"""
+        literals = [(1 << lit.var_id, lit.is_negated) for lit in clause.get_literals()]
+        self.__literals[index] = literals
+        size = len(literals)
+        for literal in literals:
+            self.__occurrences.setdefault(literal, {}).setdefault(size, []).append(index)
+        position = bisect_left(self.__sizes, size)
+        if position == len(self.__sizes) or self.__sizes[position] != size:
+            self.__sizes.insert(position, size)
+        # Cursor: (partner size, literal position, offset in the occurrence list)
+        smallest = self.__sizes[0]
+        heapq.heappush(self.__heap, (size + smallest - 2, depth, index, smallest, 0, 0))
+    
+    def retire(self, index: int) -> None:
+        """Drop the pairs of the clause at index"""
+        self.__retired.add(index)
+    
+    def __advance(self, index: int, size: int, literal_position: int, offset: int):
+        """
+        Return (partner, cursor) for the next partner of index at or after the cursor, or
+        (None, cursor) once the cursor has run past every partner of the current size.
+        """
+        literals = self.__literals[index]
+        while literal_position < len(literals):
+            bit, negated = literals[literal_position]
+            partners = self.__occurrences.get((bit, not negated), {}).get(size, ())
+            # Occurrence lists are in index order, so the older partners come first
+            if offset < len(partners) and partners[offset] < index:
+                return partners[offset], (size, literal_position, offset + 1)
+            literal_position += 1
+            offset = 0
+        return None, (size, literal_position, offset)
+    
+    def pop(self):
+        """
+        Remove and return the next pair as (index1, index2), index1 being the newer clause,
+        or None when every pair has been handed out. Stale pairs are skipped.
+        """
+        heap = self.__heap
+        while heap:
+            estimate, depth, index, size, literal_position, offset = heapq.heappop(heap)
+            if index in self.__retired:
+                continue
+            partner, cursor = self.__advance(index, size, literal_position, offset)
+            if partner is None:
+                # Move on to the next larger partner size, if there is one
+                position = bisect_right(self.__sizes, size)
+                if position < len(self.__sizes):
+                    larger = self.__sizes[position]
+                    heapq.heappush(heap, (estimate + larger - size, depth, index, larger, 0, 0))
+                continue
+            heapq.heappush(heap, (estimate, depth, index) + cursor)
+            if partner in self.__retired:
+                self.stale += 1
+                continue
+            self.generated += 1
+            return index, partner
+        return None
+    
+    def __len__(self) -> int:
+        """Return the number of clauses that may still have pairs to hand out"""
+        return len(self.__heap)
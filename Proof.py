@@ -0,0 +1,47 @@
+class Proof:
+    """
+    A resolution proof: a numbered list of steps, each an input clause or a
+    resolvent of two earlier steps.
+    
+    Each step is a (clause, parents) pair where parents is None for input clauses
+    and a tuple of the two 1-based line numbers of the parents otherwise. The text
+    rendering is built on first use and reused afterwards.
+    """
+    
+    def __init__(self, steps: list):
+        """
+        Initialize a Proof from its steps.
+        
+        Args:
+            steps: List of (Clause, parents) pairs, parents being None or a (line1, line2) tuple
+        """
+        self.__steps = steps
+        self.__text = None
+    
+    def get_steps(self) -> list:
+        """Return a copy of the list of (clause, parents) steps"""
+        return self.__steps.copy()
+    
+    def __len__(self) -> int:
+        """Return the number of lines in the proof"""
+        return len(self.__steps)
+    
+    def num_resolutions(self) -> int:
+        """Return the number of resolution steps, that is the lines that are not input clauses"""
+        return sum(parents is not None for _, parents in self.__steps)
+    
+    def __iter__(self):
+        return iter(self.__steps)
+    
+    def __str__(self) -> str:
+        """Render the proof as one line per step"""
+        if self.__text is None:
+            lines = []
+            for i, (clause, parents) in enumerate(self.__steps):
+                end_str = "Input clause" if parents is None else f"{parents[0]},{parents[1]} Resolution"
+                lines.append(f"{i+1:<5} {str(clause):<20} {end_str:>20}\n")
+            self.__text = "".join(lines)
+        return self.__text
+    
+    def __repr__(self) -> str:
+        return f"Proof({len(self.__steps)} steps)"
@@ -0,0 +1,355 @@
+import time
+from Clause import Clause, resolve_masks
+from Proof import Proof
+from Search import RefutationSearch, SearchTimeout
+
+# A proof is handled as a DAG in topological order: nodes[k] is the (positive, negative)
+# mask pair of step k and parents[k] is None for an input clause or (left, right, bit) for
+# a resolvent of steps left and right on the letter bit. The last node is the conclusion.
+
+def _pivot(left: tuple, right: tuple, resolvent: tuple) -> int:
+    """Return the bit of the letter left and right were resolved on to give resolvent"""
+    clash = (left[0] & right[1]) | (left[1] & right[0])
+    removed = clash & ~(resolvent[0] | resolvent[1])
+    bits = removed or clash
+    return bits & -bits
+
+
+def _literal(node: tuple, bit: int) -> tuple:
+    """Return the mask pair of the literal on bit that node contains"""
+    return (bit, 0) if node[0] & bit else (0, bit)
+
+
+def _size(node: tuple) -> int:
+    return node[0].bit_count() + node[1].bit_count()
+
+
+def _contains(node: tuple, literal: tuple) -> bool:
+    return bool(node[0] & literal[0] or node[1] & literal[1])
+
+
+def _subsumes(first: tuple, second: tuple) -> bool:
+    return first[0] & second[0] == first[0] and first[1] & second[1] == first[1]
+
+
+def _literals(node: tuple):
+    """Yield the mask pair of every literal of node, positive ones first"""
+    for side in (0, 1):
+        mask = node[side]
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            yield (bit, 0) if side == 0 else (0, bit)
+
+
+def _from_proof(proof: Proof) -> tuple:
+    """Convert a Proof into (nodes, parents, inputs), inputs mapping input masks to their Clauses"""
+    nodes = []
+    parents = []
+    inputs = {}
+    for clause, lines in proof:
+        node = (clause.positive_mask, clause.negative_mask)
+        nodes.append(node)
+        if lines is None:
+            parents.append(None)
+            inputs.setdefault(node, clause)
+        else:
+            left, right = lines[0] - 1, lines[1] - 1
+            parents.append((left, right, _pivot(nodes[left], nodes[right], node)))
+    return nodes, parents, inputs
+
+
+def _to_proof(nodes: list, parents: list, inputs: dict) -> Proof:
+    """
+    Build the Proof of the last node from its ancestors, merging steps with equal clauses
+    and numbering input clauses first, as ResolutionModel.get_proof() does.
+    """
+    root = len(nodes) - 1
+    needed = {root}
+    for k in range(root, -1, -1):
+        if k in needed and parents[k] is not None:
+            needed.add(parents[k][0])
+            needed.add(parents[k][1])
+    clauses = {}
+    order = []
+    table = next(iter(inputs.values())).table if inputs else None
+    for k in range(root + 1):
+        if k not in needed or nodes[k] in clauses:
+            continue
+        if parents[k] is None:
+            clause = inputs.get(nodes[k])
+            clauses[nodes[k]] = clause if clause is not None else Clause.from_masks(*nodes[k], table=table)
+        else:
+            left, right, _ = parents[k]
+            clauses[nodes[k]] = Clause.from_masks(*nodes[k], clauses[nodes[left]], clauses[nodes[right]])
+        order.append(k)
+    order.sort(key=lambda k: parents[k] is not None)
+    lines = {}
+    steps = []
+    for k in order:
+        lines[nodes[k]] = len(lines) + 1
+        if parents[k] is None:
+            steps.append((clauses[nodes[k]], None))
+        else:
+            left, right, _ = parents[k]
+            steps.append((clauses[nodes[k]], (lines[nodes[left]], lines[nodes[right]])))
+    return Proof(steps)
+
+
+class _Rebuild:
+    """
+    Rebuild a proof bottom-up after some of its resolutions lost a premise.
+    
+    A resolution whose premise was dropped is replaced by its other premise, and one whose
+    rebuilt premise no longer contains the pivot is replaced by that premise. Resolvents
+    equal to or subsumed by an earlier rebuilt clause reuse that clause instead.
+    """
+    
+    def __init__(self, nodes: list, parents: list):
+        self.__nodes = nodes
+        self.__parents = parents
+        self.nodes = []
+        self.parents = []
+        # Maps each old step to the rebuilt step standing in for it
+        self.image = {}
+        # Rebuilt steps by clause, and by one watched literal: a clause subsuming node
+        # has its watched literal in node, so only the watch lists of node's literals
+        # need checking. The empty clause has no literal and is kept apart.
+        self.__steps = {}
+        self.__watches = {}
+        self.__empty = None
+    
+    def __add(self, node: tuple, parents) -> int:
+        """Return the first rebuilt step subsuming node, adding node as a new step if there is none"""
+        k = self.__steps.get(node)
+        if k is not None:
+            # A subsumer added before an equal clause would have taken its place
+            return k
+        first = self.__empty
+        for literal in _literals(node):
+            for k in self.__watches.get(literal, ()):
+                if first is not None and k > first:
+                    break
+                if _subsumes(self.nodes[k], node):
+                    first = k
+                    break
+        if first is not None:
+            return first
+        k = len(self.nodes)
+        self.nodes.append(node)
+        self.parents.append(parents)
+        self.__steps[node] = k
+        if node == (0, 0):
+            self.__empty = k
+        else:
+            self.__watches.setdefault(next(_literals(node)), []).append(k)
+        return k
+    
+    def resolve(self, left: int, right: int, bit: int, left_literal: tuple) -> int:
+        """Add the resolvent of rebuilt steps left and right, where left holds left_literal on bit"""
+        first = self.nodes[left]
+        second = self.nodes[right]
+        right_literal = (left_literal[1], left_literal[0])
+        left_missing = not _contains(first, left_literal)
+        right_missing = not _contains(second, right_literal)
+        if left_missing and right_missing:
+            return left if _size(first) < _size(second) else right
+        if left_missing:
+            return left
+        if right_missing:
+            return right
+        node = resolve_masks(first[0], first[1], second[0], second[1], bit)
+        return self.__add(node, (left, right, bit))
+    
+    def run(self, steps: list, dropped: dict) -> None:
+        """
+        Rebuild the given old steps in order; dropped maps a step to the premise ("left" or
+        "right") its resolution no longer uses, or to None if the step itself is left out
+        of every resolution.
+        """
+        nodes = self.__nodes
+        for k in steps:
+            if self.__parents[k] is None:
+                self.image[k] = self.__add(nodes[k], None)
+                continue
+            left, right, bit = self.__parents[k]
+            if dropped.get(left, "") is None:
+                self.image[k] = self.image[right]
+            elif dropped.get(right, "") is None:
+                self.image[k] = self.image[left]
+            elif dropped.get(k) == "right":
+                self.image[k] = self.image[left]
+            elif dropped.get(k) == "left":
+                self.image[k] = self.image[right]
+            else:
+                self.image[k] = self.resolve(self.image[left], self.image[right], bit, _literal(nodes[left], bit))
+
+
+def _ancestors(parents: list, roots: list, dropped: dict) -> list:
+    """Return the sorted steps reachable from roots without following dropped premises"""
+    reached = set(roots)
+    for k in range(max(roots), -1, -1):
+        if k not in reached or parents[k] is None:
+            continue
+        left, right, _ = parents[k]
+        if dropped.get(k) != "left" and dropped.get(left, "") is not None:
+            reached.add(left)
+        if dropped.get(k) != "right" and dropped.get(right, "") is not None:
+            reached.add(right)
+    return sorted(reached)
+
+
+def _compact(nodes: list, parents: list, root: int) -> tuple:
+    """Return the (nodes, parents) of the steps root depends on, renumbered so that root is last"""
+    kept = _ancestors(parents, [root], {})
+    position = {k: new for new, k in enumerate(kept)}
+    compact = []
+    for k in kept:
+        if parents[k] is None:
+            compact.append(None)
+        else:
+            left, right, bit = parents[k]
+            compact.append((position[left], position[right], bit))
+    return [nodes[k] for k in kept], compact
+
+
+def recycle_pivots(nodes: list, parents: list) -> tuple:
+    """
+    RecyclePivotsWithIntersection: drop resolutions whose pivot literal is resolved away
+    again on every path from the step to the conclusion.
+    
+    Walking from the conclusion towards the inputs, each step collects the literals that
+    every path below it removes (the intersection over its children of what each child
+    removes). A resolution whose pivot literal from one premise is among them is replaced
+    by that premise.
+    """
+    root = len(nodes) - 1
+    safe = {root: (0, 0)}
+    dropped = {}
+    for k in range(root, -1, -1):
+        if k not in safe or parents[k] is None:
+            continue
+        here = safe[k]
+        left, right, bit = parents[k]
+        left_literal = _literal(nodes[left], bit)
+        right_literal = (left_literal[1], left_literal[0])
+        if _contains(here, left_literal):
+            dropped[k] = "right"
+            contributions = [(left, here)]
+        elif _contains(here, right_literal):
+            dropped[k] = "left"
+            contributions = [(right, here)]
+        else:
+            contributions = [(left, (here[0] | left_literal[0], here[1] | left_literal[1])),
+                             (right, (here[0] | right_literal[0], here[1] | right_literal[1]))]
+        for parent, literals in contributions:
+            known = safe.get(parent)
+            safe[parent] = literals if known is None else (known[0] & literals[0], known[1] & literals[1])
+    rebuild = _Rebuild(nodes, parents)
+    rebuild.run(_ancestors(parents, [root], dropped), dropped)
+    return _compact(rebuild.nodes, rebuild.parents, rebuild.image[root])
+
+
+def lower_units(nodes: list, parents: list) -> tuple:
+    """
+    LowerUnits: a unit clause used by several resolutions is taken out of all of them and
+    resolved with the conclusion once at the end instead.
+    """
+    root = len(nodes) - 1
+    reached = _ancestors(parents, [root], {})
+    children = dict.fromkeys(reached, 0)
+    for k in reached:
+        if parents[k] is not None:
+            children[parents[k][0]] += 1
+            children[parents[k][1]] += 1
+    units = [k for k in reached if k != root and children[k] > 1
+             and _size(nodes[k]) == 1]
+    if not units:
+        return nodes, parents
+    dropped = dict.fromkeys(units)
+    rebuild = _Rebuild(nodes, parents)
+    # The units are rebuilt too, each with the other units taken out of its derivation
+    rebuild.run(_ancestors(parents, [root] + units, dropped), dropped)
+    current = rebuild.image[root]
+    # A unit later in the proof may depend on an earlier one, so it is resolved first
+    for unit in reversed(units):
+        literal = _literal(nodes[unit], nodes[unit][0] | nodes[unit][1])
+        current = rebuild.resolve(rebuild.image[unit], current, literal[0] | literal[1], literal)
+    return _compact(rebuild.nodes, rebuild.parents, current)
+
+
+def _resolutions(parents: list) -> int:
+    return sum(parent is not None for parent in parents)
+
+
+def compress(proof: Proof) -> Proof:
+    """
+    Shorten a refutation by cheap rewriting: RecyclePivotsWithIntersection and LowerUnits
+    are applied until neither removes a step, and steps deriving a clause that an earlier
+    step already derived (or one subsuming it) reuse the earlier clause.
+    
+    Args:
+        proof: A Proof, for example from ResolutionModel.get_proof()
+    
+    Returns:
+        A Proof of the same or a stronger conclusion from some of the same input clauses,
+        with at most as many resolution steps
+    """
+    nodes, parents, inputs = _from_proof(proof)
+    conclusion = nodes[-1]
+    best = (nodes, parents)
+    while True:
+        candidate = lower_units(*recycle_pivots(*best))
+        if not _subsumes(candidate[0][-1], conclusion) or _resolutions(candidate[1]) >= _resolutions(best[1]):
+            break
+        best = candidate
+    result = _to_proof(best[0], best[1], inputs)
+    return result if result.num_resolutions() <= proof.num_resolutions() else proof
+
+
+def minimize(proof: Proof, inputs: list = None, budget: float = 0.0) -> tuple:
+    """
+    Compress a refutation, then search for a refutation with fewer resolution steps.
+    
+    The search (Search.RefutationSearch) deepens one step at a time, so the compressed
+    proof's length caps it and the first refutation it finds is a shortest one. It is
+    exponential in the worst case, so it stops after budget seconds.
+    
+    Args:
+        proof: A refutation, ending in the empty clause
+        inputs: Clauses the new refutation may start from (default: the input clauses of proof)
+        budget: Seconds the exhaustive search may take; 0 only compresses
+    
+    Returns:
+        A (proof, optimal) pair: the shortest refutation found and whether it is known
+        that no refutation from inputs has fewer resolution steps
+    
+    Raises:
+        ValueError: If proof does not end in the empty clause
+    """
+    steps = proof.get_steps()
+    if not steps or len(steps[-1][0].get_literals()) != 0:
+        raise ValueError("proof must end in the empty clause")
+    best = compress(proof)
+    if budget <= 0:
+        return best, best.num_resolutions() == 0
+    if inputs is None:
+        inputs = [clause for clause, lines in steps if lines is None]
+    clauses = list(dict.fromkeys(clause for clause in inputs if not clause.is_tautology()))
+    masks = [(clause.positive_mask, clause.negative_mask) for clause in clauses]
+    search = RefutationSearch(masks)
+    try:
+        found = search.search(deadline=time.perf_counter() + budget, max_depth=best.num_resolutions() - 1)
+    except SearchTimeout:
+        return best, False
+    if found is None:
+        return best, True
+    if not found:
+        # The empty clause is one of the inputs
+        return Proof([(clauses[masks.index((0, 0))], None)]), True
+    nodes = list(masks)
+    parents = [None] * len(masks)
+    for i, j, resolvent in found:
+        nodes.append(resolvent)
+        parents.append((i, j, _pivot(nodes[i], nodes[j], resolvent)))
+    return _to_proof(nodes, parents, dict(zip(masks, clauses))), True
@@ -1,19 +1,50 @@
-from Literal import Literal
-from Clause import Clause
+import math
+import os
+import time
+from collections import OrderedDict
+from string import ascii_uppercase
+from Literal import Literal, SymbolTable
+from Clause import Clause, resolve_masks, single_clash_resolvents
+from ClauseStore import ClauseStore
+from Proof import Proof
+from Solver import CDCLSolver
 from functools import reduce
+from Strategy import get_strategy
+from PairQueue import PairQueue
+from Canonical import canonical_form
+from Statistics import Statistics
+from Search import RefutationSearch, SearchTimeout
+import ProofCompression
+from ClauseMatrix import ClauseMatrix
+import Serialization
 
 class ResolutionModel:
     """Represents a full CNF resolution model consisting of multiple clauses."""
     
-    def __init__(self, clauses: list):
+    # Maximum number of (clause, clause, letter) combinations remembered by resolve()
+    RESOLVENT_CACHE_SIZE = 1024
+    # Default wall-clock budget of suggest_next_step(), in seconds
+    HINT_BUDGET = 0.2
+    # Maximum number of model states whose hint search suggest_next_step() remembers
+    HINT_CACHE_SIZE = 16
+    
+    def __init__(self, clauses: list, subsumption: bool = False, goals: list = None, statistics: bool = False):
         """
         Initialize a ResolutionModel with a list of unique Clauses.
         
+        The model numbers its letters in the symbol table of the clauses when they share one
+        other than SymbolTable.default, and otherwise in a table of its own, into which the
+        clauses are renumbered.
+        
         Args:
             clauses: List of Clause objects (must not be empty)
-            
+            subsumption: Whether resolve() and saturate() apply forward and backward subsumption
+            goals: Optional list of Clauses from clauses to mark as goal clauses (the set of
+                support for the "sos" strategy of saturate())
+            statistics: Whether to collect engine statistics (see the statistics property)
+        
         Raises:
-            ValueError: If the list is empty
+            ValueError: If the list is empty or a goal clause is not in the list
             TypeError: If clauses is not a list
         """
         if not isinstance(clauses, list):
@@ -25,46 +56,356 @@ class ResolutionModel:
         if not all(isinstance(c, Clause) for c in clauses):
             raise TypeError("all items in clauses list must be Clause objects")
         
+        # Symbol table numbering the letters of every clause of the model
+        tables = {id(c.table): c.table for c in clauses}
+        if len(tables) == 1 and clauses[0].table is not SymbolTable.default:
+            self.__table = clauses[0].table
+        else:
+            self.__table = SymbolTable()
+            clauses = [c.in_table(self.__table) for c in clauses]
+        # Append-only clause log shared by every version of the model; the clauses from
+        # index __size on were hidden by undo() and are dropped by the next change
+        self.__clauses = ClauseStore()
+        self.__size = 0
+        # Occurrence index: maps each Literal to the indices of the clauses containing it
+        self.__occurrences = {}
+        # Maps the index of each clause retired by backward subsumption to the number of
+        # clauses in the model when it was retired, in retirement order
+        self.__retired = {}
+        # Clash table: maps a clause index to {partner index: (positive clash, negative clash)}
+        # for every partner sharing a complementary letter. A row is built on the first
+        # query about its clause and extended as clauses are appended; the positive clash
+        # masks the letters positive in the row's clause and negated in the partner
+        self.__clash_rows = {}
+        # Resolvent cache: maps (smaller index, larger index, var_id) to the index of the
+        # resolvent, least recently used first
+        self.__resolvent_cache = OrderedDict()
+        self.__resolvent_hits = 0
+        self.__resolvent_misses = 0
+        # Hint cache: maps the indices of the clauses a hint search starts from to a dict
+        # holding the search, its hint and whether the hint is final, least recently used first
+        self.__hints = OrderedDict()
+        self.__subsumption = bool(subsumption)
+        self.__statistics = Statistics() if statistics else None
         # Ensure uniqueness while preserving order
-        seen = set()
-        unique_clauses = []
         for c in clauses:
-            if c not in seen:
-                unique_clauses.append(c)
-                seen.add(c)
-        self.__clauses = unique_clauses
+            if c not in self.__clauses:
+                self.__add_clause(c)
+        
+        # Indices of the goal clauses
+        self.__goals = set()
+        for goal in goals if goals is not None else []:
+            index = self.__clauses.get_index(goal)
+            if index is None:
+                raise ValueError(f"goal clause {goal} is not one of the model's clauses")
+            self.__goals.add(index)
+        
+        # Version history: the number of clauses visible in each version
+        self.__history = [self.__size]
+        self.__version = 0
+    
+    def __add_clause(self, clause: Clause) -> int:
+        """Append a new clause to the model, index its literals and return its index"""
+        index = self.__clauses.add(clause)
+        self.__size = index + 1
+        for lit in clause.get_literals():
+            occurrences = self.__occurrences.get(lit)
+            if occurrences is None:
+                self.__occurrences[lit] = [index]
+            else:
+                occurrences.append(index)
+        if self.__statistics is not None and index >= self.__statistics.max_clauses:
+            self.__statistics.max_clauses = index + 1
+        if self.__clash_rows:
+            positive = clause.positive_mask
+            negative = clause.negative_mask
+            for lit in clause.get_literals():
+                for partner in self.__occurrences.get(lit.negate(), ()):
+                    row = self.__clash_rows.get(partner)
+                    if row is not None and index not in row:
+                        other = self.__clauses[partner]
+                        row[index] = (other.positive_mask & negative, other.negative_mask & positive)
+        return index
+    
+    def __add_clauses(self, clauses: list) -> None:
+        """
+        Append new clauses to the model as __add_clause() does, but update the occurrence
+        index once per literal rather than once per clause and literal.
+        """
+        if self.__clash_rows:
+            # Built clash rows need each clause's partners, which __add_clause() looks up anyway
+            for clause in clauses:
+                self.__add_clause(clause)
+            return
+        occurrences = {}
+        for clause in clauses:
+            index = self.__clauses.add(clause)
+            for negated, mask in ((False, clause.positive_mask), (True, clause.negative_mask)):
+                while mask:
+                    bit = mask & -mask
+                    mask ^= bit
+                    key = (bit, negated)
+                    found = occurrences.get(key)
+                    if found is None:
+                        occurrences[key] = [index]
+                    else:
+                        found.append(index)
+        for (bit, negated), indices in occurrences.items():
+            lit = self.__table.from_var_id(bit.bit_length() - 1, negated)
+            self.__occurrences.setdefault(lit, []).extend(indices)
+        self.__size = len(self.__clauses)
+        if self.__statistics is not None and self.__size > self.__statistics.max_clauses:
+            self.__statistics.max_clauses = self.__size
+    
+    def __clash_row(self, index: int) -> dict:
+        """Return the clash table row of the clause at index, building it on first use"""
+        row = self.__clash_rows.get(index)
+        if row is None:
+            clause = self.__clauses[index]
+            positive = clause.positive_mask
+            negative = clause.negative_mask
+            row = {}
+            for lit in clause.get_literals():
+                for partner in self.__occurrences.get(lit.negate(), ()):
+                    if partner not in row:
+                        other = self.__clauses[partner]
+                        row[partner] = (positive & other.negative_mask, negative & other.positive_mask)
+            self.__clash_rows[index] = row
+        return row
+    
+    def __clash(self, index1: int, index2: int) -> tuple:
+        """
+        Return the (positive, negative) clash masks of the clauses at index1 and index2:
+        the letters positive in the first clause and negated in the second, and vice versa.
+        Raises IndexError for invalid indices.
+        """
+        if index1 < 0 or index1 >= self.__size:
+            raise IndexError(f"index1 {index1} is out of range for clauses list of length {self.__size}")
+        if index2 < 0 or index2 >= self.__size:
+            raise IndexError(f"index2 {index2} is out of range for clauses list of length {self.__size}")
+        return self.__clash_row(index1).get(index2, (0, 0))
+    
+    def __find_subsumer(self, clause: Clause):
+        """Return the index of a live clause in the current version that subsumes clause, or None"""
+        size = self.__size
+        checked = set()
+        for lit in clause.get_literals():
+            for index in self.__occurrences.get(lit, ()):
+                # Occurrence lists are in index order; what follows was hidden by undo()
+                if index >= size:
+                    break
+                if index in checked or self.__retired.get(index, size + 1) <= size:
+                    continue
+                checked.add(index)
+                if self.__clauses[index].subsumes(clause):
+                    return index
+        return None
+    
+    def __retire_subsumed(self, clause: Clause, index: int) -> list:
+        """Retire every other live clause that clause subsumes and return their indices"""
+        literals = clause.get_literals()
+        if not literals:
+            return []
+        # A subsumed clause contains every literal of clause, so the rarest literal's
+        # occurrences are the only candidates
+        rarest = min(literals, key=lambda lit: len(self.__occurrences.get(lit, ())))
+        retired = []
+        for candidate in self.__occurrences.get(rarest, ()):
+            if candidate == index or candidate in self.__retired:
+                continue
+            if clause.subsumes(self.__clauses[candidate]):
+                self.__retired[candidate] = len(self.__clauses)
+                retired.append(candidate)
+        return retired
+    
+    def __visible_index(self, clause: Clause):
+        """Return the index of an equal clause in the current version, or None if there is none"""
+        index = self.__clauses.get_index(clause)
+        if index is None or index >= self.__size:
+            return None
+        return index
+    
+    def __truncate(self) -> None:
+        """
+        Before a change, drop the clauses hidden by undo() from the clause log and every
+        index, along with the versions that redo() could have returned to.
+        """
+        del self.__history[self.__version + 1:]
+        size = self.__size
+        if len(self.__clauses) == size:
+            return
+        for index in range(len(self.__clauses) - 1, size - 1, -1):
+            self.__clash_rows.pop(index, None)
+            for lit in self.__clauses[index].get_literals():
+                # Later clauses are already gone, so index is last in the occurrence list
+                self.__occurrences[lit].pop()
+                for partner in self.__occurrences.get(lit.negate(), ()):
+                    row = self.__clash_rows.get(partner)
+                    if row is not None:
+                        row.pop(index, None)
+        self.__clauses.truncate(size)
+        while self.__retired and next(reversed(self.__retired.values())) > size:
+            self.__retired.popitem()
+        for key, index in list(self.__resolvent_cache.items()):
+            if index >= size or key[1] >= size:
+                del self.__resolvent_cache[key]
+        for key in list(self.__hints):
+            if key and key[-1] >= size:
+                del self.__hints[key]
+    
+    def __new_version(self) -> None:
+        """Record the current clauses as a new version following the current one"""
+        self.__history.append(self.__size)
+        self.__version += 1
+    
+    @property
+    def subsumption(self) -> bool:
+        """Whether resolve() and saturate() apply forward and backward subsumption"""
+        return self.__subsumption
+    
+    @subsumption.setter
+    def subsumption(self, enabled: bool) -> None:
+        self.__subsumption = bool(enabled)
+    
+    @property
+    def statistics(self):
+        """
+        The Statistics collected by this model, or None if collection is disabled.
+        
+        Assign True to start collecting (keeping any statistics already collected) and
+        False to stop and drop them. Collection is off by default and then costs one
+        check per operation.
+        """
+        return self.__statistics
+    
+    @statistics.setter
+    def statistics(self, enabled: bool) -> None:
+        if not enabled:
+            self.__statistics = None
+        elif self.__statistics is None:
+            self.__statistics = Statistics()
+            self.__statistics.max_clauses = self.__size
+    
+    def is_retired(self, index: int) -> bool:
+        """
+        Return True if the clause at index has been retired because a later clause subsumes it.
+        Retired clauses stay in the model (so indices and proofs are unaffected) but are no
+        longer offered as resolution partners.
+        
+        Raises:
+            IndexError: If index is out of range
+        """
+        if index < 0 or index >= self.__size:
+            raise IndexError(f"index {index} is out of range for clauses list of length {self.__size}")
+        return self.__retired.get(index, self.__size + 1) <= self.__size
+    
+    @property
+    def version(self) -> int:
+        """
+        The number of the current version. Version 0 is the model as constructed, and every
+        resolve() that adds a clause and every saturate() that adds clauses makes a new one.
+        """
+        return self.__version
+    
+    def num_versions(self) -> int:
+        """Return the number of versions that can be reached with undo(), redo() and jump_to()"""
+        return len(self.__history)
+    
+    def jump_to(self, version: int) -> None:
+        """
+        Make an earlier or later version the current one, in O(1).
+        
+        Every version shares the same append-only clause log and only records how many of
+        its clauses it contains, so switching versions copies nothing. Changing the model
+        while an earlier version is current discards the versions after it.
+        
+        Raises:
+            IndexError: If version is out of range
+        """
+        if version < 0 or version >= len(self.__history):
+            raise IndexError(f"version {version} is out of range for {len(self.__history)} versions")
+        self.__version = version
+        self.__size = self.__history[version]
+    
+    def undo(self) -> bool:
+        """Go back to the previous version; return False if there is none"""
+        if self.__version == 0:
+            return False
+        self.jump_to(self.__version - 1)
+        return True
+    
+    def redo(self) -> bool:
+        """Go forward to the version undone last; return False if there is none"""
+        if self.__version + 1 >= len(self.__history):
+            return False
+        self.jump_to(self.__version + 1)
+        return True
+    
+    def get_goals(self) -> list:
+        """Return the sorted indices of the clauses marked as goals"""
+        return sorted(self.__goals)
     
     def get_clauses(self) -> list:
         """Return a copy of the list of clauses in this resolution model"""
-        return self.__clauses.copy()
+        return self.__clauses[:self.__size]
+    
+    def index_of(self, clause: Clause) -> int:
+        """
+        Return the index of the clause in this model equal to clause.
+        
+        Raises:
+            ValueError: If no equal clause is in the model
+        """
+        index = self.__visible_index(clause)
+        if index is None:
+            raise ValueError(f"{clause} is not in the model")
+        return index
+    
+    def canonical_form(self) -> tuple:
+        """
+        Return the canonical form of the model's clauses, which is the same for any two models
+        whose clauses differ only in variable names, variable polarities and order.
+        
+        Returns:
+            A (canonical_clauses, renaming) pair as described in Canonical.canonical_form()
+        """
+        return canonical_form(self.get_clauses())
     
     def __repr__(self) -> str:
         """String representation of the resolution model"""
-        return f"ResolutionModel({{{', '.join(str(c) for c in self.__clauses)}}})"
+        return f"ResolutionModel({{{', '.join(str(c) for c in self.get_clauses())}}})"
     
     def __eq__(self, other) -> bool:
         """Check equality between two ResolutionModels"""
         if not isinstance(other, ResolutionModel):
             return False
-        return self.__clauses == other.__clauses
+        return self.get_clauses() == other.get_clauses()
     
     def __hash__(self) -> int:
         """Make ResolutionModel hashable for use in sets"""
-        return hash(tuple(self.__clauses))
+        return hash(tuple(self.get_clauses()))
     
     def num_clauses(self) -> int:
         """Get the number of clauses in this model"""
-        return len(self.__clauses)
+        return self.__size
     
-    def resolve(self, index1: int, index2: int, literal: Literal) -> None:
+    def resolve(self, index1: int, index2: int, literal: Literal):
         """
         Resolve two clauses in the model on a given literal.
         
+        Resolving the same two clauses on the same letter again (in either order, on
+        either polarity of the letter) is answered from a bounded LRU cache without
+        building the resolvent.
+        
         Args:
             index1: Index of the first clause
             index2: Index of the second clause
             literal: The literal to resolve on
-            
+        
+        Returns:
+            The index of the resolvent in the model (the existing index if it was already
+            there), or None if forward subsumption discarded it
+       
        Raises:
             IndexError: If either index is out of range
             TypeError: If literal is not a Literal object
@@ -73,206 +414,1007 @@ class ResolutionModel:
         if not isinstance(literal, Literal):
             raise TypeError(f"literal must be a Literal object, got: {type(literal).__name__}")
         
-        if index1 < 0 or index1 >= len(self.__clauses):
-            raise IndexError(f"index1 {index1} is out of range for clauses list of length {len(self.__clauses)}")
+        if index1 < 0 or index1 >= self.__size:
+            raise IndexError(f"index1 {index1} is out of range for clauses list of length {self.__size}")
+        
+        if index2 < 0 or index2 >= self.__size:
+            raise IndexError(f"index2 {index2} is out of range for clauses list of length {self.__size}")
+        
+        index, added = self.__resolve_step(index1, index2, literal)
+        if added:
+            self.__new_version()
+        return index
+    
+    def __resolve_step(self, index1: int, index2: int, literal: Literal) -> tuple:
+        """
+        Resolve two visible clauses without validating the arguments or making a version.
+        
+        Returns:
+            An (index, added) pair: the index resolve() returns and whether a clause was added
+        """
+        stats = self.__statistics
+        if stats is not None:
+            stats.resolutions_attempted += 1
+            start = time.perf_counter()
         
-        if index2 < 0 or index2 >= len(self.__clauses):
-            raise IndexError(f"index2 {index2} is out of range for clauses list of length {len(self.__clauses)}")
+        literal = self.__table.translate(literal)
+        key = (min(index1, index2), max(index1, index2), literal.var_id)
+        index = self.__resolvent_cache.get(key)
+        if index is not None and index < self.__size:
+            self.__resolvent_hits += 1
+            self.__resolvent_cache.move_to_end(key)
+            if stats is not None:
+                stats.duplicates += 1
+                stats.add_time("dedup", start)
+            return index, False
+        self.__resolvent_misses += 1
         
         clause1 = self.__clauses[index1]
         clause2 = self.__clauses[index2]
         new_clause = Clause.resolve(clause1, clause2, literal)
-        if new_clause not in self.__clauses:
-            self.__clauses.append(new_clause)
+        if stats is not None:
+            stats.add_time("resolve", start)
+            start = time.perf_counter()
+        index = self.__visible_index(new_clause)
+        subsumed = index is None and self.__subsumption and self.__find_subsumer(new_clause) is not None
+        if stats is not None:
+            stats.add_time("dedup", start)
+            if index is not None:
+                stats.duplicates += 1
+            elif subsumed:
+                stats.subsumed += 1
+            else:
+                stats.resolvents_kept += 1
+        if subsumed:
+            return None, False
+        added = index is None
+        if added:
+            # Only a change drops what undo() hid, so a discarded resolvent keeps redo() working
+            self.__truncate()
+            index = self.__add_clause(new_clause)
+            if self.__subsumption:
+                self.__retire_subsumed(new_clause, index)
+        
+        self.__resolvent_cache[key] = index
+        if len(self.__resolvent_cache) > self.RESOLVENT_CACHE_SIZE:
+            self.__resolvent_cache.popitem(last=False)
+        return index, added
+    
+    def resolve_many(self, steps) -> list:
+        """
+        Apply a batch of resolution steps, as a scripted derivation or a replay would.
+        
+        The types and index ranges of the whole batch, and the clashes of the steps that only
+        use clauses already in the model, are checked before any step runs. The batch is
+        atomic: if a step fails, the clauses added by the earlier steps are removed again and
+        whatever undo() had hidden is brought back, so redo() still works. All steps together
+        make at most one new version, so a single undo() reverts the batch.
+        
+        Without subsumption, every step is resolved before the model changes: resolvents are
+        deduplicated against the visible clauses and each other, then the new ones are
+        appended with one update of the occurrence index. With subsumption the steps run one
+        by one, since each kept clause may retire others.
+        
+        Args:
+            steps: Iterable of (index1, index2, literal) triples as taken by resolve(); an
+                index may refer to a clause added by an earlier step of the batch
+        
+        Returns:
+            The list of what resolve() would have returned for each step: the index of the
+            resolvent, or None if forward subsumption discarded it
+        
+        Raises:
+            IndexError: If an index is out of range when its step runs
+            TypeError: If an index is not an int or a literal is not a Literal object
+            ValueError: If a step is not a triple or its clauses cannot be resolved on its literal
+        """
+        steps = list(steps)
+        size = self.__size
+        for position, step in enumerate(steps):
+            if not isinstance(step, (tuple, list)) or len(step) != 3:
+                raise ValueError(f"step {position} must be an (index1, index2, literal) triple, got: {step!r}")
+            index1, index2, literal = step
+            if not isinstance(literal, Literal):
+                raise TypeError(f"literal of step {position} must be a Literal object, got: {type(literal).__name__}")
+            for index in (index1, index2):
+                if not isinstance(index, int):
+                    raise TypeError(f"indices of step {position} must be ints, got: {type(index).__name__}")
+                # Each earlier step adds at most one clause
+                if index < 0 or index >= size + position:
+                    raise IndexError(f"index {index} of step {position} is out of range for clauses list of length {size + position}")
+            if index1 < size and index2 < size:
+                bit = 1 << self.__table.translate(literal).var_id
+                if not self.__clauses[index1].clash_mask(self.__clauses[index2]) & bit:
+                    raise ValueError(f"step {position} cannot resolve on literal {literal}: "
+                                     f"literal must appear positive in one clause and negative in the other")
+        
+        if not self.__subsumption:
+            return self.__resolve_batch(steps)
+        
+        # With subsumption every kept clause may retire others and so change what later steps
+        # find, so the steps run one by one. The first added clause drops the state undo()
+        # hid; keep it to restore on failure
+        hidden = [self.__clauses[index] for index in range(size, len(self.__clauses))]
+        hidden_retired = [(index, by) for index, by in self.__retired.items() if by > size]
+        redo = self.__history[self.__version + 1:]
+        results = []
+        try:
+            for position, (index1, index2, literal) in enumerate(steps):
+                if max(index1, index2) >= self.__size:
+                    raise IndexError(f"index {max(index1, index2)} of step {position} is out of range for clauses list of length {self.__size}")
+                results.append(self.__resolve_step(index1, index2, literal)[0])
+        except (IndexError, ValueError):
+            self.__size = size
+            self.__truncate()
+            for clause in hidden:
+                self.__add_clause(clause)
+            self.__size = size
+            self.__retired.update(hidden_retired)
+            self.__history[self.__version + 1:] = redo
+            raise
+        if self.__size > size:
+            self.__new_version()
+        return results
+    
+    def __resolve_batch(self, steps: list) -> list:
+        """
+        Run the validated steps of resolve_many() without subsumption: resolve them all first,
+        deduplicating each resolvent against the visible clauses and the batch's own, then
+        append and index the new clauses in one pass. A failing step raises before the model
+        is touched.
+        """
+        stats = self.__statistics
+        if stats is not None:
+            start = time.perf_counter()
+        size = self.__size
+        clauses = self.__clauses
+        cache = self.__resolvent_cache
+        # New clauses in the order they will be appended, and the index of each
+        pending = []
+        added = {}
+        results = []
+        keys = []
+        hits = 0
+        for position, (index1, index2, literal) in enumerate(steps):
+            end = size + len(pending)
+            if max(index1, index2) >= end:
+                raise IndexError(f"index {max(index1, index2)} of step {position} is out of range for clauses list of length {end}")
+            literal = self.__table.translate(literal)
+            key = (min(index1, index2), max(index1, index2), literal.var_id)
+            index = cache.get(key)
+            if index is not None and index < size:
+                hits += 1
+                results.append(index)
+                continue
+            clause1 = clauses[index1] if index1 < size else pending[index1 - size]
+            clause2 = clauses[index2] if index2 < size else pending[index2 - size]
+            bit = 1 << literal.var_id
+            if not clause1.clash_mask(clause2) & bit:
+                raise ValueError(f"step {position} cannot resolve on literal {literal}: "
+                                 f"literal must appear positive in one clause and negative in the other")
+            resolvent = Clause.resolve_bit(clause1, clause2, bit)
+            index = self.__visible_index(resolvent)
+            if index is None:
+                index = added.get(resolvent)
+            if index is None:
+                index = end
+                added[resolvent] = index
+                pending.append(resolvent)
+            keys.append((key, index))
+            results.append(index)
+        
+        self.__resolvent_hits += hits
+        self.__resolvent_misses += len(keys)
+        if stats is not None:
+            stats.resolutions_attempted += len(steps)
+            stats.duplicates += len(steps) - len(pending)
+            stats.resolvents_kept += len(pending)
+            stats.add_time("resolve", start)
+        if pending:
+            self.__truncate()
+            self.__add_clauses(pending)
+            self.__new_version()
+        for key, index in keys:
+            cache[key] = index
+            cache.move_to_end(key)
+        while len(cache) > self.RESOLVENT_CACHE_SIZE:
+            cache.popitem(last=False)
+        return results
+    
+    def resolvent_cache_info(self) -> dict:
+        """Return the hits, misses, current size and maximum size of the resolvent cache"""
+        return {
+            "hits": self.__resolvent_hits,
+            "misses": self.__resolvent_misses,
+            "size": len(self.__resolvent_cache),
+            "maxsize": self.RESOLVENT_CACHE_SIZE,
+        }
+    
+    def resolvable_partners(self, index: int) -> list:
+        """
+        Return the indices of the other clauses that can be resolved with the clause at index.
+        
+        A partner is any clause containing the negation of one of the clause's literals. The
+        lookup goes through the occurrence index, so its cost depends on how often those
+        negations occur rather than on the number of clauses in the model.
+        
+        Args:
+            index: Index of the clause
+        
+        Returns:
+            Sorted list of partner indices (not including index itself)
+        
+        Raises:
+            IndexError: If index is out of range
+        """
+        if index < 0 or index >= self.__size:
+            raise IndexError(f"index {index} is out of range for clauses list of length {self.__size}")
+        
+        size = self.__size
+        partners = set()
+        for lit in self.__clauses[index].get_literals():
+            partners.update(self.__occurrences.get(lit.negate(), ()))
+        partners.discard(index)
+        return sorted(partner for partner in partners
+                      if partner < size and self.__retired.get(partner, size + 1) > size)
+    
+    def saturate(self, max_clauses: int = None, strategy = "fifo") -> bool:
+        """
+        Automatically resolve clauses until the empty clause is derived or no new clause can be.
+        
+        Runs a given-clause loop: clauses wait in a passive queue, and each one taken from
+        it (the given clause) is resolved against every active clause before becoming active
+        itself, so every pair of active clauses has been tried exactly once. Only resolvents
+        on a single clashing letter are kept, since any other resolvent is a tautology.
+        Every kept resolvent is appended to the model with its parents, so get_proof()
+        works on the result.
+        
+        Args:
+            max_clauses: Optional cap on the number of clauses in the model; the search
+                stops early once it is reached
+            strategy: Name of a clause-selection strategy from Strategy.STRATEGIES ("fifo",
+                "unit", "smallest", "weight-age", "sos" or "ordered"), or a fresh Strategy
+                instance; "pairs" (or a fresh PairQueue) selects clause pairs instead, see
+                below
+        
+        With "pairs", the passive queue holds clause pairs rather than clauses, best pair
+        first: smallest estimated resolvent, then shallowest and oldest clause. The pairs
+        are generated lazily from the clauses' occurrences, so the queue's memory grows with
+        the number of clauses kept instead of the number of pairs, and a pair whose clause
+        was retired in the meantime is dropped when it comes up.
+        
+        Returns:
+            True if the empty clause is in the model, False if a fixpoint (or max_clauses)
+            was reached without deriving it
+        """
+        if max_clauses is not None and max_clauses < 1:
+            raise ValueError(f"max_clauses must be positive, got: {max_clauses}")
+        if strategy == "pairs" or isinstance(strategy, PairQueue):
+            passive = PairQueue() if strategy == "pairs" else strategy
+        else:
+            passive = get_strategy(strategy)
+        
+        if self.__visible_index(Clause()) is not None:
+            return True
+        self.__truncate()
+        size = self.__size
+        if isinstance(passive, PairQueue):
+            refuted = self.__saturate_pairs(passive, max_clauses)
+        else:
+            refuted = self.__saturate(passive, max_clauses)
+        if self.__size > size:
+            self.__new_version()
+        return refuted
+    
+    def __saturation_inputs(self) -> list:
+        """
+        Interreduce the clauses if subsumption is on, then return the indices of the clauses
+        saturate() starts from: those neither retired nor tautologies.
+        """
+        if self.__subsumption:
+            for index, clause in enumerate(self.__clauses):
+                if index not in self.__retired:
+                    self.__retire_subsumed(clause, index)
+        return [index for index, clause in enumerate(self.__clauses)
+                if index not in self.__retired and not clause.is_tautology()]
+    
+    def __keep_resolvent(self, resolvent: Clause, discarded: set, retire, max_clauses) -> tuple:
+        """
+        Add a resolvent found by saturate() unless it is already in the model or a kept clause
+        subsumes it; discarded collects the resolvents dropped that way. retire is called with
+        the index of every clause the new one retires.
+        
+        Returns:
+            An (index, result) pair: the index of the added resolvent (None if it was not kept)
+            and saturate()'s result if the search ends here, otherwise None
+        """
+        stats = self.__statistics
+        if stats is not None:
+            start = time.perf_counter()
+        if resolvent in self.__clauses:
+            if stats is not None:
+                stats.duplicates += 1
+                stats.add_time("dedup", start)
+            return None, None
+        if resolvent in discarded or (self.__subsumption and self.__find_subsumer(resolvent) is not None):
+            discarded.add(resolvent)
+            if stats is not None:
+                stats.subsumed += 1
+                stats.add_time("dedup", start)
+            return None, None
+        if stats is not None:
+            stats.resolvents_kept += 1
+            stats.add_time("dedup", start)
+        index = self.__add_clause(resolvent)
+        if self.__subsumption:
+            for retired in self.__retire_subsumed(resolvent, index):
+                retire(retired)
+        if len(resolvent) == 0:
+            return index, True
+        if max_clauses is not None and len(self.__clauses) >= max_clauses:
+            return index, False
+        return index, None
+    
+    def __saturate(self, passive, max_clauses) -> bool:
+        """Run the given-clause loop of saturate()"""
+        # Resolvents already dropped by forward subsumption
+        discarded = set()
+        stats = self.__statistics
+        
+        active = set()
+        # Resolution depth of every clause taking part in the search
+        depths = {}
+        has_goals = bool(self.__goals)
+        for index in self.__saturation_inputs():
+            clause = self.__clauses[index]
+            depths[index] = 0
+            if passive.starts_passive(clause, index in self.__goals, has_goals):
+                passive.push(index, clause, 0)
+            else:
+                active.add(index)
+        
+        while passive:
+            given_index = passive.pop()
+            if given_index in self.__retired:
+                continue
+            given = self.__clauses[given_index]
+            partners = []
+            for partner_index in self.resolvable_partners(given_index):
+                if partner_index in active:
+                    partner = self.__clauses[partner_index]
+                    partners.append((partner_index, partner.positive_mask, partner.negative_mask))
+            if stats is not None:
+                start = time.perf_counter()
+            # Only pairs clashing on one letter come back; the others only have tautological resolvents
+            candidates = single_clash_resolvents((given.positive_mask, given.negative_mask), partners)
+            if stats is not None:
+                stats.add_time("resolve", start)
+                stats.resolutions_attempted += len(partners) - len(candidates)
+                stats.tautologies += len(partners) - len(candidates)
+            for partner_index, clash, positive, negative in candidates:
+                # Earlier resolvents of this given clause may have retired the partner
+                if partner_index not in active:
+                    continue
+                partner = self.__clauses[partner_index]
+                if not passive.allows(given, partner, clash):
+                    continue
+                if stats is not None:
+                    stats.resolutions_attempted += 1
+                    start = time.perf_counter()
+                resolvent = Clause.from_masks(positive, negative, given, partner)
+                if stats is not None:
+                    stats.add_time("resolve", start)
+                resolvent_index, result = self.__keep_resolvent(resolvent, discarded, active.discard, max_clauses)
+                if result is not None:
+                    return result
+                if resolvent_index is None:
+                    continue
+                depths[resolvent_index] = max(depths[given_index], depths[partner_index]) + 1
+                passive.push(resolvent_index, resolvent, depths[resolvent_index])
+                if given_index in self.__retired:
+                    break
+            if given_index not in self.__retired:
+                active.add(given_index)
+        return False
+    
+    def __saturate_pairs(self, queue: PairQueue, max_clauses) -> bool:
+        """Run saturate() with a passive queue of clause pairs"""
+        # Resolvents already dropped by forward subsumption
+        discarded = set()
+        stats = self.__statistics
+        
+        # Resolution depth of every clause taking part in the search
+        depths = {}
+        for index in self.__saturation_inputs():
+            depths[index] = 0
+            queue.push(index, self.__clauses[index], 0)
+        
+        while True:
+            pair = queue.pop()
+            if pair is None:
+                return False
+            first_index, second_index = pair
+            first = self.__clauses[first_index]
+            second = self.__clauses[second_index]
+            if stats is not None:
+                stats.resolutions_attempted += 1
+                start = time.perf_counter()
+            clash = (first.positive_mask & second.negative_mask) | (first.negative_mask & second.positive_mask)
+            # Only pairs clashing on one letter are resolved; the others only have tautological resolvents
+            if clash & (clash - 1):
+                if stats is not None:
+                    stats.tautologies += 1
+                    stats.add_time("resolve", start)
+                continue
+            positive, negative = resolve_masks(first.positive_mask, first.negative_mask,
+                                               second.positive_mask, second.negative_mask, clash)
+            resolvent = Clause.from_masks(positive, negative, first, second)
+            if stats is not None:
+                stats.add_time("resolve", start)
+            resolvent_index, result = self.__keep_resolvent(resolvent, discarded, queue.retire, max_clauses)
+            if result is not None:
+                return result
+            if resolvent_index is None:
+                continue
+            depths[resolvent_index] = max(depths[first_index], depths[second_index]) + 1
+            queue.push(resolvent_index, resolvent, depths[resolvent_index])
+    
+    def satisfying_assignment(self):
+        """
+        Check whether the clauses of this model can all be satisfied, using a CDCL SAT solver.
+        
+        This is much faster than saturate() at telling that no contradiction can be derived.
+        
+        Returns:
+            None if the clauses are unsatisfiable (so resolution can derive the empty clause),
+            otherwise a dict mapping every letter in the model to a satisfying truth value
+        """
+        return CDCLSolver(self.get_clauses()).solve()
+    
+    def suggest_next_step(self, budget: float = None):
+        """
+        Suggest the next resolution step, as the first step of a shortest refutation of the
+        clauses that are not retired.
+        
+        The search (see Search.RefutationSearch) deepens one step at a time and stops when
+        budget seconds have passed, so a hint never holds up the caller for long. If no
+        refutation was found by then, the suggestion is the step giving the smallest
+        resolvent. Hints are cached per model state: asking again for a finished hint is
+        instant, and asking again for an unfinished one resumes its search.
+        
+        Args:
+            budget: Seconds the search may take (default HINT_BUDGET)
+        
+        Returns:
+            None if the empty clause is already in the model or the search showed that no
+            refutation exists, otherwise an (index1, index2, literal, steps) tuple:
+            resolve(index1, index2, literal) is the suggested step and steps is the length of
+            the shortest refutation it starts, or None if the budget ran out before one was
+            found (the clauses may then also be satisfiable)
+        """
+        if budget is None:
+            budget = self.HINT_BUDGET
+        deadline = time.perf_counter() + budget
+        size = self.__size
+        indices = tuple(index for index in range(size)
+                        if self.__retired.get(index, size + 1) > size and not self.__clauses[index].is_tautology())
+        entry = self.__hints.get(indices)
+        if entry is not None:
+            self.__hints.move_to_end(indices)
+            if entry["final"]:
+                return entry["hint"]
+        else:
+            masks = [(self.__clauses[index].positive_mask, self.__clauses[index].negative_mask) for index in indices]
+            final = (0, 0) in masks
+            entry = {"search": RefutationSearch(masks), "hint": None, "fallback": None, "final": final}
+            self.__hints[indices] = entry
+            if len(self.__hints) > self.HINT_CACHE_SIZE:
+                self.__hints.popitem(last=False)
+            if final:
+                return None
+        
+        search = entry["search"]
+        try:
+            steps = search.search(deadline)
+        except SearchTimeout:
+            if entry["fallback"] is None:
+                smallest = self.__smallest_step(indices, deadline)
+                if smallest is None:
+                    # Nothing new can be derived, so there is no refutation to hint at
+                    entry["final"] = True
+                    return None
+                entry["fallback"] = self.__hint(*smallest, None)
+            entry["hint"] = entry["fallback"]
+            return entry["hint"]
+        entry["final"] = True
+        if steps is None:
+            return None
+        i, j = steps[0][:2]
+        entry["hint"] = self.__hint(indices[i], indices[j], len(steps))
+        return entry["hint"]
+    
+    def __smallest_step(self, indices: tuple, deadline: float):
+        """
+        Return the (index1, index2) pair among indices whose resolvent is smallest and not in
+        the model yet, or None if no pair has such a resolvent.
+        
+        Clauses are visited smallest first and their partners come from the occurrence index.
+        A resolvent is at least as large as either parent minus the pivot, so the scan stops once
+        the clauses left are too large to beat the best pair. Once a pair is known, the scan also
+        stops when deadline passes and returns the best pair found so far.
+        """
+        clauses = self.__clauses
+        members = {(clauses[index].positive_mask, clauses[index].negative_mask) for index in indices}
+        candidates = set(indices)
+        best = None
+        best_size = math.inf
+        for index in sorted(indices, key=lambda index: len(clauses[index])):
+            clause = clauses[index]
+            if len(clause) - 1 >= best_size:
+                break
+            if best is not None and time.perf_counter() > deadline:
+                break
+            for partner in self.resolvable_partners(index):
+                if partner not in candidates:
+                    continue
+                other = clauses[partner]
+                clash = (clause.positive_mask & other.negative_mask) | (clause.negative_mask & other.positive_mask)
+                if clash & (clash - 1):
+                    continue
+                resolvent = resolve_masks(clause.positive_mask, clause.negative_mask,
+                                          other.positive_mask, other.negative_mask, clash)
+                size = resolvent[0].bit_count() + resolvent[1].bit_count()
+                if size < best_size and resolvent not in members:
+                    best, best_size = (index, partner), size
+        return best
+    
+    def __hint(self, index1: int, index2: int, steps) -> tuple:
+        """Build the suggest_next_step() tuple for resolving the clauses at index1 and index2"""
+        return (index1, index2, self.getEasyLiteral(index1, index2), steps)
+    
+    def clause_matrix(self) -> ClauseMatrix:
+        """
+        Return a NumPy view of the clauses in the current version, for queries over all pairs
+        at once (see ClauseMatrix); row i is the clause at index i.
+        
+        Raises:
+            ImportError: If NumPy is not installed
+        """
+        return ClauseMatrix(self.get_clauses())
     
     def numResolveLiterals(self, index1: int, index2: int) -> int:
         """
         Return the number of literal-negation pairs between the clauses at index1 and index2.
         Raises IndexError for invalid indices.
         """
-        if index1 < 0 or index1 >= len(self.__clauses):
-            raise IndexError(f"index1 {index1} is out of range for clauses list of length {len(self.__clauses)}")
-        if index2 < 0 or index2 >= len(self.__clauses):
-            raise IndexError(f"index2 {index2} is out of range for clauses list of length {len(self.__clauses)}")
-
-        clause1 = self.__clauses[index1]
-        clause2 = self.__clauses[index2]
-        literals1 = clause1.get_literals()
-        literals2 = clause2.get_literals()
-
-        # Find all literal-negation pairs
-        pairs = 0
-        for lit1 in literals1:
-            for lit2 in literals2:
-                if lit1.letter == lit2.letter and lit1.is_negated != lit2.is_negated:
-                    pairs += 1
-        return pairs
-
+        positive, negative = self.__clash(index1, index2)
+        return positive.bit_count() + negative.bit_count()
+    
     def getEasyLiteral(self, index1: int, index2: int) -> Literal:
         """
         Returns a literal from clause at index1 that has its negation in clause at index2,
-        or vice versa. Raises IndexError for invalid indices. Returns the first such literal found.
+        or vice versa. Raises IndexError for invalid indices. Returns the literal on the
+        letter with the smallest var_id.
         Raises ValueError if no such literal exists.
         """
-        if index1 < 0 or index1 >= len(self.__clauses):
-            raise IndexError(f"index1 {index1} is out of range for clauses list of length {len(self.__clauses)}")
-        if index2 < 0 or index2 >= len(self.__clauses):
-            raise IndexError(f"index2 {index2} is out of range for clauses list of length {len(self.__clauses)}")
-
-        clause1 = self.__clauses[index1]
-        clause2 = self.__clauses[index2]
-        literals1 = clause1.get_literals()
-        literals2 = clause2.get_literals()
-
-        for lit1 in literals1:
-            for lit2 in literals2:
-                if lit1.letter == lit2.letter and lit1.is_negated != lit2.is_negated:
-                    return lit1
-        for lit2 in literals2:
-            for lit1 in literals1:
-                if lit2.letter == lit1.letter and lit2.is_negated != lit1.is_negated:
-                    return lit2
-        raise ValueError("No literal-negation pair found between the two clauses.")
-
-    def get_proof(self) -> str:
+        positive, negative = self.__clash(index1, index2)
+        clash = positive | negative
+        if not clash:
+            raise ValueError("No literal-negation pair found between the two clauses.")
+        bit = clash & -clash
+        return self.__table.from_var_id(bit.bit_length() - 1, not positive & bit)
+    
+    def get_proof(self) -> Proof:
         """
         Generate a proof of resolution steps leading to the empty clause, if it exists.
         
+        The derivation DAG is walked iteratively (left parent, right parent, then the
+        clause itself), input clauses are numbered first and derived clauses after, and
+        every clause gets its line number exactly once, so extraction is linear in the
+        size of the proof.
+        
         Returns:
-            A string representation of the proof steps, or a message indicating no proof exists.
-
+            A Proof whose str() is the printable list of proof steps
+        
         Raises:
             ValueError: If no empty clause exists in the model
         """
-        empty_clause = None
-        for clause in self.__clauses:
-            if len(clause.get_literals()) == 0:
-                empty_clause = clause
-                break
-        
-        if empty_clause is None:
+        start = time.perf_counter()
+        empty_index = self.__visible_index(Clause())
+        if empty_index is None:
             raise ValueError("No empty clause exists in the model; cannot generate proof.")
         
+        # Iterative post-order traversal: a clause is emitted after both of its parents
         proof_list = []
-        seen = set()
-        def backtrack(clause: Clause):
-            if clause is None:
-                return
-            left, right = clause.get_parents()
-            backtrack(left)
-            backtrack(right)
-            if clause not in seen:
+        visited = set()
+        stack = [(self.__clauses[empty_index], False)]
+        while stack:
+            clause, expanded = stack.pop()
+            if expanded:
                 proof_list.append(clause)
-                seen.add(clause)
-        backtrack(empty_clause)
-        all_input_clause_at_front = []
-        for clause in proof_list:
-            if clause.get_parents() == (None, None):
-                all_input_clause_at_front.append(clause)
-        for clause in proof_list:
-            if clause.get_parents() != (None, None):
-                all_input_clause_at_front.append(clause)
-        proof_str = ""
-        for i in range(len(all_input_clause_at_front)):
-            end_str = "Input clause" if all_input_clause_at_front[i].get_parents() == (None, None) else (str(all_input_clause_at_front.index(all_input_clause_at_front[i].get_parents()[0]) + 1) + "," + str(all_input_clause_at_front.index(all_input_clause_at_front[i].get_parents()[1]) + 1) + " Resolution")
-            proof_str += f"{i+1:<5} {str(all_input_clause_at_front[i]):<20} {end_str:>20}\n"
-        return proof_str
+                continue
+            if clause in visited:
+                continue
+            visited.add(clause)
+            stack.append((clause, True))
+            left, right = clause.get_parents()
+            if right is not None:
+                stack.append((right, False))
+            if left is not None:
+                stack.append((left, False))
+        
+        inputs = [c for c in proof_list if c.get_parents() == (None, None)]
+        derived = [c for c in proof_list if c.get_parents() != (None, None)]
+        lines = {}
+        for clause in inputs + derived:
+            lines[clause] = len(lines) + 1
+        steps = [(clause, None) for clause in inputs]
+        for clause in derived:
+            left, right = clause.get_parents()
+            steps.append((clause, (lines[left], lines[right])))
+        if self.__statistics is not None:
+            self.__statistics.add_time("proof", start)
+        return Proof(steps)
+    
+    def minimize_proof(self, budget: float = 0.0) -> tuple:
+        """
+        Return a refutation of the model's input clauses that is shorter than get_proof().
+        
+        The proof built so far is compressed first (see ProofCompression.compress()); then,
+        if budget is positive, a search for a refutation with fewer resolution steps runs
+        for at most budget seconds, starting from every input clause of the model.
+        
+        Args:
+            budget: Seconds the exhaustive search may take; 0 only compresses
+        
+        Returns:
+            A (proof, optimal) pair, optimal telling whether the proof is known to have the
+            fewest resolution steps possible
+        
+        Raises:
+            ValueError: If no empty clause exists in the model
+        """
+        proof = self.get_proof()
+        start = time.perf_counter()
+        inputs = [clause for clause in self.get_clauses() if clause.get_parents() == (None, None)]
+        result = ProofCompression.minimize(proof, inputs, budget)
+        if self.__statistics is not None:
+            self.__statistics.add_time("proof", start)
+        return result
+    
     def get_literal_negation_pairs(self, index1: int, index2: int) -> list:
         """
         Returns a list of non-negated literals from clause at index1 or index2
-        that have their negation in the other clause. Raises IndexError for invalid indices.
+        that have their negation in the other clause, in var_id order.
+        Raises IndexError for invalid indices.
         """
-        if index1 < 0 or index1 >= len(self.__clauses):
-            raise IndexError(f"index1 {index1} is out of range for clauses list of length {len(self.__clauses)}")
-        if index2 < 0 or index2 >= len(self.__clauses):
-            raise IndexError(f"index2 {index2} is out of range for clauses list of length {len(self.__clauses)}")
-
-        clause1 = self.__clauses[index1]
-        clause2 = self.__clauses[index2]
-        literals1 = clause1.get_literals()
-        literals2 = clause2.get_literals()
-
+        positive, negative = self.__clash(index1, index2)
+        clash = positive | negative
         pairs = []
-        # Only add the non-negated literal for each pair
-        for lit1 in literals1:
-            for lit2 in literals2:
-                if lit1.letter == lit2.letter and lit1.is_negated != lit2.is_negated:
-                    if not lit1.is_negated:
-                        pairs.append(lit1)
-                    elif not lit2.is_negated:
-                        pairs.append(lit2)
-        # Remove duplicates (by letter)
-        unique_pairs = []
-        seen = set()
-        for lit in pairs:
-            key = lit.letter
-            if key not in seen:
-                unique_pairs.append(lit)
-                seen.add(key)
-        return unique_pairs
-
+        while clash:
+            bit = clash & -clash
+            pairs.append(self.__table.from_var_id(bit.bit_length() - 1))
+            clash ^= bit
+        return pairs
+    
     @staticmethod
-    def parse(s: str) -> 'ResolutionModel':
+    def parse(s: str, statistics: bool = False) -> 'ResolutionModel':
         """
         Parse a string and return the corresponding ResolutionModel object.
-
+        
         Accepts formats like:
             - "{C, D}, {A, ~B}"
             - "{A, B} & {~B, C}"
             - "(A B) ∧ (~B C)"
             - "{{A, B}, {C, D}}"
             - Each clause should be in the format accepted by Clause.parse()
-
+            - A clause prefixed with "*", as in "{A, B} *{~A}", is marked as a goal clause
+        
         Args:
             s: String to parse
-
+            statistics: Whether the model collects engine statistics, starting with the
+                time spent parsing
+        
         Returns:
             A ResolutionModel object containing the parsed clauses
-
+        
         Raises:
             ValueError: If the string is not in the correct format or contains invalid clauses
             TypeError: If the input is not a string
         """
         if not isinstance(s, str):
             raise TypeError(f"parse() requires a string, got: {type(s).__name__}")
-
+        
+        start = time.perf_counter()
         cleaned = s.strip()
         if not cleaned:
             raise ValueError("parse() requires a non-empty string")
-
+        
         import re
         # Try to find all substrings that look like { ... }
-        clause_strings = re.findall(r'\{[^}]*\}', cleaned)
-
+        clause_strings = re.findall(r'\*?\s*\{[^}]*\}', cleaned)
+        
         if not clause_strings:
             # Try to find all substrings that look like ( ... )
-            clause_strings = re.findall(r'\([^)]*\)', cleaned)
-
+            clause_strings = re.findall(r'\*?\s*\([^)]*\)', cleaned)
+        
         if not clause_strings:
             # Try to find all substrings that look like [ ... ]
-            clause_strings = re.findall(r'\[[^\]]*\]', cleaned)    
-
+            clause_strings = re.findall(r'\*?\s*\[[^\]]*\]', cleaned)    
+        
         if not clause_strings:
             # If no {...}, [ ... ], or (...) found, fall back to previous splitting logic
             cleaned = cleaned.replace('&', ' ').replace('∧', ' ')
             clause_strings = cleaned.split()
-
+        
         if not clause_strings:
             raise ValueError("parse() resulted in no valid clauses")
-
+        
+        table = SymbolTable()
         clauses = []
+        goals = []
         for clause_str in clause_strings:
             clause_str = clause_str.strip()
+            is_goal = clause_str.startswith('*')
+            if is_goal:
+                clause_str = clause_str[1:].strip()
             if not clause_str:
                 continue
             try:
-                clause = Clause.parse(clause_str)
-                if clause not in clauses:
-                    clauses.append(clause)
+                clause = Clause.parse(clause_str, table)
             except ValueError as e:
                 raise ValueError(f"Invalid clause in model: {e}")
-
+            clauses.append(clause)
+            if is_goal:
+                goals.append(clause)
+        
         if not clauses:
             raise ValueError("parse() resulted in no valid clauses")
-
+        
+        model = ResolutionModel(clauses, goals=goals, statistics=statistics)
+        if statistics:
+            model.statistics.add_time("parse", start)
+        return model
+    
+    @staticmethod
+    def from_dimacs(source) -> 'ResolutionModel':
+        """
+        Read a ResolutionModel from DIMACS CNF, one line at a time.
+        
+        Comment lines ("c ..."), the "p cnf <variables> <clauses>" header and a SATLIB-style
+        "%" end marker are accepted. Clauses are whitespace-separated non-zero integers ending
+        in 0 and may span several lines.
+        
+        Variable k is named by a "c var <k> <name>" comment if there is one (to_dimacs writes
+        these). Otherwise it is the k-th letter (1 is A) when the header declares at most 26
+        variables or there is no header, and x_k when the header declares more.
+        
+        Args:
+            source: Path of a DIMACS file, or an open text stream
+        
+        Returns:
+            A ResolutionModel with the clauses in file order (duplicates removed)
+        
+        Raises:
+            ValueError: If the input is not valid DIMACS
+            TypeError: If source is neither a path nor a stream
+        """
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "r") as stream:
+                return ResolutionModel.from_dimacs(stream)
+        if not hasattr(source, "readline"):
+            raise TypeError(f"from_dimacs() requires a path or a stream, got: {type(source).__name__}")
+        
+        declared = None
+        names = {}
+        table = SymbolTable()
+        # Positive Literal for each DIMACS variable seen so far
+        variables = {}
+        clauses = []
+        positive = negative = 0
+        pending = False
+        for line_number, line in enumerate(source, start=1):
+            if isinstance(line, bytes):
+                line = line.decode("ascii")
+            line = line.strip()
+            if not line:
+                continue
+            if line[0] == 'c':
+                comment = line.split()
+                if len(comment) == 4 and comment[1] == "var" and comment[2].isdigit():
+                    names[int(comment[2])] = comment[3]
+                continue
+            if line[0] == '%':
+                break
+            if line[0] == 'p':
+                header = line.split()
+                if len(header) != 4 or header[1] != "cnf" or not header[2].isdigit() or not header[3].isdigit():
+                    raise ValueError(f"line {line_number}: invalid DIMACS header '{line}'")
+                declared = int(header[2])
+                continue
+            for token in line.split():
+                try:
+                    value = int(token)
+                except ValueError:
+                    raise ValueError(f"line {line_number}: invalid DIMACS literal '{token}'")
+                if value == 0:
+                    clauses.append(Clause.from_masks(positive, negative, table=table))
+                    positive = negative = 0
+                    pending = False
+                    continue
+                k = abs(value)
+                lit = variables.get(k)
+                if lit is None:
+                    if declared is not None and k > declared:
+                        raise ValueError(f"line {line_number}: variable {k} exceeds the {declared} declared in the header")
+                    if k in names:
+                        name = names[k]
+                    elif declared is None or declared <= 26:
+                        if k > 26:
+                            raise ValueError(f"line {line_number}: variable {k} needs a 'p cnf' header declaring the variable count")
+                        name = ascii_uppercase[k - 1]
+                    else:
+                        name = f"x_{k}"
+                    try:
+                        lit = table.literal(False, name)
+                    except ValueError as e:
+                        raise ValueError(f"line {line_number}: {e}")
+                    variables[k] = lit
+                if value > 0:
+                    positive |= 1 << lit.var_id
+                else:
+                    negative |= 1 << lit.var_id
+                pending = True
+        if pending:
+            # Tolerate a last clause without its terminating 0
+            clauses.append(Clause.from_masks(positive, negative, table=table))
+        
+        if not clauses:
+            raise ValueError("from_dimacs() found no clauses")
+        
         return ResolutionModel(clauses)
+    
+    def to_dimacs(self, stream) -> None:
+        """
+        Write the clauses of this model to a text stream in DIMACS CNF, one line at a time.
+        
+        If the model only uses the letters A to Z, A is written as variable 1, B as 2, and
+        so on. Otherwise the variables are numbered 1, 2, ... in var_id order and a
+        "c var <k> <name>" comment records the name of each one.
+        
+        Args:
+            stream: Writable text stream
+        """
+        clauses = self.get_clauses()
+        used = 0
+        for clause in clauses:
+            used |= clause.positive_mask | clause.negative_mask
+        letters_only = used.bit_length() <= 26
+        if letters_only:
+            num_vars = used.bit_length()
+            numbers = {var_id: var_id + 1 for var_id in range(num_vars)}
+        else:
+            numbers = {}
+            while used:
+                low = used & -used
+                numbers[low.bit_length() - 1] = len(numbers) + 1
+                used ^= low
+            num_vars = len(numbers)
+        stream.write(f"p cnf {num_vars} {len(clauses)}\n")
+        if not letters_only:
+            for var_id, number in numbers.items():
+                stream.write(f"c var {number} {self.__table.from_var_id(var_id).letter}\n")
+        for clause in clauses:
+            literals = sorted(clause.get_literals(), key=lambda lit: (lit.var_id, lit.is_negated))
+            line = [str(-numbers[lit.var_id] if lit.is_negated else numbers[lit.var_id]) for lit in literals]
+            line.append("0")
+            stream.write(" ".join(line) + "\n")
+    
+    def __snapshot(self) -> dict:
+        """Describe the model as a snapshot dict for the Serialization module"""
+        var_index = {}
+        variables = []
+        clauses = []
+        parents = []
+        for index, clause in enumerate(self.get_clauses()):
+            literals = []
+            for lit in sorted(clause.get_literals(), key=lambda lit: (lit.var_id, lit.is_negated)):
+                v = var_index.get(lit.var_id)
+                if v is None:
+                    v = var_index[lit.var_id] = len(variables)
+                    variables.append(lit.letter)
+                literals.append(2 * v + lit.is_negated)
+            clauses.append(literals)
+            left, right = clause.get_parents()
+            left = None if left is None else self.__clauses.get_index(left)
+            right = None if right is None else self.__clauses.get_index(right)
+            # Parents outside the model (or not before the clause) cannot be referenced by index
+            if left is None or right is None or left >= index or right >= index:
+                parents.append(None)
+            else:
+                parents.append((left, right))
+        return {
+            "variables": variables,
+            "clauses": clauses,
+            "parents": parents,
+            "goals": sorted(self.__goals),
+            "retired": sorted(index for index in self.__retired if self.is_retired(index)),
+            "subsumption": self.__subsumption,
+        }
+    
+    @staticmethod
+    def __from_snapshot(snapshot: dict) -> 'ResolutionModel':
+        """Rebuild a model from a snapshot dict, in time linear in its size"""
+        try:
+            table = SymbolTable()
+            var_ids = [table.literal(False, name).var_id for name in snapshot["variables"]]
+            clauses = []
+            for literals, parents in zip(snapshot["clauses"], snapshot["parents"], strict=True):
+                positive = negative = 0
+                for literal in literals:
+                    if not 0 <= literal >> 1 < len(var_ids):
+                        raise ValueError(f"literal {literal} of clause {len(clauses)} is out of range")
+                    if literal & 1:
+                        negative |= 1 << var_ids[literal >> 1]
+                    else:
+                        positive |= 1 << var_ids[literal >> 1]
+                if parents is None:
+                    clauses.append(Clause.from_masks(positive, negative, table=table))
+                else:
+                    left, right = parents
+                    if not (0 <= left < len(clauses) and 0 <= right < len(clauses)):
+                        raise ValueError(f"parent index out of range for clause {len(clauses)}")
+                    clauses.append(Clause.from_masks(positive, negative, clauses[left], clauses[right]))
+            for index in snapshot["goals"]:
+                if not 0 <= index < len(clauses):
+                    raise ValueError(f"goal index {index} is out of range")
+            goals = [clauses[index] for index in snapshot["goals"]]
+            model = ResolutionModel(clauses, subsumption=snapshot["subsumption"], goals=goals)
+            if model.num_clauses() != len(clauses):
+                raise ValueError("snapshot contains duplicate clauses")
+            for index in snapshot["retired"]:
+                if not 0 <= index < len(clauses):
+                    raise ValueError(f"retired index {index} is out of range")
+            model.__retired = dict.fromkeys(sorted(snapshot["retired"]), model.num_clauses())
+        except (IndexError, TypeError) as e:
+            raise ValueError(f"malformed snapshot: {e}")
+        return model
+    
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the model to a compact binary snapshot.
+        
+        Clauses are stored in order as arrays of literal IDs over a table of variable names,
+        with parents as clause indices, together with the goal and retired clauses and the
+        subsumption setting. Statistics and caches are not stored. The snapshot starts with
+        a format version, and from_bytes() keeps loading snapshots of older versions.
+        """
+        return Serialization.encode_binary(self.__snapshot())
+    
+    @staticmethod
+    def from_bytes(data: bytes) -> 'ResolutionModel':
+        """
+        Load a model from a snapshot written by to_bytes(), in linear time.
+        
+        Raises:
+            ValueError: If the data is not a valid snapshot or has an unsupported version
+        """
+        return ResolutionModel.__from_snapshot(Serialization.decode_binary(data))
+    
+    def to_json(self) -> str:
+        """Serialize the model to a JSON snapshot holding the same data as to_bytes()"""
+        return Serialization.encode_json(self.__snapshot())
+    
+    @staticmethod
+    def from_json(text: str) -> 'ResolutionModel':
+        """
+        Load a model from a snapshot written by to_json(), in linear time.
+        
+        Raises:
+            ValueError: If the text is not a valid snapshot or has an unsupported version
+        """
+        return ResolutionModel.__from_snapshot(Serialization.decode_json(text))
+    
+    def __reduce__(self):
+        """Pickle (and copy) through the binary snapshot rather than the Clause object graph"""
+        return (ResolutionModel.from_bytes, (self.to_bytes(),))
@@ -1,7 +1,30 @@
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
 import unittest
+from unittest import mock
 import Literal
 import Clause
 import ResolutionModel
+import ClauseStore
+import Proof
+import Strategy
+import Solver
+import ResultCache
+import Canonical
+import benchmark
+import Statistics
+import Serialization
+import Search
+import ProofCompression
+import ClauseMatrix
+import PairQueue
+import pickle
 
 
 class TestLiteralConstructor(unittest.TestCase):
@@ -159,6 +182,138 @@ class TestLiteralEquality(unittest.TestCase):
         self.assertEqual(hash(lit1), hash(lit2))
 
 
+class TestLiteralInterning(unittest.TestCase):
+    """Test cases for Literal interning"""
+    
+    def test_constructor_returns_same_object(self):
+        """Test that constructing the same literal twice returns one object"""
+        self.assertIs(Literal.Literal(False, "A"), Literal.Literal(False, "A"))
+        self.assertIsNot(Literal.Literal(False, "A"), Literal.Literal(True, "A"))
+    
+    def test_parse_returns_interned_object(self):
+        """Test that parse returns the interned literal regardless of case"""
+        self.assertIs(Literal.Literal.parse("~b"), Literal.Literal(True, "B"))
+        self.assertIs(Literal.Literal.parse("~B"), Literal.Literal(True, "B"))
+    
+    def test_negate(self):
+        """Test that negate returns the interned complement"""
+        lit = Literal.Literal(False, "C")
+        self.assertIs(lit.negate(), Literal.Literal(True, "C"))
+        self.assertIs(lit.negate().negate(), lit)
+    
+    def test_truthy_negation_flag_is_normalized(self):
+        """Test that a non-bool negation flag maps onto the canonical literal"""
+        self.assertIs(Literal.Literal(1, "D"), Literal.Literal(True, "D"))
+        self.assertIs(Literal.Literal("yes", "D"), Literal.Literal(True, "D"))
+    
+    def test_no_instance_dict(self):
+        """Test that literals are slotted"""
+        with self.assertRaises(AttributeError):
+            Literal.Literal(False, "E").extra = 1
+    
+    def test_pickle_round_trip_is_interned(self):
+        """Test that unpickling yields the interned literal"""
+        import pickle
+        lit = Literal.Literal(True, "F")
+        self.assertIs(pickle.loads(pickle.dumps(lit)), lit)
+
+
+class TestVariableNames(unittest.TestCase):
+    """Test cases for variables beyond the 26 single capital letters"""
+    
+    def test_indexed_names(self):
+        """Test that indexed names are valid and keep their case"""
+        p12 = Literal.Literal(False, "P12")
+        x3 = Literal.Literal.parse("~x_3")
+        
+        self.assertEqual(p12.letter, "P12")
+        self.assertEqual(x3.letter, "x_3")
+        self.assertTrue(x3.is_negated)
+        self.assertIs(Literal.Literal.parse("P12"), p12)
+    
+    def test_single_letters_keep_their_ids(self):
+        """Test that A to Z are IDs 0 to 25 and other names come after them"""
+        self.assertEqual(Literal.Literal(False, "A").var_id, 0)
+        self.assertEqual(Literal.Literal(False, "Z").var_id, 25)
+        self.assertGreaterEqual(Literal.Literal(False, "Q7").var_id, 26)
+        self.assertIs(Literal.Literal.from_var_id(Literal.Literal(False, "Q7").var_id), Literal.Literal(False, "Q7"))
+        self.assertLessEqual(Literal.Literal(False, "Q7").var_id, Literal.Literal.num_vars() - 1)
+    
+    def test_invalid_names_raise_error(self):
+        """Test that names that are neither letters nor indexed names are rejected"""
+        for name in ["AB", "P1Q", "_1", "1P", "P_", "P-1"]:
+            with self.subTest(name=name):
+                with self.assertRaises(ValueError):
+                    Literal.Literal(False, name)
+                with self.assertRaises(ValueError):
+                    Literal.Literal.parse(name)
+        with self.assertRaises(ValueError):
+            Literal.Literal.from_var_id(Literal.Literal.num_vars())
+    
+    def test_clause_with_indexed_names(self):
+        """Test parsing, printing and resolving clauses with indexed names"""
+        clause1 = Clause.Clause.parse("{x_3, A, ~P12}")
+        clause2 = Clause.Clause.parse("{P12, ~x_3}")
+        
+        self.assertEqual(clause1.get_literals(), {Literal.Literal(False, "A"), Literal.Literal(True, "P12"),
+                                                  Literal.Literal(False, "x_3")})
+        self.assertTrue(repr(clause1).startswith("{A, "))
+        resolvent = Clause.Clause.resolve(clause1, clause2, Literal.Literal(False, "P12"))
+        self.assertTrue(resolvent.is_tautology())
+    
+    def test_model_with_many_variables(self):
+        """Test saturation and satisfiability on a chain of 40 implications"""
+        text = "{V1} " + " ".join(f"{{~V{i}, V{i + 1}}}" for i in range(1, 40)) + " {~V40}"
+        model = ResolutionModel.ResolutionModel.parse(text)
+        
+        self.assertIsNone(model.satisfying_assignment())
+        self.assertTrue(model.saturate(strategy="unit"))
+    
+    def test_models_number_their_own_variables(self):
+        """Test that a model's masks do not grow with the names other models use"""
+        ResolutionModel.ResolutionModel.parse(" ".join(f"{{y_{i}}}" for i in range(2000)))
+        before = Literal.Literal.num_vars()
+        model = ResolutionModel.ResolutionModel.parse("{z_1, ~A} {~z_1}")
+        
+        self.assertLessEqual(max(c.positive_mask | c.negative_mask for c in model.get_clauses()).bit_length(), 27)
+        self.assertEqual(Literal.Literal.num_vars(), before)
+        self.assertEqual(model.getEasyLiteral(0, 1).letter, "z_1")
+        self.assertEqual(model.satisfying_assignment(), {"A": False, "z_1": False})
+    
+    def test_equality_across_tables(self):
+        """Test that literals and clauses of different symbol tables compare by letter and polarity"""
+        table = Literal.SymbolTable()
+        table.literal(False, "w_9")
+        clause = Clause.Clause.parse("{~P12, A}", table)
+        
+        self.assertEqual(table.parse("~P12"), Literal.Literal(True, "P12"))
+        self.assertIsNot(table.parse("~P12"), Literal.Literal(True, "P12"))
+        self.assertEqual(clause, Clause.Clause.parse("{A, ~P12}"))
+        self.assertEqual(hash(clause), hash(Clause.Clause.parse("{A, ~P12}")))
+        self.assertIn(clause, {Clause.Clause.parse("{A, ~P12}")})
+        self.assertTrue(Clause.Clause.parse("{A}").subsumes(clause))
+        resolvent = Clause.Clause.resolve(clause, Clause.Clause.parse("{P12}"), Literal.Literal(False, "P12"))
+        self.assertEqual(resolvent, Clause.Clause.parse("{A}"))
+    
+    def test_concurrent_registration(self):
+        """Test that threads registering the same names get one ID per name"""
+        table = Literal.SymbolTable()
+        names = [f"t_{i}" for i in range(500)]
+        results = []
+        
+        def register():
+            results.append([table.literal(False, name).var_id for name in names])
+        
+        threads = [threading.Thread(target=register) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(all(ids == results[0] for ids in results))
+        self.assertEqual(len(table), 26 + len(names))
+        self.assertEqual(sorted(results[0]), list(range(26, 26 + len(names))))
+
+
 class TestClauseConstructor(unittest.TestCase):
     """Test cases for the Clause constructor"""
     
@@ -180,7 +335,7 @@ class TestClauseConstructor(unittest.TestCase):
         """Test creating a clause with default argument"""
         clause = Clause.Clause()
         self.assertEqual(clause.get_literals(), set())
-    
+
 
 
 class TestClauseParse(unittest.TestCase):
@@ -215,7 +370,7 @@ class TestClauseParse(unittest.TestCase):
         clause = Clause.Clause.parse("(A B C)")
         literals = clause.get_literals()
         self.assertEqual(len(literals), 3)
-
+    
     
     def test_parse_with_brackets(self):
         """Test parsing with brackets"""
@@ -325,6 +480,18 @@ class TestClauseResolve(unittest.TestCase):
         
         with self.assertRaises(ValueError):
             Clause.Clause.resolve(clause1, clause2, self.a)
+    
+    def test_single_clash_resolvents(self):
+        """Test that only partners clashing on one letter are resolved, with their resolvents"""
+        given = Clause.Clause.parse("{A, B}")
+        partners = [(i, c.positive_mask, c.negative_mask) for i, c in enumerate(
+            [Clause.Clause.parse("{~A, C}"), Clause.Clause.parse("{~A, ~B}"), Clause.Clause.parse("{C}")])]
+        
+        results = Clause.single_clash_resolvents((given.positive_mask, given.negative_mask), partners)
+        self.assertEqual(len(results), 1)
+        index, bit, positive, negative = results[0]
+        self.assertEqual((index, bit), (0, 0b1))
+        self.assertEqual(Clause.Clause.from_masks(positive, negative), Clause.Clause.parse("{B, C}"))
 
 
 class TestResolutionModelConstructor(unittest.TestCase):
@@ -431,6 +598,1539 @@ class TestResolutionModelResolve(unittest.TestCase):
         self.assertEqual(len(model.get_clauses()), initial_length + 2)
 
 
+class TestResolutionModelResolventCache(unittest.TestCase):
+    """Test cases for the resolvent cache behind ResolutionModel.resolve()"""
+    
+    def test_resolve_returns_index(self):
+        """Test that resolve returns the index of the new or existing resolvent"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B} {~A, B} {B}")
+        
+        self.assertEqual(model.resolve(0, 1, Literal.Literal(False, "A")), 2)
+        self.assertEqual(model.num_clauses(), 3)
+    
+    def test_repeated_resolve_hits_cache(self):
+        """Test that repeats in either order and polarity are served without building a clause"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B} {~A, C}")
+        index = model.resolve(0, 1, Literal.Literal(False, "A"))
+        
+        with mock.patch.object(Clause.Clause, "resolve", side_effect=AssertionError("resolvent rebuilt")):
+            self.assertEqual(model.resolve(0, 1, Literal.Literal(False, "A")), index)
+            self.assertEqual(model.resolve(1, 0, Literal.Literal(True, "A")), index)
+        
+        info = model.resolvent_cache_info()
+        self.assertEqual((info["hits"], info["misses"], info["size"]), (2, 1, 1))
+    
+    def test_invalid_resolve_is_not_cached(self):
+        """Test that a failed resolution still raises ValueError when repeated"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B} {~A, C}")
+        
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                model.resolve(0, 1, Literal.Literal(False, "B"))
+        self.assertEqual(model.resolvent_cache_info()["size"], 0)
+    
+    def test_cache_evicts_least_recently_used(self):
+        """Test that the cache stays bounded and evicts the least recently used entry"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B} {~A, C} {~B, D} {~C}")
+        with mock.patch.object(ResolutionModel.ResolutionModel, "RESOLVENT_CACHE_SIZE", 2):
+            model.resolve(0, 1, Literal.Literal(False, "A"))
+            model.resolve(0, 2, Literal.Literal(False, "B"))
+            model.resolve(0, 1, Literal.Literal(False, "A"))
+            model.resolve(1, 3, Literal.Literal(False, "C"))
+            self.assertEqual(model.resolvent_cache_info()["size"], 2)
+            
+            model.resolve(0, 1, Literal.Literal(False, "A"))
+            model.resolve(0, 2, Literal.Literal(False, "B"))
+        
+        info = model.resolvent_cache_info()
+        self.assertEqual((info["hits"], info["misses"]), (2, 4))
+    
+    def test_subsumed_resolvent_returns_none(self):
+        """Test that a resolvent discarded by forward subsumption gives None"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B, C} {~A, B, C} {B}")
+        model.subsumption = True
+        
+        self.assertIsNone(model.resolve(0, 1, Literal.Literal(False, "A")))
+        self.assertEqual(model.num_clauses(), 3)
+
+
+class TestResolutionModelHistory(unittest.TestCase):
+    """Test cases for undo(), redo() and jump_to() on ResolutionModel"""
+    
+    def setUp(self):
+        self.model = ResolutionModel.ResolutionModel.parse("{A, B} {~A, B} {~B, C} {~C}")
+        self.a = Literal.Literal(False, "A")
+        self.b = Literal.Literal(False, "B")
+        self.c = Literal.Literal(False, "C")
+    
+    def test_resolve_creates_versions(self):
+        """Test that each resolve() adding a clause makes a new version"""
+        self.model.resolve(0, 1, self.a)
+        self.model.resolve(0, 1, self.a)
+        self.model.resolve(2, 3, self.c)
+        
+        self.assertEqual((self.model.version, self.model.num_versions()), (2, 3))
+    
+    def test_undo_and_redo(self):
+        """Test stepping back and forth through versions"""
+        self.model.resolve(0, 1, self.a)
+        self.model.resolve(2, 3, self.c)
+        
+        self.assertTrue(self.model.undo())
+        self.assertEqual(self.model.get_clauses()[-1], Clause.Clause.parse("{B}"))
+        self.assertTrue(self.model.undo())
+        self.assertEqual(self.model.num_clauses(), 4)
+        self.assertFalse(self.model.undo())
+        
+        self.assertTrue(self.model.redo())
+        self.assertTrue(self.model.redo())
+        self.assertFalse(self.model.redo())
+        self.assertEqual(self.model.num_clauses(), 6)
+    
+    def test_jump_to(self):
+        """Test jumping straight to any version"""
+        self.model.resolve(0, 1, self.a)
+        self.model.resolve(2, 3, self.c)
+        self.model.resolve(4, 5, self.b)
+        
+        self.model.jump_to(1)
+        self.assertEqual(self.model.num_clauses(), 5)
+        self.model.jump_to(3)
+        self.assertEqual(self.model.get_proof().get_steps()[-1][0], Clause.Clause())
+        with self.assertRaises(IndexError):
+            self.model.jump_to(4)
+    
+    def test_undone_clauses_are_invisible(self):
+        """Test that queries ignore clauses of undone versions"""
+        self.model.resolve(0, 1, self.a)
+        self.model.resolve(2, 3, self.c)
+        self.model.resolve(4, 5, self.b)
+        self.model.jump_to(0)
+        
+        self.assertEqual(self.model, ResolutionModel.ResolutionModel.parse("{A, B} {~A, B} {~B, C} {~C}"))
+        self.assertEqual(self.model.resolvable_partners(2), [0, 1, 3])
+        with self.assertRaises(ValueError):
+            self.model.get_proof()
+        with self.assertRaises(ValueError):
+            self.model.index_of(Clause.Clause.parse("{B}"))
+        with self.assertRaises(IndexError):
+            self.model.resolve(4, 5, self.b)
+    
+    def test_change_after_undo_discards_redo(self):
+        """Test that resolving after undo() replaces the undone versions"""
+        self.model.resolve(0, 1, self.a)
+        self.model.resolve(2, 3, self.c)
+        self.model.undo()
+        self.model.undo()
+        
+        self.assertEqual(self.model.resolve(2, 3, self.c), 4)
+        
+        self.assertEqual(self.model.num_versions(), 2)
+        self.assertFalse(self.model.redo())
+        self.assertEqual(self.model.get_clauses()[4], Clause.Clause.parse("{~B}"))
+        self.assertEqual(self.model.resolvable_partners(4), [0, 1])
+        self.assertEqual(self.model.numResolveLiterals(0, 4), 1)
+    
+    def test_resolve_after_undo_rebuilds_resolvent(self):
+        """Test that a cached resolvent from an undone version is added again"""
+        self.model.resolve(0, 1, self.a)
+        self.model.undo()
+        
+        self.assertEqual(self.model.resolve(1, 0, Literal.Literal(True, "A")), 4)
+        self.assertEqual(self.model.num_clauses(), 5)
+        self.assertEqual(self.model.version, 1)
+    
+    def test_undo_restores_retired_clauses(self):
+        """Test that undoing a subsuming resolvent brings back the clauses it retired"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B, C} {A, ~B} {A, B}")
+        model.subsumption = True
+        model.resolve(1, 2, self.b)
+        self.assertTrue(model.is_retired(0))
+        
+        model.undo()
+        self.assertFalse(model.is_retired(0))
+        model.redo()
+        self.assertTrue(model.is_retired(0))
+    
+    def test_subsumed_resolvent_keeps_redo(self):
+        """Test that a resolvent discarded by forward subsumption after undo() leaves redo() working"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B, C} {~A, B, C} {B} {D, E} {~D, E}")
+        model.subsumption = True
+        model.resolve(3, 4, Literal.Literal(False, "D"))
+        model.undo()
+        
+        self.assertIsNone(model.resolve(0, 1, self.a))
+        self.assertEqual(model.num_versions(), 2)
+        self.assertTrue(model.redo())
+        self.assertEqual(model.get_clauses()[5], Clause.Clause.parse("{E}"))
+    
+    def test_hidden_clause_does_not_subsume(self):
+        """Test that a clause hidden by undo() does not make a new resolvent look subsumed"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B} {~A, B} {B, C} {~B, C}")
+        model.subsumption = True
+        model.resolve(2, 3, Literal.Literal(False, "B"))
+        model.undo()
+        
+        self.assertEqual(model.resolve(0, 1, self.a), 4)
+        self.assertFalse(model.redo())
+    
+    def test_saturate_is_one_version(self):
+        """Test that a saturate() run can be undone in one step"""
+        self.model.saturate()
+        
+        self.assertEqual(self.model.num_versions(), 2)
+        self.model.undo()
+        self.assertEqual(self.model.num_clauses(), 4)
+        self.assertTrue(self.model.saturate())
+    
+    def test_many_steps(self):
+        """Test jumping across hundreds of steps that share one clause log"""
+        model = ResolutionModel.ResolutionModel.parse(benchmark.implication_chain(300))
+        unit = 0
+        for i in range(1, 300):
+            unit = model.resolve(unit, i, Literal.Literal(False, f"x_{i}"))
+        
+        self.assertEqual(model.num_versions(), 300)
+        model.jump_to(0)
+        self.assertEqual(model.num_clauses(), 301)
+        model.jump_to(299)
+        self.assertEqual(model.resolve(unit, 300, Literal.Literal(False, "x_300")), 600)
+        self.assertEqual(len(model.get_proof()), 601)
+
+
+class TestResolutionModelResolveMany(unittest.TestCase):
+    """Test cases for ResolutionModel.resolve_many()"""
+    
+    def setUp(self):
+        self.model = ResolutionModel.ResolutionModel.parse("{A, B} {~A, B} {~B, C} {~C}")
+        self.a = Literal.Literal(False, "A")
+        self.b = Literal.Literal(False, "B")
+        self.c = Literal.Literal(False, "C")
+        self.steps = [(0, 1, self.a), (4, 2, self.b), (5, 3, self.c)]
+    
+    def test_matches_single_steps(self):
+        """Test that a batch gives the same indices and clauses as one resolve() per step"""
+        reference = ResolutionModel.ResolutionModel.parse("{A, B} {~A, B} {~B, C} {~C}")
+        expected = [reference.resolve(*step) for step in self.steps]
+        
+        self.assertEqual(self.model.resolve_many(self.steps), expected)
+        self.assertEqual(self.model.get_clauses(), reference.get_clauses())
+    
+    def test_duplicates_return_existing_index(self):
+        """Test that a step deriving a clause already present returns its index"""
+        self.assertEqual(self.model.resolve_many([(0, 1, self.a), (1, 0, self.a), (2, 3, self.c)]), [4, 4, 5])
+    
+    def test_one_version_per_batch(self):
+        """Test that the batch makes a single version that undo() reverts"""
+        self.model.resolve_many(self.steps)
+        
+        self.assertEqual(self.model.num_versions(), 2)
+        self.model.undo()
+        self.assertEqual(self.model.num_clauses(), 4)
+    
+    def test_validation_before_any_step(self):
+        """Test that a bad step later in the batch is caught before the first one runs"""
+        with self.assertRaises(IndexError):
+            self.model.resolve_many([(0, 1, self.a), (0, 9, self.b)])
+        with self.assertRaises(TypeError):
+            self.model.resolve_many([(0, 1, self.a), (0, 1, "A")])
+        with self.assertRaises(ValueError):
+            self.model.resolve_many([(0, 1)])
+        self.assertEqual((self.model.num_clauses(), self.model.num_versions()), (4, 1))
+    
+    def test_failed_step_rolls_back(self):
+        """Test that a step that cannot be resolved undoes the earlier steps of the batch"""
+        with self.assertRaises(ValueError):
+            self.model.resolve_many([(0, 1, self.a), (4, 3, self.b)])
+        
+        self.assertEqual((self.model.num_clauses(), self.model.num_versions()), (4, 1))
+        self.assertEqual(self.model.resolve(0, 1, self.a), 4)
+    
+    def test_clash_validation_before_any_step(self):
+        """Test that a step on existing clauses that do not clash is caught before the first step runs"""
+        self.model.resolve(0, 1, self.a)
+        self.model.undo()
+        
+        with mock.patch.object(Clause.Clause, "resolve_bit", wraps=Clause.Clause.resolve_bit) as resolve_bit:
+            with self.assertRaises(ValueError):
+                self.model.resolve_many([(2, 3, self.c), (0, 2, self.a)])
+        resolve_bit.assert_not_called()
+        self.assertTrue(self.model.redo())
+    
+    def test_failed_step_keeps_redo(self):
+        """Test that a failed batch after undo() leaves the undone version reachable"""
+        self.model.resolve(0, 1, self.a)
+        self.model.undo()
+        
+        with self.assertRaises(ValueError):
+            self.model.resolve_many([(2, 3, self.c), (4, 3, self.b)])
+        
+        self.assertEqual((self.model.num_clauses(), self.model.num_versions()), (4, 2))
+        self.assertTrue(self.model.redo())
+        self.assertEqual(self.model.get_clauses()[4], Clause.Clause.parse("{B}"))
+        self.assertEqual(self.model.resolvable_partners(4), [2])
+    
+    def test_failed_step_keeps_redo_with_subsumption(self):
+        """Test that a failed batch run step by step for subsumption also keeps the undone version"""
+        self.model.subsumption = True
+        self.model.resolve(0, 1, self.a)
+        self.model.undo()
+        
+        with self.assertRaises(ValueError):
+            self.model.resolve_many([(2, 3, self.c), (4, 3, self.b)])
+        
+        self.assertEqual((self.model.num_clauses(), self.model.num_versions()), (4, 2))
+        self.assertTrue(self.model.redo())
+    
+    def test_replay_matches_single_steps(self):
+        """Test that replaying a recorded derivation in one batch builds the same model and indices"""
+        text = benchmark.random_kcnf(30, ratio=5, seed=2)
+        recorded = ResolutionModel.ResolutionModel.parse(text)
+        rng = random.Random(0)
+        steps = []
+        while len(steps) < 300:
+            index1 = rng.randrange(recorded.num_clauses())
+            partners = recorded.resolvable_partners(index1)
+            if not partners:
+                continue
+            index2 = rng.choice(partners)
+            if recorded.numResolveLiterals(index1, index2) == 1:
+                literal = recorded.getEasyLiteral(index1, index2)
+                steps.append((index1, index2, literal))
+                recorded.resolve(index1, index2, literal)
+        
+        for clash_rows in (False, True):
+            with self.subTest(clash_rows=clash_rows):
+                reference = ResolutionModel.ResolutionModel.parse(text, statistics=True)
+                model = ResolutionModel.ResolutionModel.parse(text, statistics=True)
+                if clash_rows:
+                    model.resolvable_partners(0)
+                    model.numResolveLiterals(0, 1)
+                expected = [reference.resolve(*step) for step in steps]
+                
+                self.assertEqual(model.resolve_many(steps), expected)
+                self.assertEqual(model.get_clauses(), reference.get_clauses())
+                for index in range(0, model.num_clauses(), 7):
+                    self.assertEqual(model.resolvable_partners(index), reference.resolvable_partners(index))
+                    self.assertEqual(model.numResolveLiterals(0, index), reference.numResolveLiterals(0, index))
+                self.assertEqual((model.statistics.resolvents_kept, model.statistics.duplicates),
+                                 (reference.statistics.resolvents_kept, reference.statistics.duplicates))
+                self.assertEqual(model.resolve_many(steps[:50]), expected[:50])
+                self.assertEqual(model.num_versions(), 2)
+    
+    def test_reference_to_missing_clause_rolls_back(self):
+        """Test that an index left unfilled because an earlier step was a duplicate is rejected"""
+        with self.assertRaises(IndexError):
+            self.model.resolve_many([(0, 1, self.a), (0, 1, self.a), (5, 3, self.c)])
+        self.assertEqual(self.model.num_clauses(), 4)
+    
+    def test_subsumed_steps(self):
+        """Test that a resolvent discarded by forward subsumption gives None"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B, C} {~A, B} {B}")
+        model.subsumption = True
+        
+        self.assertEqual(model.resolve_many([(0, 1, self.a)]), [None])
+        self.assertEqual(model.num_versions(), 1)
+
+
+class TestRefutationSearch(unittest.TestCase):
+    """Test cases for the shortest-refutation search in Search"""
+    
+    @staticmethod
+    def masks(text):
+        model = ResolutionModel.ResolutionModel.parse(text)
+        return [(clause.positive_mask, clause.negative_mask) for clause in model.get_clauses()]
+    
+    def check_refutation(self, clauses, steps):
+        derived = list(clauses)
+        for i, j, resolvent in steps:
+            self.assertEqual(Search._single_clash(derived[i], derived[j]), resolvent)
+            derived.append(resolvent)
+        self.assertEqual(derived[-1], (0, 0))
+    
+    def test_finds_shortest_refutation(self):
+        """Test that the refutation found has the fewest possible steps"""
+        clauses = self.masks("{A, B} {~A, B} {A, ~B} {~A, ~B}")
+        steps = Search.RefutationSearch(clauses).search()
+        
+        self.assertEqual(len(steps), 3)
+        self.check_refutation(clauses, steps)
+    
+    def test_implication_chain_length(self):
+        """Test that a chain of n implications needs n steps"""
+        clauses = self.masks(benchmark.implication_chain(6))
+        steps = Search.RefutationSearch(clauses).search()
+        
+        self.assertEqual(len(steps), 6)
+        self.check_refutation(clauses, steps)
+    
+    def test_satisfiable_clauses(self):
+        """Test that the search ends without a refutation when there is none"""
+        self.assertIsNone(Search.RefutationSearch(self.masks("{A, B} {~A, C}")).search())
+    
+    def test_empty_clause_needs_no_steps(self):
+        """Test that a clause set holding the empty clause is refuted in zero steps"""
+        self.assertEqual(Search.RefutationSearch([(1, 0), (0, 0)]).search(), [])
+    
+    def test_deadline_and_resume(self):
+        """Test that a passed deadline raises SearchTimeout and a later search resumes"""
+        search = Search.RefutationSearch(self.masks(benchmark.implication_chain(5)))
+        with self.assertRaises(Search.SearchTimeout):
+            search.search(deadline=0)
+        self.assertEqual(search.depth_completed, 0)
+        
+        self.assertEqual(len(search.search()), 5)
+        self.assertEqual(search.depth_completed, 4)
+    
+    def test_max_depth(self):
+        """Test that max_depth stops the search without a refutation"""
+        search = Search.RefutationSearch(self.masks(benchmark.implication_chain(5)))
+        
+        self.assertIsNone(search.search(max_depth=3))
+        self.assertEqual(search.depth_completed, 3)
+
+
+class TestResolutionModelHint(unittest.TestCase):
+    """Test cases for ResolutionModel.suggest_next_step()"""
+    
+    def test_suggests_first_step_of_shortest_refutation(self):
+        """Test that following the hints derives the empty clause in the promised steps"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B} {~A, B} {A, ~B} {~A, ~B}")
+        index1, index2, literal, steps = model.suggest_next_step()
+        self.assertEqual(steps, 3)
+        
+        for remaining in range(3, 0, -1):
+            index1, index2, literal, steps = model.suggest_next_step()
+            self.assertEqual(steps, remaining)
+            model.resolve(index1, index2, literal)
+        self.assertTrue(any(len(clause.get_literals()) == 0 for clause in model.get_clauses()))
+        self.assertIsNone(model.suggest_next_step())
+    
+    def test_satisfiable_model(self):
+        """Test that a satisfiable model gets no hint"""
+        self.assertIsNone(ResolutionModel.ResolutionModel.parse("{A, B} {~A}").suggest_next_step())
+    
+    def test_hint_is_cached(self):
+        """Test that asking again for a finished hint does not search again"""
+        model = ResolutionModel.ResolutionModel.parse("{A} {~A, B} {~B}")
+        hint = model.suggest_next_step()
+        
+        with mock.patch.object(Search.RefutationSearch, "search") as search:
+            self.assertEqual(model.suggest_next_step(), hint)
+        search.assert_not_called()
+    
+    def test_budget_fallback(self):
+        """Test that an exhausted budget still suggests a valid step, without a length"""
+        model = ResolutionModel.ResolutionModel.parse(benchmark.implication_chain(30))
+        index1, index2, literal, steps = model.suggest_next_step(budget=0)
+        
+        self.assertIsNone(steps)
+        self.assertIsNotNone(model.resolve(index1, index2, literal))
+    
+    def test_budget_covers_large_inputs(self):
+        """Test that the budget also bounds the setup of a search and its fallback over many clauses"""
+        rng = random.Random(1)
+        clauses = []
+        for _ in range(4260):
+            variables = rng.sample(range(1000), 3)
+            clauses.append("{" + ", ".join(rng.choice(("", "~")) + f"x_{v}" for v in variables) + "}")
+        model = ResolutionModel.ResolutionModel.parse(" ".join(clauses))
+        
+        start = time.perf_counter()
+        index1, index2, literal, steps = model.suggest_next_step(budget=0.05)
+        self.assertLess(time.perf_counter() - start, 0.15)
+        self.assertIsNone(steps)
+        self.assertIsNotNone(model.resolve(index1, index2, literal))
+        model.undo()
+        
+        with mock.patch.object(Search.RefutationSearch, "search", side_effect=Search.SearchTimeout):
+            self.assertEqual(model.suggest_next_step(budget=0.05), (index1, index2, literal, None))
+    
+    def test_fallback_is_smallest_new_resolvent(self):
+        """Test that the budget fallback picks a smallest resolvent not already in the model"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B, C} {~A} {~C, D} {B, C}")
+        
+        with mock.patch.object(Search.RefutationSearch, "search", side_effect=Search.SearchTimeout):
+            index1, index2, literal, steps = model.suggest_next_step()
+        index = model.resolve(index1, index2, literal)
+        self.assertEqual(model.get_clauses()[index], Clause.Clause.parse("{B, D}"))
+    
+    def test_fallback_without_clashes(self):
+        """Test that the fallback gives no hint when no pair of clauses clashes"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B} {A, ~C}")
+        
+        with mock.patch.object(Search.RefutationSearch, "search", side_effect=Search.SearchTimeout):
+            self.assertIsNone(model.suggest_next_step())
+    
+    def test_hint_follows_undo(self):
+        """Test that undo() brings back the hint of the earlier clause set"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B} {~A, B} {A, ~B} {~A, ~B}")
+        hint = model.suggest_next_step()
+        model.resolve(*hint[:3])
+        self.assertEqual(model.suggest_next_step()[3], 2)
+        
+        model.undo()
+        self.assertEqual(model.suggest_next_step(), hint)
+    
+    def test_retired_clauses_are_skipped(self):
+        """Test that the hint only uses clauses that are not retired"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B} {~B} {~A, C} {~C}")
+        model.subsumption = True
+        model.resolve(0, 1, Literal.Literal(False, "B"))
+        
+        index1, index2, _, steps = model.suggest_next_step()
+        self.assertEqual(steps, 2)
+        self.assertFalse(model.is_retired(index1) or model.is_retired(index2))
+
+
+class TestProofCompression(unittest.TestCase):
+    """Test cases for proof compression and minimization"""
+    
+    def setUp(self):
+        self.a = Literal.Literal(False, "A")
+        self.b = Literal.Literal(False, "B")
+        self.c = Literal.Literal(False, "C")
+    
+    def check_refutation(self, proof, inputs):
+        """Check that every line of proof is an input clause or a resolvent of earlier lines"""
+        steps = proof.get_steps()
+        for number, (clause, parents) in enumerate(steps, 1):
+            if parents is None:
+                self.assertIn(clause, inputs)
+                continue
+            first, second = steps[parents[0] - 1][0], steps[parents[1] - 1][0]
+            self.assertLess(max(parents), number)
+            clash = first.clash_mask(second)
+            self.assertEqual(clash.bit_count(), 1)
+            self.assertEqual(Clause.Clause.resolve_bit(first, second, clash), clause)
+        self.assertEqual(len(steps[-1][0].get_literals()), 0)
+    
+    def test_recycle_pivots(self):
+        """Test that a pivot resolved twice on one path is resolved only once"""
+        model = ResolutionModel.ResolutionModel.parse("{~A, ~C} {~A, C} {A, ~C} {A, C}")
+        model.resolve(0, 1, self.c)
+        model.resolve(1, 3, self.a)
+        model.resolve(2, 5, self.c)
+        model.resolve(4, 6, self.a)
+        proof = model.get_proof()
+        
+        compressed = ProofCompression.compress(proof)
+        self.assertEqual((proof.num_resolutions(), compressed.num_resolutions()), (4, 3))
+        self.check_refutation(compressed, model.get_clauses())
+    
+    def test_lower_units(self):
+        """Test that a unit used twice is resolved once, at the end"""
+        model = ResolutionModel.ResolutionModel.parse("{A} {~A, B} {~A, ~B}")
+        model.resolve(0, 1, self.a)
+        model.resolve(0, 2, self.a)
+        model.resolve(3, 4, self.b)
+        
+        compressed = ProofCompression.compress(model.get_proof())
+        self.assertEqual(compressed.num_resolutions(), 2)
+        self.check_refutation(compressed, model.get_clauses())
+    
+    def test_compress_keeps_short_proofs(self):
+        """Test that a proof without redundancy keeps its length"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B} {~A, B} {~B}")
+        model.resolve(0, 1, self.a)
+        model.resolve(2, 3, self.b)
+        
+        self.assertEqual(ProofCompression.compress(model.get_proof()).num_resolutions(), 2)
+    
+    def test_compress_long_proof(self):
+        """Test that compressing a proof of thousands of steps does not compare every pair of steps"""
+        model = ResolutionModel.ResolutionModel.parse(benchmark.implication_chain(3000))
+        model.saturate(strategy="unit")
+        proof = model.get_proof()
+        
+        start = time.perf_counter()
+        compressed = ProofCompression.compress(proof)
+        self.assertLess(time.perf_counter() - start, 2)
+        self.assertEqual(compressed.num_resolutions(), proof.num_resolutions())
+        self.check_refutation(compressed, model.get_clauses())
+    
+    def test_minimize_finds_shortest_proof(self):
+        """Test that the exhaustive search replaces a long proof by a shortest one"""
+        model = ResolutionModel.ResolutionModel.parse("{A} {~A, B} {~B, C} {~C} {~A, C}")
+        model.resolve(0, 1, self.a)
+        model.resolve(5, 2, self.b)
+        model.resolve(6, 3, self.c)
+        
+        proof, optimal = model.minimize_proof(budget=5.0)
+        self.assertTrue(optimal)
+        self.assertEqual(proof.num_resolutions(), 2)
+        self.check_refutation(proof, model.get_clauses())
+    
+    def test_minimize_without_budget_only_compresses(self):
+        """Test that a zero budget returns the compressed proof without claiming optimality"""
+        model = ResolutionModel.ResolutionModel.parse("{A} {~A, B} {~B, C} {~C} {~A, C}")
+        model.resolve(0, 1, self.a)
+        model.resolve(5, 2, self.b)
+        model.resolve(6, 3, self.c)
+        
+        proof, optimal = model.minimize_proof()
+        self.assertFalse(optimal)
+        self.assertEqual(proof.num_resolutions(), 3)
+    
+    def test_compressed_random_walks_stay_valid(self):
+        """Test that compressing refutations built by random steps gives valid, no longer proofs"""
+        rng = random.Random(1)
+        for seed in range(40):
+            model = ResolutionModel.ResolutionModel.parse(benchmark.random_kcnf(4, k=2, ratio=3, seed=seed))
+            if model.satisfying_assignment() is not None:
+                continue
+            for _ in range(200):
+                index = rng.randrange(model.num_clauses())
+                partners = model.resolvable_partners(index)
+                if partners:
+                    partner = rng.choice(partners)
+                    if model.numResolveLiterals(index, partner) == 1:
+                        model.resolve(index, partner, model.getEasyLiteral(index, partner))
+                if any(len(clause.get_literals()) == 0 for clause in model.get_clauses()):
+                    break
+            else:
+                continue
+            proof = model.get_proof()
+            compressed = ProofCompression.compress(proof)
+            self.assertLessEqual(compressed.num_resolutions(), proof.num_resolutions())
+            self.check_refutation(compressed, model.get_clauses())
+    
+    def test_minimize_rejects_non_refutation(self):
+        """Test that minimize() requires a proof of the empty clause"""
+        proof = Proof.Proof([(Clause.Clause.parse("{A}"), None)])
+        with self.assertRaises(ValueError):
+            ProofCompression.minimize(proof)
+
+
+@unittest.skipIf(ClauseMatrix.np is None, "NumPy is not installed")
+class TestClauseMatrix(unittest.TestCase):
+    """Test cases for the NumPy clause matrix"""
+    
+    def check_against_model(self, model):
+        matrix = model.clause_matrix()
+        counts = matrix.clash_counts()
+        n = model.num_clauses()
+        expected = [[model.numResolveLiterals(i, j) for j in range(n)] for i in range(n)]
+        self.assertEqual(counts.tolist(), expected)
+        resolvable = [(i, j) for i in range(n) for j in range(i + 1, n) if expected[i][j] == 1]
+        tautologies = [(i, j) for i in range(n) for j in range(i + 1, n) if expected[i][j] >= 2]
+        self.assertEqual([tuple(pair) for pair in matrix.resolvable_pairs().tolist()], resolvable)
+        self.assertEqual([tuple(pair) for pair in matrix.tautology_pairs().tolist()], tautologies)
+        self.assertEqual(matrix.clash_counts(rows=[2, 0]).tolist(), [expected[2], expected[0]])
+    
+    def test_sparse_model(self):
+        """Test counts and pairs of a model with many letters against the per-pair queries"""
+        self.check_against_model(ResolutionModel.ResolutionModel.parse(benchmark.random_kcnf(60, seed=3)))
+    
+    def test_dense_model(self):
+        """Test counts and pairs of a model with few letters against the per-pair queries"""
+        self.check_against_model(ResolutionModel.ResolutionModel.parse(benchmark.random_kcnf(5, ratio=20, seed=3)))
+    
+    def test_letters_beyond_one_word(self):
+        """Test a model with more than 64 letters, which needs several words per row"""
+        self.check_against_model(ResolutionModel.ResolutionModel.parse(benchmark.implication_chain(70)))
+    
+    def test_dense_and_sparse_agree(self):
+        """Test that both ways of counting give the same matrix, tautologies included"""
+        model = ResolutionModel.ResolutionModel.parse("{A, ~A} {A, B, ~B, ~C} {~A, C} {B} {C, ~C, A}")
+        incidences = "_ClauseMatrix__clash_incidences"
+        results = []
+        for forced in (0, 10 ** 9):
+            with mock.patch.object(ClauseMatrix.ClauseMatrix, incidences, return_value=forced):
+                matrix = model.clause_matrix()
+                results.append((matrix.clash_counts().tolist(), matrix.clash_counts(rows=[4, 1]).tolist()))
+        
+        self.assertEqual(results[0], results[1])
+        self.assertEqual([results[0][0][i][i] for i in range(5)], [2, 2, 0, 0, 2])
+        self.check_against_model(model)
+    
+    def test_polarity(self):
+        """Test the polarity matrix and its letter columns"""
+        matrix = ResolutionModel.ResolutionModel.parse("{A, ~C} {C}").clause_matrix()
+        
+        self.assertEqual(matrix.letters(), [Literal.Literal(False, "A"), Literal.Literal(False, "C")])
+        self.assertEqual(matrix.polarity().tolist(), [[1, -1], [0, 1]])
+        self.assertEqual(len(matrix), 2)
+    
+    def test_clashing_pairs_counts(self):
+        """Test that clashing_pairs() reports how many letters each pair clashes on"""
+        pairs, counts = ResolutionModel.ResolutionModel.parse("{A, B} {~A, ~B} {~A, C}").clause_matrix().clashing_pairs()
+        
+        self.assertEqual(pairs.tolist(), [[0, 1], [0, 2]])
+        self.assertEqual(counts.tolist(), [2, 1])
+
+
+class TestClauseMatrixWithoutNumpy(unittest.TestCase):
+    """Test cases for ClauseMatrix when NumPy is missing"""
+    
+    def test_import_error(self):
+        """Test that building a matrix without NumPy raises ImportError"""
+        model = ResolutionModel.ResolutionModel.parse("{A} {~A}")
+        with mock.patch.object(ClauseMatrix, "np", None):
+            with self.assertRaises(ImportError):
+                model.clause_matrix()
+
+
+class TestResolutionModelPartners(unittest.TestCase):
+    """Test cases for the ResolutionModel.resolvable_partners() method"""
+    
+    def test_partners_match_num_resolve_literals(self):
+        """Test that partners are exactly the clauses with a literal-negation pair"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B} {~A} {~B, C} {C} {A, ~C}")
+        
+        for i in range(model.num_clauses()):
+            expected = [j for j in range(model.num_clauses())
+                        if j != i and model.numResolveLiterals(i, j) > 0]
+            self.assertEqual(model.resolvable_partners(i), expected)
+    
+    def test_partners_updated_after_resolve(self):
+        """Test that a resolved clause shows up as a partner"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B} {~A} {~B}")
+        model.resolve(0, 1, Literal.Literal(False, "A"))
+        
+        self.assertEqual(model.resolvable_partners(3), [2])
+        self.assertIn(3, model.resolvable_partners(2))
+    
+    def test_partners_invalid_index_raises_error(self):
+        """Test that an invalid index raises IndexError"""
+        model = ResolutionModel.ResolutionModel.parse("{A} {~A}")
+        
+        with self.assertRaises(IndexError):
+            model.resolvable_partners(2)
+
+
+class TestResolutionModelClashQueries(unittest.TestCase):
+    """Test cases for numResolveLiterals(), getEasyLiteral() and get_literal_negation_pairs()"""
+    
+    def test_num_resolve_literals(self):
+        """Test counting literal-negation pairs in both directions"""
+        model = ResolutionModel.ResolutionModel.parse("{A, ~B, C} {~A, B} {D} {C, ~C} {~C}")
+        
+        self.assertEqual(model.numResolveLiterals(0, 1), 2)
+        self.assertEqual(model.numResolveLiterals(1, 0), 2)
+        self.assertEqual(model.numResolveLiterals(0, 2), 0)
+        self.assertEqual(model.numResolveLiterals(3, 3), 2)
+        self.assertEqual(model.numResolveLiterals(3, 0), 1)
+    
+    def test_get_easy_literal(self):
+        """Test that the easy literal comes from the first clause with its negation in the second"""
+        model = ResolutionModel.ResolutionModel.parse("{A, ~B} {~A} {B, C}")
+        
+        self.assertEqual(model.getEasyLiteral(0, 1), Literal.Literal(False, "A"))
+        self.assertEqual(model.getEasyLiteral(1, 0), Literal.Literal(True, "A"))
+        self.assertEqual(model.getEasyLiteral(0, 2), Literal.Literal(True, "B"))
+        with self.assertRaises(ValueError):
+            model.getEasyLiteral(1, 2)
+    
+    def test_get_literal_negation_pairs(self):
+        """Test that pairs are reported as non-negated literals in var_id order"""
+        model = ResolutionModel.ResolutionModel.parse("{~C, A, ~B} {C, ~A, B} {D}")
+        
+        self.assertEqual(model.get_literal_negation_pairs(0, 1),
+                         [Literal.Literal(False, "A"), Literal.Literal(False, "B"), Literal.Literal(False, "C")])
+        self.assertEqual(model.get_literal_negation_pairs(0, 2), [])
+    
+    def test_queries_see_appended_clauses(self):
+        """Test that clauses appended after a query are picked up by the memoized rows"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B} {~A} {~B, C}")
+        self.assertEqual(model.numResolveLiterals(2, 0), 1)
+        
+        model.resolve(0, 1, Literal.Literal(False, "A"))
+        
+        self.assertEqual(model.numResolveLiterals(2, 3), 1)
+        self.assertEqual(model.numResolveLiterals(3, 2), 1)
+        self.assertEqual(model.getEasyLiteral(2, 3), Literal.Literal(True, "B"))
+        self.assertEqual(model.numResolveLiterals(1, 3), 0)
+    
+    def test_queries_match_clause_literals(self):
+        """Test the memoized answers against a direct comparison of the literal sets"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B} {~A, C} {~B, ~C} {A, ~C} {B, C, ~A}")
+        model.saturate()
+        clauses = model.get_clauses()
+        
+        for i, clause1 in enumerate(clauses):
+            for j, clause2 in enumerate(clauses):
+                expected = sum(1 for lit in clause1.get_literals() if lit.negate() in clause2.get_literals())
+                self.assertEqual(model.numResolveLiterals(i, j), expected)
+    
+    def test_queries_invalid_index_raise_error(self):
+        """Test that invalid indices raise IndexError"""
+        model = ResolutionModel.ResolutionModel.parse("{A} {~A}")
+        
+        with self.assertRaises(IndexError):
+            model.numResolveLiterals(0, 2)
+        with self.assertRaises(IndexError):
+            model.getEasyLiteral(-1, 0)
+        with self.assertRaises(IndexError):
+            model.get_literal_negation_pairs(2, 0)
+
+
+class TestResolutionModelSaturate(unittest.TestCase):
+    """Test cases for the ResolutionModel.saturate() method"""
+    
+    def test_saturate_finds_contradiction(self):
+        """Test that saturation derives the empty clause of an unsatisfiable set"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B} {A, ~B} {~A, B} {~A, ~B}")
+        
+        self.assertTrue(model.saturate())
+        self.assertIn(Clause.Clause(), model.get_clauses())
+    
+    def test_saturate_proof_is_available(self):
+        """Test that get_proof works after saturation"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B} {~A, C} {~B, C} {~C}")
+        model.saturate()
+        
+        proof = str(model.get_proof())
+        self.assertIn("{}", proof)
+        self.assertIn("Resolution", proof)
+    
+    def test_saturate_satisfiable_reaches_fixpoint(self):
+        """Test that saturation of a satisfiable set stops without the empty clause"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B} {~A, C}")
+        
+        self.assertFalse(model.saturate())
+        self.assertIn(Clause.Clause.parse("{B, C}"), model.get_clauses())
+        self.assertNotIn(Clause.Clause(), model.get_clauses())
+    
+    def test_saturate_respects_max_clauses(self):
+        """Test that max_clauses caps the number of clauses"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B, C} {~A, D} {~B, D} {~C, D} {~D, E} {~E}")
+        
+        model.saturate(max_clauses=8)
+        self.assertLessEqual(model.num_clauses(), 8)
+    
+    def test_saturate_invalid_max_clauses_raises_error(self):
+        """Test that a non-positive max_clauses raises ValueError"""
+        model = ResolutionModel.ResolutionModel.parse("{A} {~A}")
+        
+        with self.assertRaises(ValueError):
+            model.saturate(max_clauses=0)
+
+
+class TestSaturationStrategies(unittest.TestCase):
+    """Test cases for the clause-selection strategies of saturate()"""
+    
+    UNSATISFIABLE = "{A, B, C} {~A, B} {~B, C} {~C, D} {~D, A} {~A, ~C}"
+    SATISFIABLE = "{A, B, C} {~A, B} {~B, C} {~C, D}"
+    
+    def test_every_strategy_refutes_unsatisfiable_set(self):
+        """Test that each built-in strategy derives the empty clause"""
+        for name in Strategy.STRATEGIES:
+            with self.subTest(strategy=name):
+                model = ResolutionModel.ResolutionModel.parse(self.UNSATISFIABLE)
+                self.assertTrue(model.saturate(strategy=name))
+                self.assertIn("{}", str(model.get_proof()))
+    
+    def test_every_strategy_stops_on_satisfiable_set(self):
+        """Test that each built-in strategy reaches a fixpoint without the empty clause"""
+        for name in Strategy.STRATEGIES:
+            with self.subTest(strategy=name):
+                model = ResolutionModel.ResolutionModel.parse(self.SATISFIABLE)
+                self.assertFalse(model.saturate(strategy=name))
+    
+    def test_parse_marks_goal_clauses(self):
+        """Test that a leading * marks a goal clause"""
+        model = ResolutionModel.ResolutionModel.parse("{~A, B} {~B, C} {A} *{~C}")
+        self.assertEqual(model.get_goals(), [3])
+        
+        model = ResolutionModel.ResolutionModel.parse("~A *A")
+        self.assertEqual(model.get_goals(), [1])
+    
+    def test_set_of_support_only_resolves_with_support(self):
+        """Test that non-goal input clauses are never resolved with each other"""
+        model = ResolutionModel.ResolutionModel.parse("{~A, B} {~B, C} {A} *{~C}")
+        
+        self.assertTrue(model.saturate(strategy="sos"))
+        self.assertNotIn(Clause.Clause.parse("{~A, C}"), model.get_clauses())
+        self.assertNotIn(Clause.Clause.parse("{B}"), model.get_clauses())
+    
+    def test_goal_not_in_clauses_raises_error(self):
+        """Test that a goal clause must belong to the model"""
+        with self.assertRaises(ValueError):
+            ResolutionModel.ResolutionModel([Clause.Clause.parse("{A}")], goals=[Clause.Clause.parse("{B}")])
+    
+    def test_ordered_strategy_resolves_on_last_letter_only(self):
+        """Test that ordered resolution only allows the last letter of both clauses"""
+        strategy = Strategy.OrderedStrategy()
+        ab = Clause.Clause.parse("{A, B}")
+        not_b = Clause.Clause.parse("{~B}")
+        not_a_c = Clause.Clause.parse("{~A, C}")
+        
+        self.assertTrue(strategy.allows(ab, not_b, 0b10))
+        self.assertFalse(strategy.allows(ab, not_a_c, 0b01))
+    
+    def test_unknown_strategy_raises_error(self):
+        """Test that unknown names and wrong types are rejected"""
+        model = ResolutionModel.ResolutionModel.parse(self.SATISFIABLE)
+        with self.assertRaises(ValueError):
+            model.saturate(strategy="random")
+        with self.assertRaises(TypeError):
+            model.saturate(strategy=3)
+    
+    def test_weight_age_alternates(self):
+        """Test that weight-age picks by weight, then by age"""
+        strategy = Strategy.WeightAgeStrategy(ratio=1)
+        strategy.push(0, Clause.Clause.parse("{A, B, C}"), 0)
+        strategy.push(1, Clause.Clause.parse("{A}"), 0)
+        strategy.push(2, Clause.Clause.parse("{B}"), 0)
+        
+        self.assertEqual([strategy.pop(), strategy.pop(), strategy.pop()], [1, 0, 2])
+        self.assertEqual(len(strategy), 0)
+        with self.assertRaises(ValueError):
+            Strategy.WeightAgeStrategy(ratio=0)
+
+
+
+class TestPairQueue(unittest.TestCase):
+    """Test cases for the lazy pair queue and saturate(strategy="pairs")"""
+    
+    def test_pairs_refute_unsatisfiable_set(self):
+        """Test that the pair queue derives the empty clause with a valid proof"""
+        model = ResolutionModel.ResolutionModel.parse(TestSaturationStrategies.UNSATISFIABLE)
+        self.assertTrue(model.saturate(strategy="pairs"))
+        self.assertIn("{}", str(model.get_proof()))
+    
+    def test_pairs_stop_on_satisfiable_set(self):
+        """Test that the pair queue reaches a fixpoint without the empty clause"""
+        model = ResolutionModel.ResolutionModel.parse(TestSaturationStrategies.SATISFIABLE)
+        self.assertFalse(model.saturate(strategy="pairs"))
+        self.assertFalse(model.saturate(strategy=PairQueue.PairQueue()))
+    
+    def test_pairs_agree_with_satisfiability(self):
+        """Test that the pair queue refutes exactly the unsatisfiable sets, with and without subsumption"""
+        rng = random.Random(5)
+        for _ in range(60):
+            text = " ".join("{" + ", ".join(rng.choice(["", "~"]) + rng.choice("ABCD") for _ in range(rng.randint(1, 3))) + "}"
+                            for _ in range(rng.randint(2, 8)))
+            for subsumption in (False, True):
+                with self.subTest(text=text, subsumption=subsumption):
+                    clauses = ResolutionModel.ResolutionModel.parse(text).get_clauses()
+                    model = ResolutionModel.ResolutionModel(clauses, subsumption=subsumption)
+                    self.assertEqual(model.saturate(strategy="pairs"), model.satisfying_assignment() is None)
+    
+    def test_pairs_pop_smallest_estimate_first(self):
+        """Test that pairs come out by estimated resolvent size, then by depth and age"""
+        queue = PairQueue.PairQueue()
+        clauses = ["{A, B, C}", "{~A}", "{~B, D}", "{~C}"]
+        for index, text in enumerate(clauses):
+            queue.push(index, Clause.Clause.parse(text), 0)
+        
+        pairs = []
+        while (pair := queue.pop()) is not None:
+            pairs.append(pair)
+        self.assertEqual(pairs, [(1, 0), (3, 0), (2, 0)])
+        self.assertEqual(queue.generated, 3)
+    
+    def test_pair_queue_size_follows_clauses(self):
+        """Test that the queue holds one entry per clause however many pairs there are"""
+        queue = PairQueue.PairQueue()
+        for index in range(50):
+            queue.push(index, Clause.Clause.parse("{A}" if index % 2 else "{~A, B}"), 0)
+        self.assertEqual(len(queue), 50)
+        
+        pairs = 0
+        while queue.pop() is not None:
+            pairs += 1
+            self.assertLessEqual(len(queue), 50)
+        self.assertEqual(pairs, 25 * 25)
+    
+    def test_retired_pairs_are_dropped(self):
+        """Test that pairs with a retired clause are skipped as stale"""
+        queue = PairQueue.PairQueue()
+        queue.push(0, Clause.Clause.parse("{A}"), 0)
+        queue.push(1, Clause.Clause.parse("{A, B}"), 0)
+        queue.push(2, Clause.Clause.parse("{~A}"), 0)
+        queue.retire(1)
+        
+        self.assertEqual(queue.pop(), (2, 0))
+        self.assertIsNone(queue.pop())
+        self.assertEqual(queue.stale, 1)
+    
+    def test_pairs_keep_chain_small(self):
+        """Test that the pair queue refutes a long implication chain without saturating it"""
+        text = "{V1} " + " ".join(f"{{~V{i}, V{i + 1}}}" for i in range(1, 60)) + " {~V60}"
+        model = ResolutionModel.ResolutionModel.parse(text)
+        
+        self.assertTrue(model.saturate(strategy="pairs"))
+        self.assertLess(len(model.get_clauses()), 4 * 61)
+
+class TestSatisfiabilityCheck(unittest.TestCase):
+    """Test cases for the CDCL solver and ResolutionModel.satisfying_assignment()"""
+    
+    def assertSatisfies(self, assignment, model):
+        """Assert that the assignment makes every clause of the model true"""
+        for clause in model.get_clauses():
+            self.assertTrue(any(assignment[lit.letter] != lit.is_negated for lit in clause.get_literals()),
+                            f"{clause} is false under {assignment}")
+    
+    def test_unsatisfiable_returns_none(self):
+        """Test that an unsatisfiable clause set has no assignment"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B} {A, ~B} {~A, B} {~A, ~B}")
+        self.assertIsNone(model.satisfying_assignment())
+    
+    def test_satisfiable_returns_model(self):
+        """Test that a satisfiable clause set gets a satisfying assignment"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B, C} {~A, B} {~B, C} {~C, D} {~D, ~A}")
+        assignment = model.satisfying_assignment()
+        
+        self.assertEqual(set(assignment), {"A", "B", "C", "D"})
+        self.assertSatisfies(assignment, model)
+    
+    def test_empty_clause_is_unsatisfiable(self):
+        """Test that a model containing the empty clause is unsatisfiable"""
+        model = ResolutionModel.ResolutionModel([Clause.Clause.parse("{A}"), Clause.Clause()])
+        self.assertIsNone(model.satisfying_assignment())
+    
+    def test_tautologies_are_ignored(self):
+        """Test that tautological clauses do not constrain the assignment but their letters get a value"""
+        model = ResolutionModel.ResolutionModel.parse("{A, ~A} {~B}")
+        self.assertEqual(model.satisfying_assignment(), {"A": False, "B": False})
+        
+        model = ResolutionModel.ResolutionModel.parse("{A, ~A} {B, ~B, C} {~C}")
+        self.assertEqual(model.satisfying_assignment(), {"A": False, "B": False, "C": False})
+    
+    def test_pigeonhole_is_unsatisfiable(self):
+        """Test a pigeonhole instance that needs conflict analysis: 5 pigeons, 4 holes"""
+        pigeons, holes = 5, 4
+        def lit(pigeon, hole, negated=False):
+            return Literal.Literal.from_var_id(pigeon * holes + hole, negated)
+        clauses = [Clause.Clause({lit(p, h) for h in range(holes)}) for p in range(pigeons)]
+        for h in range(holes):
+            for p in range(pigeons):
+                for q in range(p + 1, pigeons):
+                    clauses.append(Clause.Clause({lit(p, h, True), lit(q, h, True)}))
+        
+        self.assertIsNone(Solver.CDCLSolver(clauses).solve())
+        self.assertIsNotNone(Solver.CDCLSolver(clauses[:pigeons - 1] + clauses[pigeons:]).solve())
+    
+    def test_agrees_with_saturation(self):
+        """Test that the solver and saturation agree on small clause sets"""
+        for text in ["{A, B, C} {~A, B} {~B, C} {~C, D} {~D, A} {~A, ~C}",
+                     "{A, B, C} {~A, B} {~B, C} {~C, D}",
+                     "{A, ~B} {B, ~C} {C, ~A} {A, B, C} {~A, ~B, ~C}"]:
+            with self.subTest(clauses=text):
+                model = ResolutionModel.ResolutionModel.parse(text)
+                assignment = model.satisfying_assignment()
+                self.assertEqual(assignment is None, model.saturate())
+
+
+class TestResolutionModelSubsumption(unittest.TestCase):
+    """Test cases for clause subsumption in ResolutionModel"""
+    
+    def test_clause_subsumes(self):
+        """Test Clause.subsumes on subsets, supersets and sign changes"""
+        small = Clause.Clause.parse("{A, ~B}")
+        large = Clause.Clause.parse("{A, ~B, C}")
+        flipped = Clause.Clause.parse("{A, B, C}")
+        
+        self.assertTrue(small.subsumes(large))
+        self.assertTrue(small.subsumes(small))
+        self.assertFalse(large.subsumes(small))
+        self.assertFalse(small.subsumes(flipped))
+        self.assertTrue(Clause.Clause().subsumes(small))
+    
+    def test_signature_of_subsumed_clause_covers_subsumer(self):
+        """Test that signatures are monotone under subsumption"""
+        small = Clause.Clause.parse("{A, ~Z}")
+        large = Clause.Clause.parse("{A, B, ~Z}")
+        
+        self.assertEqual(small.signature & ~large.signature, 0)
+    
+    def test_forward_subsumption_discards_resolvent(self):
+        """Test that a resolvent subsumed by an existing clause is not added"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B, C} {~A, B} {B}")
+        model.subsumption = True
+        model.resolve(0, 1, Literal.Literal(False, "A"))
+        
+        self.assertEqual(model.num_clauses(), 3)
+    
+    def test_backward_subsumption_retires_clauses(self):
+        """Test that clauses subsumed by a new resolvent are retired but kept"""
+        model = ResolutionModel.ResolutionModel(
+            ResolutionModel.ResolutionModel.parse("{A, B} {~A, B} {B, C}").get_clauses(),
+            subsumption=True)
+        model.resolve(0, 1, Literal.Literal(False, "A"))
+        
+        self.assertEqual(model.num_clauses(), 4)
+        self.assertTrue(model.is_retired(0))
+        self.assertTrue(model.is_retired(1))
+        self.assertTrue(model.is_retired(2))
+        self.assertFalse(model.is_retired(3))
+    
+    def test_subsumption_off_by_default(self):
+        """Test that without the switch every new resolvent is kept"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B, C} {~A, B} {B}")
+        model.resolve(0, 1, Literal.Literal(False, "A"))
+        
+        self.assertFalse(model.subsumption)
+        self.assertEqual(model.num_clauses(), 4)
+        self.assertFalse(model.is_retired(2))
+    
+    def test_retired_clauses_are_not_partners(self):
+        """Test that retired clauses are not offered as resolution partners"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B} {~A, B} {~B}")
+        model.subsumption = True
+        model.resolve(0, 1, Literal.Literal(False, "A"))
+        
+        self.assertEqual(model.resolvable_partners(2), [3])
+    
+    def test_saturate_with_subsumption_keeps_fewer_clauses(self):
+        """Test that subsumption shrinks saturation and still finds the contradiction"""
+        text = "{A, B, C} {A, B, ~C} {A, ~B, C} {A, ~B, ~C} {~A, B, C} {~A, B, ~C} {~A, ~B, C} {~A, ~B, ~C}"
+        plain = ResolutionModel.ResolutionModel.parse(text)
+        reduced = ResolutionModel.ResolutionModel.parse(text)
+        reduced.subsumption = True
+        
+        self.assertTrue(plain.saturate())
+        self.assertTrue(reduced.saturate())
+        self.assertLess(reduced.num_clauses(), plain.num_clauses())
+        self.assertIn("{}", str(reduced.get_proof()))
+
+
+class TestClauseStore(unittest.TestCase):
+    """Test cases for the ordered, hash-indexed ClauseStore"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.ab = Clause.Clause.parse("{A, B}")
+        self.c = Clause.Clause.parse("{C}")
+    
+    def test_add_deduplicates_and_keeps_order(self):
+        """Test that duplicates keep their first index"""
+        store = ClauseStore.ClauseStore([self.ab, self.c])
+        
+        self.assertEqual(store.add(Clause.Clause.parse("{B, A}")), 0)
+        self.assertEqual(store.add(Clause.Clause.parse("{D}")), 2)
+        self.assertEqual(len(store), 3)
+        self.assertEqual(store.to_list()[:2], [self.ab, self.c])
+    
+    def test_lookups_both_ways(self):
+        """Test index -> clause and clause -> index lookups"""
+        store = ClauseStore.ClauseStore([self.ab, self.c])
+        
+        self.assertIs(store[1], self.c)
+        self.assertEqual(store.get_index(self.c), 1)
+        self.assertIsNone(store.get_index(Clause.Clause.parse("{D}")))
+        self.assertIn(self.ab, store)
+    
+    def test_model_index_of(self):
+        """Test ResolutionModel.index_of"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B} {C} {A, B}")
+        
+        self.assertEqual(model.num_clauses(), 2)
+        self.assertEqual(model.index_of(self.c), 1)
+        with self.assertRaises(ValueError):
+            model.index_of(Clause.Clause.parse("{D}"))
+
+
+class TestCanonicalForm(unittest.TestCase):
+    """Test cases for Canonical.canonical_form() and ResolutionModel.canonical_form()"""
+    
+    def test_invariant_under_renaming_and_order(self):
+        """Test that renamed and reordered clause sets get the same canonical clauses"""
+        model1 = ResolutionModel.ResolutionModel.parse("{A, B} {~A}")
+        model2 = ResolutionModel.ResolutionModel.parse("{Q, P} {~P}")
+        model3 = ResolutionModel.ResolutionModel.parse("{~Z} {Y, Z}")
+        
+        self.assertEqual(model1.canonical_form()[0], model2.canonical_form()[0])
+        self.assertEqual(model1.canonical_form()[0], model3.canonical_form()[0])
+    
+    def test_invariant_under_polarity_flips(self):
+        """Test that flipping a variable everywhere gives the same canonical clauses"""
+        model1 = ResolutionModel.ResolutionModel.parse("{A, B} {~A, C} {~B, ~C}")
+        model2 = ResolutionModel.ResolutionModel.parse("{~A, B} {A, C} {~B, ~C}")
+        
+        self.assertEqual(model1.canonical_form()[0], model2.canonical_form()[0])
+    
+    def test_distinguishes_different_problems(self):
+        """Test that clause sets that are not renamings of each other differ"""
+        model1 = ResolutionModel.ResolutionModel.parse("{A, B} {~A} {~B}")
+        model2 = ResolutionModel.ResolutionModel.parse("{A, B} {~A} {B}")
+        
+        self.assertNotEqual(model1.canonical_form()[0], model2.canonical_form()[0])
+    
+    def test_renaming_maps_clauses_to_canonical_form(self):
+        """Test that applying the renaming to the clauses gives the canonical clauses"""
+        model = ResolutionModel.ResolutionModel.parse("{P, ~Q, R} {Q} {~P, ~R} {R, Q}")
+        canonical, renaming = model.canonical_form()
+        
+        def rename(lit):
+            renamed = renaming[Literal.Literal(False, lit.letter)]
+            return renamed.negate() if lit.is_negated else renamed
+        renamed = {Clause.Clause({rename(lit) for lit in clause.get_literals()}) for clause in model.get_clauses()}
+        
+        self.assertEqual(renamed, set(canonical))
+        self.assertEqual(set(renaming), {Literal.Literal(False, letter) for letter in "PQR"})
+    
+    def test_symmetric_clause_set(self):
+        """Test that a highly symmetric clause set is handled without trying every permutation"""
+        letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+        model1 = ResolutionModel.ResolutionModel.parse(" ".join(f"{{{letter}}}" for letter in letters))
+        model2 = ResolutionModel.ResolutionModel.parse(" ".join(f"{{~{letter}}}" for letter in reversed(letters)))
+        
+        self.assertEqual(model1.canonical_form()[0], model2.canonical_form()[0])
+    
+    def test_many_symmetric_components(self):
+        """Test that a hundred interchangeable components are canonized quickly and consistently"""
+        text1 = " ".join(f"{{P{k}, Q{k}}} {{~P{k}, ~Q{k}}}" for k in range(100))
+        text2 = " ".join(f"{{~R{k}, S{k}}} {{R{k}, ~S{k}}}" for k in reversed(range(100)))
+        model1 = ResolutionModel.ResolutionModel.parse(text1)
+        model2 = ResolutionModel.ResolutionModel.parse(text2)
+        
+        start = time.perf_counter()
+        canonical1 = model1.canonical_form()[0]
+        canonical2 = model2.canonical_form()[0]
+        
+        self.assertLess(time.perf_counter() - start, 2)
+        self.assertEqual(canonical1, canonical2)
+        self.assertEqual(len(canonical1), 200)
+    
+    def test_long_chain(self):
+        """Test that refinement of a long implication chain only revisits the cells it splits"""
+        model = ResolutionModel.ResolutionModel.parse(benchmark.implication_chain(800))
+        
+        start = time.perf_counter()
+        canonical = model.canonical_form()[0]
+        
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertEqual(len(canonical), 801)
+    
+    def test_star(self):
+        """Test that a unit clause implying many interchangeable leaves is canonized quickly"""
+        text1 = "{A} " + " ".join(f"{{~A, x_{k}}}" for k in range(100))
+        text2 = " ".join(f"{{y_{k}, B}}" for k in reversed(range(100))) + " {~B}"
+        model1 = ResolutionModel.ResolutionModel.parse(text1)
+        model2 = ResolutionModel.ResolutionModel.parse(text2)
+        
+        start = time.perf_counter()
+        canonical1 = model1.canonical_form()[0]
+        canonical2 = model2.canonical_form()[0]
+        
+        self.assertLess(time.perf_counter() - start, 2)
+        self.assertEqual(canonical1, canonical2)
+    
+    def test_max_nodes_keeps_a_renaming(self):
+        """Test that a search cut short by max_nodes still returns the clauses under a renaming"""
+        model = ResolutionModel.ResolutionModel.parse("{A} " + " ".join(f"{{~A, x_{k}}}" for k in range(200)))
+        
+        start = time.perf_counter()
+        canonical, renaming = Canonical.canonical_form(model.get_clauses(), max_nodes=100)
+        
+        self.assertLess(time.perf_counter() - start, 1)
+        
+        def rename(lit):
+            renamed = renaming[Literal.Literal(False, lit.letter)]
+            return renamed.negate() if lit.is_negated else renamed
+        renamed = {Clause.Clause({rename(lit) for lit in clause.get_literals()}) for clause in model.get_clauses()}
+        self.assertEqual(renamed, set(canonical))
+    
+    def test_deep_search_is_not_recursive(self):
+        """Test that more interchangeable components than the recursion limit are handled"""
+        count = sys.getrecursionlimit() + 100
+        clauses = [Clause.Clause({Literal.Literal(False, f"v_{k}")}) for k in range(count)]
+        canonical, renaming = Canonical.canonical_form(clauses)
+        
+        self.assertEqual(len(canonical), count)
+        self.assertEqual(len(renaming), count)
+    
+    def test_many_variables_use_numbered_names(self):
+        """Test that more than 26 variables are named x_1, x_2, ..."""
+        clauses = [Clause.Clause({Literal.Literal(False, f"v_{k}")}) for k in range(30)]
+        canonical, _ = Canonical.canonical_form(clauses)
+        
+        self.assertEqual({lit.letter for clause in canonical for lit in clause.get_literals()},
+                         {f"x_{k}" for k in range(1, 31)})
+    
+    def test_empty_clause(self):
+        """Test that the empty clause is kept"""
+        canonical, renaming = Canonical.canonical_form([Clause.Clause()])
+        
+        self.assertEqual((canonical, renaming), ([Clause.Clause()], {}))
+
+
+class TestResolutionModelStatistics(unittest.TestCase):
+    """Test cases for the statistics collected by ResolutionModel"""
+    
+    def test_disabled_by_default(self):
+        """Test that models collect no statistics unless asked to"""
+        model = ResolutionModel.ResolutionModel.parse("{A} {~A}")
+        
+        self.assertIsNone(model.statistics)
+    
+    def test_resolve_counters(self):
+        """Test the counters updated by resolve()"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B} {~A, B} {B, C} {~B}", statistics=True)
+        model.resolve(0, 1, Literal.Literal(False, "A"))
+        model.resolve(0, 1, Literal.Literal(False, "A"))
+        model.resolve(2, 3, Literal.Literal(False, "B"))
+        
+        stats = model.statistics
+        self.assertEqual(stats.resolutions_attempted, 3)
+        self.assertEqual(stats.resolvents_kept, 2)
+        self.assertEqual(stats.duplicates, 1)
+        self.assertEqual(stats.max_clauses, 6)
+        self.assertGreater(stats.phase_seconds["parse"], 0)
+        self.assertGreater(stats.phase_seconds["resolve"], 0)
+    
+    def test_subsumed_resolvent_is_counted(self):
+        """Test that a resolvent dropped by forward subsumption is counted as subsumed"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B, C} {~A, B, C} {B}", statistics=True)
+        model.subsumption = True
+        model.resolve(0, 1, Literal.Literal(False, "A"))
+        
+        self.assertEqual((model.statistics.subsumed, model.statistics.resolvents_kept), (1, 0))
+    
+    def test_saturate_counters(self):
+        """Test that saturate() counts tautologies and that the categories add up"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B} {~A, ~B} {A, ~B} {~A, B}", statistics=True)
+        self.assertTrue(model.saturate())
+        model.get_proof()
+        
+        stats = model.statistics
+        self.assertGreater(stats.tautologies, 0)
+        self.assertEqual(stats.resolvents_kept, model.num_clauses() - 4)
+        self.assertEqual(stats.resolutions_attempted,
+                         stats.resolvents_kept + stats.duplicates + stats.tautologies + stats.subsumed)
+        self.assertGreater(stats.phase_seconds["proof"], 0)
+    
+    def test_toggle_statistics(self):
+        """Test enabling statistics on an existing model and disabling them again"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B} {~A}")
+        model.statistics = True
+        self.assertEqual(model.statistics.max_clauses, 2)
+        
+        model.statistics = False
+        self.assertIsNone(model.statistics)
+    
+    def test_to_dict_is_json_serializable(self):
+        """Test that the statistics export as JSON with every phase"""
+        stats = Statistics.Statistics()
+        exported = json.loads(json.dumps(stats.to_dict()))
+        
+        self.assertEqual(set(exported["phase_seconds"]), set(Statistics.Statistics.PHASES))
+        self.assertEqual(exported["resolvents_kept"], 0)
+
+
+class TestResultCache(unittest.TestCase):
+    """Test cases for the ResultCache class"""
+    
+    def test_canonical_key_ignores_order(self):
+        """Test that clause and literal order do not change the key"""
+        model1 = ResolutionModel.ResolutionModel.parse("{A, ~B} {B} {~A}")
+        model2 = ResolutionModel.ResolutionModel.parse("{~A} {~B, A} {B}")
+        model3 = ResolutionModel.ResolutionModel.parse("{A, B} {B} {~A}")
+        
+        key1 = ResultCache.canonical_key(model1.get_clauses())
+        self.assertEqual(key1, ResultCache.canonical_key(model2.get_clauses()))
+        self.assertNotEqual(key1, ResultCache.canonical_key(model3.get_clauses()))
+    
+    def test_canonical_key_ignores_renaming(self):
+        """Test that renaming and flipping variables does not change the key"""
+        model1 = ResolutionModel.ResolutionModel.parse("{A, B} {~A}")
+        model2 = ResolutionModel.ResolutionModel.parse("{Q, ~P} {P}")
+        
+        self.assertEqual(ResultCache.canonical_key(model1.get_clauses()),
+                         ResultCache.canonical_key(model2.get_clauses()))
+    
+    def test_renamed_problem_translates_results(self):
+        """Test that a hit for a renamed problem comes back in the new problem's letters"""
+        cache = ResultCache.ResultCache()
+        cache.solve(ResolutionModel.ResolutionModel.parse("{A, B} {~A}"))
+        cache.solve(ResolutionModel.ResolutionModel.parse("{A, B} {~A} {~B}"))
+        
+        satisfiable = cache.get(ResolutionModel.ResolutionModel.parse("{Q, ~P} {P}"))
+        self.assertEqual(satisfiable["assignment"], {"P": True, "Q": True})
+        
+        unsatisfiable = cache.get(ResolutionModel.ResolutionModel.parse("{P} {~P, Q} {~Q}"))
+        inputs = [clause for clause, parents in unsatisfiable["proof"] if parents is None]
+        self.assertEqual(set(inputs), {Clause.Clause.parse("{P}"), Clause.Clause.parse("{~P, Q}"),
+                                       Clause.Clause.parse("{~Q}")})
+        self.assertEqual(unsatisfiable["proof"].get_steps()[-1][0], Clause.Clause())
+    
+    def test_solve_unsatisfiable_stores_proof(self):
+        """Test that an unsatisfiable model is cached with a refutation and stats"""
+        cache = ResultCache.ResultCache()
+        model = ResolutionModel.ResolutionModel.parse("{A, B} {~A} {~B}")
+        
+        result = cache.solve(model)
+        
+        self.assertFalse(result["satisfiable"])
+        self.assertEqual(result["proof"].get_steps()[-1][0], Clause.Clause())
+        self.assertTrue(result["stats"]["refuted"])
+        self.assertEqual(model.num_clauses(), 3)
+        
+        cached = cache.get(ResolutionModel.ResolutionModel.parse("{~B} {B, A} {~A}"))
+        self.assertEqual(str(cached["proof"]), str(result["proof"]))
+    
+    def test_solve_satisfiable_stores_assignment(self):
+        """Test that a satisfiable model is cached with its assignment"""
+        cache = ResultCache.ResultCache()
+        result = cache.solve(ResolutionModel.ResolutionModel.parse("{A, B} {~A}"))
+        
+        self.assertTrue(result["satisfiable"])
+        self.assertEqual(result["assignment"], {"A": False, "B": True})
+        self.assertIsNone(result["proof"])
+    
+    def test_hit_skips_computation(self):
+        """Test that a repeated problem is answered without running the solver"""
+        cache = ResultCache.ResultCache()
+        cache.solve(ResolutionModel.ResolutionModel.parse("{A} {~A}"))
+        
+        with mock.patch.object(ResolutionModel.ResolutionModel, "satisfying_assignment",
+                               side_effect=AssertionError("recomputed")):
+            self.assertFalse(cache.solve(ResolutionModel.ResolutionModel.parse("{~A} {A}"))["satisfiable"])
+    
+    def test_key_uses_input_clauses_only(self):
+        """Test that resolvents added to a model do not change its cache entry"""
+        cache = ResultCache.ResultCache()
+        model = ResolutionModel.ResolutionModel.parse("{A, B} {~A} {~B}")
+        cache.solve(model)
+        model.resolve(0, 1, Literal.Literal(False, "A"))
+        
+        self.assertIsNotNone(cache.get(model))
+    
+    def test_put_keeps_shorter_proof(self):
+        """Test that a longer proof does not replace a shorter stored one"""
+        cache = ResultCache.ResultCache()
+        model = ResolutionModel.ResolutionModel.parse("{A} {~A}")
+        short = cache.solve(model)["proof"]
+        longer = Proof.Proof(short.get_steps() + short.get_steps()[-1:])
+        
+        cache.put(model, False, proof=longer)
+        
+        self.assertEqual(len(cache.get(model)["proof"]), len(short))
+    
+    def test_eviction_keeps_most_recently_used(self):
+        """Test that the least recently used entries are evicted beyond max_entries"""
+        cache = ResultCache.ResultCache(max_entries=2)
+        first = ResolutionModel.ResolutionModel.parse("{A}")
+        second = ResolutionModel.ResolutionModel.parse("{A, B}")
+        third = ResolutionModel.ResolutionModel.parse("{A, B, C}")
+        with mock.patch("ResultCache.time.time", side_effect=[1.0, 2.0, 3.0, 4.0]):
+            cache.solve(first)
+            cache.solve(second)
+            cache.get(first)
+            cache.solve(third)
+        
+        self.assertEqual(len(cache), 2)
+        self.assertIsNotNone(cache.get(first))
+        self.assertIsNone(cache.get(second))
+    
+    def test_persists_across_connections(self):
+        """Test that entries written to a file are seen by a new cache on the same file"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache.sqlite3")
+            cache = ResultCache.ResultCache(path)
+            cache.solve(ResolutionModel.ResolutionModel.parse("{A} {~A, B}"))
+            cache.close()
+            
+            reopened = ResultCache.ResultCache(path)
+            self.assertTrue(reopened.get(ResolutionModel.ResolutionModel.parse("{A} {~A, B}"))["satisfiable"])
+            reopened.close()
+    
+    def test_invalid_max_entries_raises_error(self):
+        """Test that a non-positive max_entries raises ValueError"""
+        with self.assertRaises(ValueError):
+            ResultCache.ResultCache(max_entries=0)
+    
+    def test_canonical_form_computed_once(self):
+        """Test that a miss canonicalizes once and a repeated clause set not at all"""
+        cache = ResultCache.ResultCache()
+        with mock.patch("ResultCache.canonical_form", wraps=Canonical.canonical_form) as canonical:
+            cache.solve(ResolutionModel.ResolutionModel.parse("{A, B} {~A} {~B}"))
+            self.assertEqual(canonical.call_count, 1)
+            self.assertIsNotNone(cache.get(ResolutionModel.ResolutionModel.parse("{A, B} {~A} {~B}")))
+            self.assertEqual(canonical.call_count, 1)
+    
+    def test_solve_without_proof_skips_saturation(self):
+        """Test that proof=False only decides satisfiability, and a later solve() adds the proof"""
+        cache = ResultCache.ResultCache()
+        model = ResolutionModel.ResolutionModel.parse("{A, B} {~A} {~B}")
+        with mock.patch.object(ResolutionModel.ResolutionModel, "saturate", side_effect=AssertionError("saturated")):
+            result = cache.solve(model, proof=False)
+        self.assertFalse(result["satisfiable"])
+        self.assertIsNone(result["proof"])
+        
+        with mock.patch.object(ResolutionModel.ResolutionModel, "satisfying_assignment",
+                               side_effect=AssertionError("recomputed")):
+            result = cache.solve(model)
+        self.assertEqual(result["proof"].get_steps()[-1][0], Clause.Clause())
+        self.assertIsNotNone(cache.get(model)["proof"])
+    
+    def test_symmetric_key_is_bounded(self):
+        """Test that a clause set with many automorphisms is keyed quickly and consistently"""
+        cache = ResultCache.ResultCache()
+        text = "{A} " + " ".join(f"{{~A, x_{k}}}" for k in range(200))
+        
+        start = time.perf_counter()
+        result = cache.solve(ResolutionModel.ResolutionModel.parse(text), proof=False)
+        
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertTrue(result["satisfiable"])
+        self.assertIsNotNone(cache.get(ResolutionModel.ResolutionModel.parse(text)))
+    
+    def test_replay_proof(self):
+        """Test that a cached refutation of a renamed problem is derived in the model itself"""
+        cache = ResultCache.ResultCache()
+        cache.solve(ResolutionModel.ResolutionModel.parse("{A, B} {~A, B} {A, ~B} {~A, ~B}"))
+        model = ResolutionModel.ResolutionModel.parse("{~Q, P} {Q, ~P} {~P, ~Q} {P, Q}")
+        
+        proof = cache.get(model)["proof"]
+        ResultCache.replay_proof(model, proof)
+        
+        self.assertEqual(model.get_clauses()[-1], Clause.Clause())
+        self.assertEqual(model.get_proof().num_resolutions(), proof.num_resolutions())
+    
+    def test_replay_proof_of_other_clauses_raises_error(self):
+        """Test that replaying a proof whose input clauses are not in the model raises ValueError"""
+        proof = ResultCache.ResultCache().solve(ResolutionModel.ResolutionModel.parse("{A} {~A}"))["proof"]
+        model = ResolutionModel.ResolutionModel.parse("{A} {~A, B} {~B}")
+        
+        with self.assertRaises(ValueError):
+            ResultCache.replay_proof(model, proof)
+
+
+class TestResolutionModelGetProof(unittest.TestCase):
+    """Test cases for the ResolutionModel.get_proof() method"""
+    
+    def test_get_proof_readme_example(self):
+        """Test the proof from the README quickstart"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B} {A, ~B} {~A, B} {~A, ~B}")
+        model.resolve(0, 2, Literal.Literal(False, "A"))
+        model.resolve(1, 3, Literal.Literal(False, "A"))
+        model.resolve(4, 5, Literal.Literal(False, "B"))
+        
+        proof = model.get_proof()
+        self.assertIsInstance(proof, Proof.Proof)
+        self.assertEqual([str(clause) for clause, _ in proof],
+                         ["{A, B}", "{~A, B}", "{A, ~B}", "{~A, ~B}", "{B}", "{~B}", "{}"])
+        self.assertEqual([parents for _, parents in proof],
+                         [None, None, None, None, (1, 2), (3, 4), (5, 6)])
+        lines = str(proof).splitlines()
+        self.assertEqual(lines[0].split(), ["1", "{A,", "B}", "Input", "clause"])
+        self.assertEqual(lines[6].split(), ["7", "{}", "5,6", "Resolution"])
+    
+    def test_get_proof_without_empty_clause_raises_error(self):
+        """Test that get_proof raises ValueError without the empty clause"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B} {~A}")
+        
+        with self.assertRaises(ValueError):
+            model.get_proof()
+    
+    def test_get_proof_deep_derivation(self):
+        """Test that derivations deeper than the recursion limit can be extracted"""
+        base = Clause.Clause.from_masks(0, 1 << 20)
+        clause = Clause.Clause.from_masks(1, 0)
+        for i in range(2, 5000):
+            clause = Clause.Clause.from_masks(i, 0, clause, base)
+        empty = Clause.Clause.from_masks(0, 0, clause, base)
+        model = ResolutionModel.ResolutionModel([empty])
+        
+        proof = model.get_proof()
+        self.assertEqual(len(proof), 5001)
+        self.assertEqual(proof.get_steps()[-1], (empty, (5000, 2)))
+
+
 class TestResolutionModelParse(unittest.TestCase):
     """Test cases for the ResolutionModel.parse() static method"""
     
@@ -440,7 +2140,7 @@ class TestResolutionModelParse(unittest.TestCase):
         clauses = model.get_clauses()
         
         self.assertEqual(len(clauses), 2)
-
+    
     def test_parse_with_commas(self):
         """Test parsing with parentheses"""
         model = ResolutionModel.ResolutionModel.parse("{A, B, C}, {D, E}")
@@ -556,6 +2256,221 @@ class TestResolutionModelParse(unittest.TestCase):
         self.assertEqual(len(clauses[1].get_literals()), 2)
 
 
+class TestResolutionModelSerialization(unittest.TestCase):
+    """Test cases for the binary and JSON snapshots of ResolutionModel"""
+    
+    def saturated_model(self):
+        model = ResolutionModel.ResolutionModel.parse("{A, B} {~A, B} {A, ~B} *{~A, ~B}")
+        model.saturate()
+        return model
+    
+    def assert_same_model(self, loaded, model):
+        self.assertEqual(loaded, model)
+        self.assertEqual(loaded.get_goals(), model.get_goals())
+        self.assertEqual(loaded.subsumption, model.subsumption)
+        if Clause.Clause() in model.get_clauses():
+            self.assertEqual(str(loaded.get_proof()), str(model.get_proof()))
+        for index in range(model.num_clauses()):
+            self.assertEqual(loaded.is_retired(index), model.is_retired(index))
+    
+    def test_binary_round_trip(self):
+        """Test that a model with derived clauses, goals and proof survives to_bytes()"""
+        model = self.saturated_model()
+        data = model.to_bytes()
+        
+        self.assertIsInstance(data, bytes)
+        self.assert_same_model(ResolutionModel.ResolutionModel.from_bytes(data), model)
+    
+    def test_json_round_trip(self):
+        """Test that a model survives to_json() and that parents are stored as indices"""
+        model = self.saturated_model()
+        text = model.to_json()
+        document = json.loads(text)
+        
+        self.assertEqual(document["version"], Serialization.FORMAT_VERSION)
+        self.assertTrue(all(parents is None or all(isinstance(i, int) for i in parents)
+                            for parents in document["parents"]))
+        self.assert_same_model(ResolutionModel.ResolutionModel.from_json(text), model)
+    
+    def test_round_trip_keeps_retired_clauses_and_subsumption(self):
+        """Test that retired clauses and the subsumption setting are restored"""
+        model = ResolutionModel.ResolutionModel.parse("{A, B, C} {A, ~B} {~A, D} {A, B}")
+        model.subsumption = True
+        model.resolve(1, 3, Literal.Literal(False, "B"))
+        
+        self.assert_same_model(ResolutionModel.ResolutionModel.from_bytes(model.to_bytes()), model)
+        self.assert_same_model(ResolutionModel.ResolutionModel.from_json(model.to_json()), model)
+    
+    def test_round_trip_many_variables(self):
+        """Test that named variables beyond A to Z are restored by name"""
+        model = ResolutionModel.ResolutionModel.parse("{x_101, ~y_2} {y_2} {~x_101}")
+        model.resolve(0, 1, Literal.Literal(False, "y_2"))
+        
+        self.assertEqual(ResolutionModel.ResolutionModel.from_bytes(model.to_bytes()), model)
+    
+    def test_pickle_uses_snapshot(self):
+        """Test that pickling a long derivation works and keeps the proof"""
+        model = ResolutionModel.ResolutionModel.parse(benchmark.implication_chain(3000))
+        model.saturate(strategy="unit")
+        
+        loaded = pickle.loads(pickle.dumps(model))
+        
+        self.assertEqual(loaded, model)
+        self.assertEqual(len(loaded.get_proof()), len(model.get_proof()))
+    
+    def test_rejects_unknown_version(self):
+        """Test that snapshots from a newer format version raise ValueError"""
+        model = ResolutionModel.ResolutionModel.parse("{A} {~A}")
+        data = bytearray(model.to_bytes())
+        data[len(Serialization.MAGIC)] = Serialization.FORMAT_VERSION + 1
+        document = json.loads(model.to_json())
+        document["version"] = Serialization.FORMAT_VERSION + 1
+        
+        with self.assertRaises(ValueError):
+            ResolutionModel.ResolutionModel.from_bytes(bytes(data))
+        with self.assertRaises(ValueError):
+            ResolutionModel.ResolutionModel.from_json(json.dumps(document))
+    
+    def test_rejects_malformed_data(self):
+        """Test that corrupt or truncated snapshots raise ValueError"""
+        data = ResolutionModel.ResolutionModel.parse("{A, B} {~A}").to_bytes()
+        
+        for bad in (b"", b"not a snapshot", data[:-1], data + b"\x00"):
+            with self.subTest(bad=bad):
+                with self.assertRaises(ValueError):
+                    ResolutionModel.ResolutionModel.from_bytes(bad)
+        with self.assertRaises(ValueError):
+            ResolutionModel.ResolutionModel.from_json('{"version": 1, "variables": ["A"]}')
+    
+    def test_rejects_out_of_range_indices(self):
+        """Test that negative or too large goal and literal indices are rejected, not wrapped around"""
+        document = json.loads(ResolutionModel.ResolutionModel.parse("{A, B} {~A}").to_json())
+        for field, value in (("goals", [-1]), ("goals", [2]), ("clauses", [[0, -2], [1]]), ("clauses", [[0, 4], [1]])):
+            with self.subTest(field=field, value=value):
+                with self.assertRaises(ValueError):
+                    ResolutionModel.ResolutionModel.from_json(json.dumps(dict(document, **{field: value})))
+    
+    def test_version_one_snapshot_loads(self):
+        """Test that a stored version 1 snapshot keeps loading"""
+        text = ('{"version":1,"variables":["A","B"],"clauses":[[0,2],[1],[2],[]],'
+                '"parents":[null,null,[0,1],null],"goals":[1],"retired":[],"subsumption":false}')
+        model = ResolutionModel.ResolutionModel.from_json(text)
+        
+        self.assertEqual(model.get_clauses()[2].get_parents(), (model.get_clauses()[0], model.get_clauses()[1]))
+        self.assertEqual(model.get_goals(), [1])
+
+
+class TestResolutionModelDimacs(unittest.TestCase):
+    """Test cases for DIMACS CNF reading and writing"""
+    
+    def test_from_dimacs_stream(self):
+        """Test reading comments, the header and clauses spanning lines"""
+        text = "c example\np cnf 3 3\n1 -2 0\n2 3\n0 -1\n0\n"
+        model = ResolutionModel.ResolutionModel.from_dimacs(io.StringIO(text))
+        
+        self.assertEqual(model.get_clauses(), [Clause.Clause.parse("{A, ~B}"),
+                                               Clause.Clause.parse("{B, C}"),
+                                               Clause.Clause.parse("{~A}")])
+    
+    def test_from_dimacs_path(self):
+        """Test reading from a file path, stopping at a % end marker"""
+        with tempfile.NamedTemporaryFile("w", suffix=".cnf", delete=False) as f:
+            f.write("p cnf 2 2\n1 2 0\n-1 0\n%\n0\n")
+        try:
+            model = ResolutionModel.ResolutionModel.from_dimacs(f.name)
+        finally:
+            os.remove(f.name)
+        
+        self.assertEqual(model.num_clauses(), 2)
+    
+    def test_round_trip(self):
+        """Test that writing and reading back gives the same clauses"""
+        model = ResolutionModel.ResolutionModel.parse("{A, ~C} {~A, B} {Z}")
+        stream = io.StringIO()
+        model.to_dimacs(stream)
+        
+        self.assertEqual(stream.getvalue(), "p cnf 26 3\n1 -3 0\n-1 2 0\n26 0\n")
+        stream.seek(0)
+        self.assertEqual(ResolutionModel.ResolutionModel.from_dimacs(stream), model)
+    
+    def test_from_dimacs_many_variables(self):
+        """Test that variables are named x_k when the header declares more than 26"""
+        model = ResolutionModel.ResolutionModel.from_dimacs(io.StringIO("p cnf 30 2\n1 -30 0\n30 0\n"))
+        
+        self.assertEqual(model.get_clauses(), [Clause.Clause.parse("{x_1, ~x_30}"), Clause.Clause.parse("{x_30}")])
+    
+    def test_round_trip_with_names(self):
+        """Test that names beyond A to Z survive a round trip"""
+        model = ResolutionModel.ResolutionModel.parse("{A, ~P12} {P12, x_3}")
+        stream = io.StringIO()
+        model.to_dimacs(stream)
+        
+        self.assertRegex(stream.getvalue(), r"c var [23] P12\n")
+        stream.seek(0)
+        self.assertEqual(ResolutionModel.ResolutionModel.from_dimacs(stream), model)
+    
+    def test_variable_beyond_header_raises_error(self):
+        """Test that a variable above the declared count is rejected"""
+        with self.assertRaises(ValueError):
+            ResolutionModel.ResolutionModel.from_dimacs(io.StringIO("p cnf 2 1\n1 3 0\n"))
+    
+    def test_empty_clause(self):
+        """Test that a lone 0 is the empty clause"""
+        model = ResolutionModel.ResolutionModel.from_dimacs(io.StringIO("1 0\n0\n"))
+        self.assertIn(Clause.Clause(), model.get_clauses())
+    
+    def test_invalid_input_raises_error(self):
+        """Test that malformed DIMACS raises ValueError"""
+        for text in ["1 x 0\n", "p cnf x 1\n1 0\n", "c nothing\n", "27 0\n"]:
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    ResolutionModel.ResolutionModel.from_dimacs(io.StringIO(text))
+    
+    def test_non_stream_raises_error(self):
+        """Test that a non-path, non-stream source raises TypeError"""
+        with self.assertRaises(TypeError):
+            ResolutionModel.ResolutionModel.from_dimacs(42)
+
+
+class TestBenchmark(unittest.TestCase):
+    """Test cases for the problem generators and runner in benchmark"""
+    
+    def test_unsatisfiable_families(self):
+        """Test that the pigeonhole, Tseitin and chain families are unsatisfiable"""
+        for text in (benchmark.pigeonhole(3), benchmark.tseitin_grid(2), benchmark.implication_chain(30)):
+            with self.subTest(text=text[:40]):
+                self.assertIsNone(ResolutionModel.ResolutionModel.parse(text).satisfying_assignment())
+    
+    def test_family_sizes(self):
+        """Test the number of clauses and variables of generated instances"""
+        php = ResolutionModel.ResolutionModel.parse(benchmark.pigeonhole(3))
+        self.assertEqual(php.num_clauses(), 4 + 3 * 6)
+        
+        chain = ResolutionModel.ResolutionModel.parse(benchmark.implication_chain(40))
+        self.assertEqual(chain.num_clauses(), 41)
+        
+        cnf = benchmark.random_kcnf(10, seed=3)
+        self.assertEqual(cnf, benchmark.random_kcnf(10, seed=3))
+        clauses = ResolutionModel.ResolutionModel.parse(cnf).get_clauses()
+        self.assertTrue(all(len(clause) == 3 for clause in clauses))
+    
+    def test_run_benchmarks_report(self):
+        """Test that a small run gives a JSON-serializable report with timings"""
+        report = benchmark.run_benchmarks({"implication-chain": [5], "pigeonhole": [2]}, repeat=1)
+        
+        json.dumps(report)
+        self.assertEqual([(r["family"], r["size"]) for r in report["results"]],
+                         [("implication-chain", 5), ("pigeonhole", 2)])
+        for result in report["results"]:
+            self.assertTrue(result["refuted"])
+            self.assertIn("get_proof", result["timings"])
+    
+    def test_unknown_family_raises_error(self):
+        """Test that an unknown family name raises ValueError"""
+        with self.assertRaises(ValueError):
+            benchmark.run_benchmarks({"no-such-family": [1]})
+
+
 class TestClauseEquality(unittest.TestCase):
     """Test cases for Clause equality and hashing"""
     
@@ -634,6 +2549,58 @@ class TestClauseEquality(unittest.TestCase):
         self.assertNotEqual(clause1, clause2)
 
 
+class TestClauseBitmask(unittest.TestCase):
+    """Test cases for the bitmask representation of Clause"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.a = Literal.Literal(False, "A")
+        self.not_a = Literal.Literal(True, "A")
+        self.b = Literal.Literal(False, "B")
+        self.not_c = Literal.Literal(True, "C")
+    
+    def test_masks_match_literals(self):
+        """Test that positive and negated letters land in separate masks"""
+        clause = Clause.Clause({self.a, self.b, self.not_c})
+        self.assertEqual(clause.positive_mask, 0b011)
+        self.assertEqual(clause.negative_mask, 0b100)
+    
+    def test_from_masks_equals_constructor(self):
+        """Test that building from masks gives an equal clause with the same hash"""
+        clause1 = Clause.Clause({self.a, self.not_c})
+        clause2 = Clause.Clause.from_masks(0b001, 0b100)
+        
+        self.assertEqual(clause1, clause2)
+        self.assertEqual(hash(clause1), hash(clause2))
+        self.assertEqual(clause2.get_literals(), {self.a, self.not_c})
+    
+    def test_repr_is_ordered_by_letter(self):
+        """Test that repr lists literals by letter, positive before negated"""
+        clause = Clause.Clause({self.not_c, self.b, self.not_a, self.a})
+        self.assertEqual(repr(clause), "{A, ~A, B, ~C}")
+    
+    def test_len_and_tautology(self):
+        """Test literal count and tautology detection"""
+        self.assertEqual(len(Clause.Clause({self.a, self.not_a, self.b})), 3)
+        self.assertTrue(Clause.Clause({self.a, self.not_a}).is_tautology())
+        self.assertFalse(Clause.Clause({self.a, self.b}).is_tautology())
+    
+    def test_clash_mask(self):
+        """Test that clash_mask reports letters with opposite signs"""
+        clause1 = Clause.Clause({self.a, self.b})
+        clause2 = Clause.Clause({self.not_a, self.b, self.not_c})
+        self.assertEqual(clause1.clash_mask(clause2), 0b001)
+        self.assertEqual(clause2.clash_mask(clause1), 0b001)
+    
+    def test_resolve_keeps_parents(self):
+        """Test that the resolvent records both parents"""
+        clause1 = Clause.Clause({self.a, self.b})
+        clause2 = Clause.Clause({self.not_a})
+        result = Clause.Clause.resolve(clause1, clause2, self.a)
+        self.assertEqual(result.get_parents(), (clause1, clause2))
+        self.assertEqual(result, Clause.Clause({self.b}))
+
+
 class TestResolutionModelEquality(unittest.TestCase):
     """Test cases for ResolutionModel equality and hashing"""
     
@@ -0,0 +1,298 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from Literal import Literal, SymbolTable
+from Clause import Clause
+from Proof import Proof
+from ResolutionModel import ResolutionModel
+from Canonical import canonical_form
+
+def input_clauses(model: ResolutionModel) -> list:
+    """Return the clauses of model that were not derived by resolution, in model order"""
+    return [clause for clause in model.get_clauses() if clause.get_parents() == (None, None)]
+
+
+def replay_proof(model: ResolutionModel, proof: Proof) -> None:
+    """
+    Derive the resolvents of proof in model one step at a time, so that a refutation found
+    elsewhere (for instance one returned by ResultCache.solve()) ends in the model's own
+    empty clause and shows up in get_proof().
+    
+    Args:
+        model: The model to resolve in; its clauses must include the proof's input clauses
+        proof: A Proof over the letters of model
+    
+    Raises:
+        ValueError: If an input clause is not in model, or forward subsumption discards
+            a resolvent the proof needs
+    """
+    lines = []
+    for clause, parents in proof:
+        if parents is None:
+            lines.append(model.index_of(clause))
+            continue
+        index1, index2 = lines[parents[0] - 1], lines[parents[1] - 1]
+        # The pivot is the clashing letter the resolvent no longer contains
+        letters = {lit.letter for lit in clause.get_literals()}
+        pivot = next(lit for lit in model.get_literal_negation_pairs(index1, index2) if lit.letter not in letters)
+        index = model.resolve(index1, index2, pivot)
+        if index is None:
+            raise ValueError(f"{clause} was discarded by forward subsumption")
+        lines.append(index)
+
+
+def _hash_clauses(clauses: list) -> str:
+    """Hash a list of clauses independently of clause order, literal order and var_ids"""
+    lines = sorted(" ".join(sorted(str(lit) for lit in clause.get_literals())) for clause in clauses)
+    return hashlib.sha256("\n".join(lines).encode("utf-8")).hexdigest()
+
+
+def canonical_key(clauses: list) -> str:
+    """
+    Return a hash identifying a set of clauses up to variable renaming, polarity flips and
+    clause and literal order.
+    
+    Args:
+        clauses: Iterable of Clause objects
+    """
+    return _hash_clauses(canonical_form(clauses)[0])
+
+
+def _rename(literal: Literal, renaming: dict) -> Literal:
+    """Apply a renaming from positive Literals to Literals to any Literal"""
+    renamed = renaming[literal.negate() if literal.is_negated else literal]
+    return renamed.negate() if literal.is_negated else renamed
+
+
+def _invert(renaming: dict) -> dict:
+    """Return the inverse of a renaming from positive Literals to Literals"""
+    return {renamed.negate() if renamed.is_negated else renamed: original.negate() if renamed.is_negated else original
+            for original, renamed in renaming.items()}
+
+
+def _rename_assignment(assignment: dict, renaming: dict) -> dict:
+    """Translate a {letter: bool} assignment through a renaming"""
+    positives = {original.letter: original for original in renaming}
+    renamed = {}
+    for letter, value in assignment.items():
+        literal = _rename(positives[letter], renaming)
+        renamed[literal.letter] = value != literal.is_negated
+    return renamed
+
+
+def _rename_proof(proof: Proof, renaming: dict) -> Proof:
+    """Translate every clause of a proof through a renaming"""
+    return Proof([(Clause({_rename(lit, renaming) for lit in clause.get_literals()}), parents)
+                  for clause, parents in proof])
+
+
+def _dump_proof(proof: Proof) -> str:
+    """Encode a Proof as JSON, each clause as its list of literal strings"""
+    return json.dumps([[sorted(str(lit) for lit in clause.get_literals()), parents]
+                       for clause, parents in proof])
+
+
+def _load_proof(text: str) -> Proof:
+    """Decode a Proof written by _dump_proof()"""
+    table = SymbolTable()
+    steps = []
+    for literals, parents in json.loads(text):
+        clause = Clause({table.parse(lit) for lit in literals}, table=table)
+        steps.append((clause, None if parents is None else tuple(parents)))
+    return Proof(steps)
+
+
+class ResultCache:
+    """
+    A persistent SQLite cache of solved problems, keyed by canonical_key() of a model's
+    input clauses.
+    
+    Problems that differ only in variable names, polarities or order share an entry;
+    results are stored in terms of the canonical form and translated back to the names of
+    the model they are looked up for. Each entry records whether the clauses are satisfiable, a satisfying assignment or
+    the shortest refutation found so far, and statistics of the saturation run that
+    produced it. Once the cache holds more than max_entries entries the least recently
+    used ones are evicted. A cache may be shared between threads.
+    """
+    
+    # Cap on the clauses generated while searching for a refutation in solve()
+    SATURATION_LIMIT = 5000
+    # Number of recently seen clause sets whose canonical key and renaming are kept in memory
+    KEY_CACHE_SIZE = 256
+    # Cap on the search nodes of each canonical form; a capped key can only miss an entry
+    MAX_SEARCH_NODES = 2000
+    
+    def __init__(self, path: str = ":memory:", max_entries: int = 1000):
+        """
+        Open (creating if needed) a cache database.
+        
+        Args:
+            path: SQLite database file, or ":memory:" for a cache private to this object
+            max_entries: Maximum number of entries kept (must be positive)
+        
+        Raises:
+            ValueError: If max_entries is not positive
+        """
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be positive, got: {max_entries}")
+        self.__max_entries = max_entries
+        self.__lock = threading.Lock()
+        # Maps the exact hash of a list of input clauses to its (canonical key, renaming),
+        # least recently used first
+        self.__keys = OrderedDict()
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        with self.__connection:
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, "
+                "satisfiable INTEGER NOT NULL, "
+                "assignment TEXT, "
+                "proof TEXT, "
+                "proof_length INTEGER, "
+                "stats TEXT NOT NULL, "
+                "last_used REAL NOT NULL)"
+            )
+    
+    def close(self) -> None:
+        """Close the database connection"""
+        with self.__lock:
+            self.__connection.close()
+    
+    def __len__(self) -> int:
+        with self.__lock:
+            return self.__connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+    
+    def __canonical(self, model: ResolutionModel) -> tuple:
+        """
+        Return the (canonical key, renaming) of the input clauses of model.
+        
+        Canonical forms are the expensive part of a lookup, so the ones of recently seen
+        clause sets are kept, keyed by the exact (letter for letter) hash of the clauses.
+        """
+        clauses = input_clauses(model)
+        exact = _hash_clauses(clauses)
+        with self.__lock:
+            known = self.__keys.get(exact)
+            if known is not None:
+                self.__keys.move_to_end(exact)
+                return known
+        canonical_clauses, renaming = canonical_form(clauses, self.MAX_SEARCH_NODES)
+        known = (_hash_clauses(canonical_clauses), renaming)
+        with self.__lock:
+            self.__keys[exact] = known
+            if len(self.__keys) > self.KEY_CACHE_SIZE:
+                self.__keys.popitem(last=False)
+        return known
+    
+    def get(self, model: ResolutionModel):
+        """
+        Look up the cached result for the input clauses of model.
+        
+        Returns:
+            None on a miss, otherwise a dict with keys "satisfiable" (bool), "assignment"
+            (dict mapping letters to bools, or None), "proof" (Proof or None) and "stats" (dict)
+        """
+        return self.__lookup(*self.__canonical(model))
+    
+    def __lookup(self, key: str, renaming: dict):
+        """Look up the result stored under key, translated back through renaming"""
+        with self.__lock, self.__connection:
+            row = self.__connection.execute(
+                "SELECT satisfiable, assignment, proof, stats FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.__connection.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+        satisfiable, assignment, proof, stats = row
+        inverse = _invert(renaming)
+        return {
+            "satisfiable": bool(satisfiable),
+            "assignment": None if assignment is None else _rename_assignment(json.loads(assignment), inverse),
+            "proof": None if proof is None else _rename_proof(_load_proof(proof), inverse),
+            "stats": json.loads(stats),
+        }
+    
+    def put(self, model: ResolutionModel, satisfiable: bool, assignment: dict = None,
+            proof: Proof = None, stats: dict = None) -> None:
+        """
+        Store a result for the input clauses of model, evicting old entries if needed.
+        
+        A proof already stored for the same clauses is only replaced by a shorter one.
+        
+        Args:
+            model: The model the result is for
+            satisfiable: Whether the clauses are satisfiable
+            assignment: Optional satisfying assignment mapping letters to bools
+            proof: Optional refutation
+            stats: Optional JSON-serializable dict of statistics
+        """
+        self.__store(*self.__canonical(model), satisfiable, assignment, proof, stats)
+    
+    def __store(self, key: str, renaming: dict, satisfiable: bool, assignment: dict,
+                proof: Proof, stats: dict) -> None:
+        """Store a result under key, translating it through renaming"""
+        if assignment is not None:
+            assignment = _rename_assignment(assignment, renaming)
+        proof_text = None if proof is None else _dump_proof(_rename_proof(proof, renaming))
+        proof_length = None if proof is None else len(proof)
+        with self.__lock, self.__connection:
+            row = self.__connection.execute(
+                "SELECT proof, proof_length FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row[1] is not None and (proof_length is None or row[1] <= proof_length):
+                proof_text, proof_length = row
+            self.__connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, int(satisfiable), None if assignment is None else json.dumps(assignment),
+                 proof_text, proof_length, json.dumps(stats or {}), time.time())
+            )
+            self.__connection.execute(
+                "DELETE FROM results WHERE key NOT IN "
+                "(SELECT key FROM results ORDER BY last_used DESC LIMIT ?)", (self.__max_entries,)
+            )
+    
+    def solve(self, model: ResolutionModel, proof: bool = True) -> dict:
+        """
+        Return the cached result for model, computing and storing it on a miss.
+        
+        The computation never touches model: satisfiability is decided with
+        satisfying_assignment(), and unsatisfiable clauses are saturated in a fresh model
+        (with unit preference and up to SATURATION_LIMIT clauses) to find a proof.
+        
+        Args:
+            model: The model to solve
+            proof: Whether to search for a refutation of unsatisfiable clauses; without it
+                only satisfiability is decided, and a later solve() asking for a proof
+                runs the search and completes the entry
+        
+        Returns:
+            A dict as returned by get()
+        """
+        key, renaming = self.__canonical(model)
+        result = self.__lookup(key, renaming)
+        # "refuted" is only recorded once a refutation has been searched for
+        if result is not None and (not proof or result["satisfiable"] or "refuted" in result["stats"]):
+            return result
+        
+        clauses = input_clauses(model)
+        if result is None:
+            assignment = model.satisfying_assignment()
+            stats = {"input_clauses": len(clauses)}
+        else:
+            assignment = None
+            stats = result["stats"]
+        refutation = None
+        if assignment is None and proof:
+            search = ResolutionModel(clauses)
+            start = time.perf_counter()
+            refuted = search.saturate(max_clauses=self.SATURATION_LIMIT, strategy="unit")
+            stats["saturation_seconds"] = time.perf_counter() - start
+            stats["saturation_clauses"] = search.num_clauses()
+            stats["refuted"] = refuted
+            if refuted:
+                refutation = search.get_proof()
+        self.__store(key, renaming, assignment is not None, assignment, refutation, stats)
+        return {"satisfiable": assignment is not None, "assignment": assignment, "proof": refutation, "stats": stats}
@@ -0,0 +1,189 @@
+import math
+import time
+
+class SearchTimeout(Exception):
+    """Raised inside RefutationSearch when the wall-clock deadline passes"""
+
+
+def _size(clause: tuple) -> int:
+    """Number of literals of a (positive, negative) mask pair"""
+    return clause[0].bit_count() + clause[1].bit_count()
+
+
+def _single_clash(first: tuple, second: tuple):
+    """Return the resolvent of two mask pairs clashing on exactly one letter, or None"""
+    clash = (first[0] & second[1]) | (first[1] & second[0])
+    if not clash or clash & (clash - 1):
+        return None
+    return ((first[0] | second[0]) & ~clash, (first[1] | second[1]) & ~clash)
+
+
+def _subsumed(clause: tuple, clauses: list) -> bool:
+    """Return True if one of clauses subsumes clause"""
+    positive, negative = clause
+    return any(p & positive == p and n & negative == n for p, n in clauses)
+
+
+class RefutationSearch:
+    """
+    Iterative-deepening search for a shortest resolution refutation of a set of clauses.
+    
+    Clauses are (positive, negative) letter bitmask pairs. Depth d asks whether the empty
+    clause can be derived in d resolution steps; depths are tried in increasing order, so
+    the first refutation found is a shortest one. Only resolvents on a single clashing
+    letter are used (any other is a tautology), resolvents subsumed by a clause already
+    derived are skipped, and smaller resolvents are tried first. Branches are cut when the
+    derived clauses not used yet could not all be resolved away in the steps left, and
+    independent steps are only searched in one order. A transposition table keyed by the
+    derived clauses remembers the depth at which each state already failed.
+    """
+    
+    def __init__(self, clauses: list):
+        """
+        Args:
+            clauses: List of (positive, negative) mask pairs, none of them tautologies
+        """
+        self.__clauses = list(clauses)
+        self.__deadline = None
+        self.__table = {}
+        # Single-clash resolvents of the input clauses, built once and resumed after a timeout
+        self.__resolvents = {}
+        self.__rows_done = 0
+        # Deepest depth searched exhaustively without finding a refutation
+        self.depth_completed = 0
+        self.nodes = 0
+    
+    def __root_resolvents(self) -> dict:
+        """
+        Map every single-clash resolvent of the input clauses to the list of pairs producing it.
+        
+        The map is built once per search; a deadline passing while it is built raises
+        SearchTimeout, and the next call picks up where the last one stopped.
+        """
+        clauses = self.__clauses
+        members = set(clauses)
+        resolvents = self.__resolvents
+        for j in range(self.__rows_done, len(clauses)):
+            if self.__deadline is not None and time.perf_counter() > self.__deadline:
+                raise SearchTimeout()
+            for i in range(j):
+                resolvent = _single_clash(clauses[i], clauses[j])
+                if resolvent is not None and resolvent not in members:
+                    resolvents.setdefault(resolvent, []).append((i, j))
+            self.__rows_done = j + 1
+        return resolvents
+    
+    def __dfs(self, clauses: list, members: set, resolvents: dict, unused: frozenset, remaining: int) -> tuple:
+        """
+        Look for a refutation in at most remaining more steps.
+        
+        unused holds the derived clauses no later step has resolved yet. Every clause of a
+        shortest refutation is used, and one step uses up at most two clauses while adding
+        its resolvent, so at most remaining + 1 clauses may be unused after a step. Every
+        letter of an unused clause must also be the pivot of a later step.
+        
+        Returns a (steps, cut) pair: steps is the rest of the refutation or None, and cut
+        tells whether the depth bound cut anything off, so that a deeper search might succeed.
+        """
+        self.nodes += 1
+        if self.__deadline is not None and time.perf_counter() > self.__deadline:
+            raise SearchTimeout()
+        derived = len(clauses) - len(self.__clauses)
+        last = clauses[-1] if derived else None
+        key = (frozenset(clauses[len(self.__clauses):]), unused, last)
+        known = self.__table.get(key, 0)
+        if known >= remaining:
+            return None, known != math.inf
+        cut = False
+        for resolvent in sorted(resolvents, key=_size):
+            pairs = resolvents[resolvent]
+            if resolvent == (0, 0):
+                for i, j in pairs:
+                    if not unused - {clauses[i], clauses[j]}:
+                        return [(i, j, resolvent)], False
+                cut = True
+                continue
+            # The resolvent itself is unused, so each of its letters needs a later step;
+            # resolvents come smallest first, so none of the rest fits either
+            if _size(resolvent) > remaining - 1:
+                cut = True
+                break
+            if _subsumed(resolvent, clauses):
+                continue
+            # Branch once per distinct set of clauses the step leaves unused
+            options = {}
+            for i, j in pairs:
+                # Two neighbouring steps that do not depend on each other could be swapped,
+                # so only the order putting the smaller resolvent first is searched
+                if last is not None and last > resolvent and len(clauses) - 1 not in (i, j):
+                    continue
+                options.setdefault((unused - {clauses[i], clauses[j]}) | {resolvent}, (i, j))
+            if not options:
+                continue
+            k = len(clauses)
+            child = dict(resolvents)
+            del child[resolvent]
+            clauses.append(resolvent)
+            members.add(resolvent)
+            for other in range(k):
+                new = _single_clash(clauses[other], resolvent)
+                if new is not None and new not in members:
+                    child[new] = child.get(new, []) + [(other, k)]
+            try:
+                for child_unused, (i, j) in options.items():
+                    letters = 0
+                    for positive, negative in child_unused:
+                        letters |= positive | negative
+                    if len(child_unused) > remaining or letters.bit_count() > remaining - 1:
+                        cut = True
+                        continue
+                    rest, child_cut = self.__dfs(clauses, members, child, child_unused, remaining - 1)
+                    if rest is not None:
+                        return [(i, j, resolvent)] + rest, False
+                    cut = cut or child_cut
+            finally:
+                clauses.pop()
+                members.discard(resolvent)
+        # A state that failed without any cutoff fails at every depth
+        self.__table[key] = remaining if cut else math.inf
+        return None, cut
+    
+    def search(self, deadline: float = None, max_depth: int = None):
+        """
+        Search for a shortest refutation.
+        
+        Proving that there is none can take very long, so check satisfiability first
+        (Solver.CDCLSolver answers that quickly) or pass a deadline or max_depth.
+        
+        Args:
+            deadline: Optional time.perf_counter() value after which SearchTimeout is raised
+            max_depth: Optional cap on the number of resolution steps
+        
+        Returns:
+            None if there is no refutation (within max_depth steps, if given), otherwise the list of
+            steps (i, j, resolvent): clause i and clause j are resolved into resolvent, where
+            indices below len(clauses) refer to the input clauses and index len(clauses) + t
+            to the resolvent of step t. The last resolvent is the empty clause.
+        
+        Raises:
+            SearchTimeout: If the deadline passes first; depth_completed then tells how
+                deep the search got, and calling search() again resumes from there
+        """
+        self.__deadline = deadline
+        clauses = self.__clauses
+        if (0, 0) in clauses:
+            return []
+        if not clauses:
+            return None
+        resolvents = self.__root_resolvents()
+        depth = self.depth_completed + 1
+        while max_depth is None or depth <= max_depth:
+            steps, cut = self.__dfs(list(clauses), set(clauses), resolvents, frozenset(), depth)
+            if steps is not None:
+                return steps
+            self.depth_completed = depth
+            # Nothing was cut off, so every derivable clause was tried: there is no refutation
+            if not cut:
+                return None
+            depth += 1
+        return None
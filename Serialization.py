@@ -0,0 +1,147 @@
+import json
+
+# Version written by encode_binary() and encode_json(); older versions can still be decoded
+FORMAT_VERSION = 1
+MAGIC = b"RSM"
+
+def _write_varint(out: bytearray, value: int) -> None:
+    """Append a non-negative integer as an unsigned LEB128 varint"""
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+class _Reader:
+    """Sequential reader of varints and strings from a bytes object"""
+    
+    def __init__(self, data: bytes, position: int):
+        self.__data = data
+        self.__position = position
+    
+    def varint(self) -> int:
+        result = 0
+        shift = 0
+        while True:
+            if self.__position >= len(self.__data):
+                raise ValueError("truncated snapshot")
+            byte = self.__data[self.__position]
+            self.__position += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+    
+    def string(self) -> str:
+        length = self.varint()
+        end = self.__position + length
+        if end > len(self.__data):
+            raise ValueError("truncated snapshot")
+        text = self.__data[self.__position:end].decode("utf-8")
+        self.__position = end
+        return text
+    
+    def at_end(self) -> bool:
+        return self.__position == len(self.__data)
+
+
+def _check_version(version) -> None:
+    if not isinstance(version, int) or not 1 <= version <= FORMAT_VERSION:
+        raise ValueError(f"unsupported snapshot version {version}, expected 1 to {FORMAT_VERSION}")
+
+
+def encode_binary(snapshot: dict) -> bytes:
+    """
+    Encode a snapshot as bytes: the magic bytes, the format version, then varints.
+    
+    A snapshot is a dict with the keys
+        variables: List of variable names; variable v has literal IDs 2*v (positive) and 2*v + 1 (negated)
+        clauses: List of literal-ID lists, one per clause in model order
+        parents: List with None or a (left index, right index) pair per clause
+        goals: List of goal clause indices
+        retired: List of retired clause indices
+        subsumption: Whether subsumption is enabled
+    """
+    out = bytearray(MAGIC)
+    out.append(FORMAT_VERSION)
+    out.append(int(snapshot["subsumption"]))
+    _write_varint(out, len(snapshot["variables"]))
+    for name in snapshot["variables"]:
+        encoded = name.encode("utf-8")
+        _write_varint(out, len(encoded))
+        out += encoded
+    _write_varint(out, len(snapshot["clauses"]))
+    for literals, parents in zip(snapshot["clauses"], snapshot["parents"]):
+        _write_varint(out, len(literals))
+        for literal in literals:
+            _write_varint(out, literal)
+        # Parent indices are stored plus one so that zero can mean "input clause"
+        if parents is None:
+            _write_varint(out, 0)
+        else:
+            _write_varint(out, parents[0] + 1)
+            _write_varint(out, parents[1] + 1)
+    for key in ("goals", "retired"):
+        _write_varint(out, len(snapshot[key]))
+        for index in snapshot[key]:
+            _write_varint(out, index)
+    return bytes(out)
+
+
+def decode_binary(data: bytes) -> dict:
+    """
+    Decode bytes written by encode_binary() of this or an earlier format version.
+    
+    Raises:
+        ValueError: If the data is not a snapshot or has an unsupported version
+    """
+    if not isinstance(data, (bytes, bytearray)) or data[:len(MAGIC)] != MAGIC or len(data) < len(MAGIC) + 2:
+        raise ValueError("not a ResolutionModel snapshot")
+    _check_version(data[len(MAGIC)])
+    subsumption = bool(data[len(MAGIC) + 1])
+    reader = _Reader(data, len(MAGIC) + 2)
+    variables = [reader.string() for _ in range(reader.varint())]
+    clauses = []
+    parents = []
+    for _ in range(reader.varint()):
+        clauses.append([reader.varint() for _ in range(reader.varint())])
+        left = reader.varint()
+        parents.append(None if left == 0 else (left - 1, reader.varint() - 1))
+    goals = [reader.varint() for _ in range(reader.varint())]
+    retired = [reader.varint() for _ in range(reader.varint())]
+    if not reader.at_end():
+        raise ValueError("trailing data after snapshot")
+    return {"variables": variables, "clauses": clauses, "parents": parents,
+            "goals": goals, "retired": retired, "subsumption": subsumption}
+
+
+def encode_json(snapshot: dict) -> str:
+    """Encode a snapshot (see encode_binary()) as a JSON object with a version field"""
+    document = {"version": FORMAT_VERSION}
+    document.update(snapshot)
+    document["parents"] = [None if parents is None else list(parents) for parents in snapshot["parents"]]
+    return json.dumps(document, separators=(",", ":"))
+
+
+def decode_json(text: str) -> dict:
+    """
+    Decode JSON written by encode_json() of this or an earlier format version.
+    
+    Raises:
+        ValueError: If the text is not a snapshot or has an unsupported version
+    """
+    document = json.loads(text)
+    if not isinstance(document, dict) or "version" not in document:
+        raise ValueError("not a ResolutionModel snapshot")
+    _check_version(document["version"])
+    try:
+        return {
+            "variables": list(document["variables"]),
+            "clauses": document["clauses"],
+            "parents": [None if parents is None else tuple(parents) for parents in document["parents"]],
+            "goals": document["goals"],
+            "retired": document["retired"],
+            "subsumption": bool(document["subsumption"]),
+        }
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"malformed snapshot: {e}")
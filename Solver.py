@@ -0,0 +1,244 @@
+import heapq
+
+class CDCLSolver:
+    """
+    Conflict-driven clause-learning SAT solver over a list of Clauses.
+    
+    Uses two watched literals per clause, first-UIP conflict analysis with
+    non-chronological backjumping, VSIDS branching with phase saving and
+    Luby-sequence restarts. Internally, variables are renumbered densely and
+    literal 2*v stands for variable v positive, 2*v + 1 for v negated.
+    """
+    
+    # Conflicts per unit of the Luby restart sequence
+    RESTART_BASE = 100
+    # Multiplier applied to the activity increment after every conflict
+    ACTIVITY_DECAY = 1 / 0.95
+    
+    def __init__(self, clauses: list):
+        """
+        Initialize the solver with the clauses to satisfy.
+        
+        Args:
+            clauses: List of Clause objects
+        """
+        # Variables are keyed by letter: var_ids are only meaningful within one symbol table
+        var_ids = {}
+        literal_lists = []
+        for clause in clauses:
+            literals = []
+            for lit in clause.get_literals():
+                var_ids.setdefault(lit.letter, lit.var_id)
+                literals.append((lit.letter, lit.is_negated))
+            # A tautology constrains nothing, but its letters still get a value
+            if not clause.is_tautology():
+                literal_lists.append(literals)
+        
+        self.__letters = sorted(var_ids, key=lambda letter: (var_ids[letter], letter))
+        dense = {letter: v for v, letter in enumerate(self.__letters)}
+        num_vars = len(self.__letters)
+        self.__num_vars = num_vars
+        self.__clauses = [[2 * dense[letter] + negated for letter, negated in literals] for literals in literal_lists]
+        
+        # value[lit] is 1 if lit is true, -1 if false, 0 if unassigned
+        self.__value = [0] * (2 * num_vars)
+        self.__level = [0] * num_vars
+        self.__reason = [None] * num_vars
+        self.__trail = []
+        self.__trail_lim = []
+        self.__queue_head = 0
+        self.__watches = [[] for _ in range(2 * num_vars)]
+        self.__activity = [0.0] * num_vars
+        self.__activity_inc = 1.0
+        self.__order = [(0.0, v) for v in range(num_vars)]
+        self.__saved_phase = [1] * num_vars
+    
+    def __assign(self, lit: int, reason) -> None:
+        """Make lit true at the current decision level"""
+        v = lit >> 1
+        self.__value[lit] = 1
+        self.__value[lit ^ 1] = -1
+        self.__level[v] = len(self.__trail_lim)
+        self.__reason[v] = reason
+        self.__trail.append(lit)
+    
+    def __add_clause(self, literals: list) -> bool:
+        """Attach an input clause; return False if it is already falsified at level 0"""
+        if not literals:
+            return False
+        if len(literals) == 1:
+            lit = literals[0]
+            if self.__value[lit] == -1:
+                return False
+            if self.__value[lit] == 0:
+                self.__assign(lit, None)
+            return True
+        self.__watches[literals[0]].append(literals)
+        self.__watches[literals[1]].append(literals)
+        return True
+    
+    def __propagate(self):
+        """Run unit propagation; return a conflicting clause, or None"""
+        value = self.__value
+        watches = self.__watches
+        trail = self.__trail
+        while self.__queue_head < len(trail):
+            false_lit = trail[self.__queue_head] ^ 1
+            self.__queue_head += 1
+            watchers = watches[false_lit]
+            kept = []
+            i = 0
+            while i < len(watchers):
+                clause = watchers[i]
+                i += 1
+                # Keep the false watched literal in position 1
+                if clause[0] == false_lit:
+                    clause[0], clause[1] = clause[1], clause[0]
+                if value[clause[0]] == 1:
+                    kept.append(clause)
+                    continue
+                for k in range(2, len(clause)):
+                    if value[clause[k]] != -1:
+                        clause[1], clause[k] = clause[k], clause[1]
+                        watches[clause[1]].append(clause)
+                        break
+                else:
+                    kept.append(clause)
+                    if value[clause[0]] == -1:
+                        kept.extend(watchers[i:])
+                        watches[false_lit] = kept
+                        return clause
+                    self.__assign(clause[0], clause)
+            watches[false_lit] = kept
+        return None
+    
+    def __bump(self, v: int) -> None:
+        """Increase the VSIDS activity of variable v"""
+        self.__activity[v] += self.__activity_inc
+        if self.__activity[v] > 1e100:
+            self.__activity = [a * 1e-100 for a in self.__activity]
+            self.__activity_inc *= 1e-100
+            self.__order = [(-self.__activity[u], u) for u in range(self.__num_vars)]
+            heapq.heapify(self.__order)
+        heapq.heappush(self.__order, (-self.__activity[v], v))
+    
+    def __analyze(self, conflict: list) -> tuple:
+        """Derive the first-UIP learned clause and the level to backjump to"""
+        current_level = len(self.__trail_lim)
+        seen = [False] * self.__num_vars
+        learned = [None]
+        pending = 0
+        lit = None
+        index = len(self.__trail) - 1
+        clause = conflict
+        while True:
+            for q in clause:
+                if lit is not None and q == lit:
+                    continue
+                v = q >> 1
+                if not seen[v] and self.__level[v] > 0:
+                    seen[v] = True
+                    self.__bump(v)
+                    if self.__level[v] == current_level:
+                        pending += 1
+                    else:
+                        learned.append(q)
+            # Walk back to the next marked literal on the trail
+            while not seen[self.__trail[index] >> 1]:
+                index -= 1
+            lit = self.__trail[index]
+            index -= 1
+            seen[lit >> 1] = False
+            pending -= 1
+            if pending == 0:
+                break
+            clause = self.__reason[lit >> 1]
+        learned[0] = lit ^ 1
+        
+        if len(learned) == 1:
+            return learned, 0
+        # Watch the literal from the highest remaining level second
+        highest = max(range(1, len(learned)), key=lambda k: self.__level[learned[k] >> 1])
+        learned[1], learned[highest] = learned[highest], learned[1]
+        return learned, self.__level[learned[1] >> 1]
+    
+    def __backjump(self, level: int) -> None:
+        """Undo every assignment above the given decision level"""
+        if len(self.__trail_lim) <= level:
+            return
+        start = self.__trail_lim[level]
+        for lit in self.__trail[start:]:
+            v = lit >> 1
+            self.__saved_phase[v] = lit & 1
+            self.__value[lit] = 0
+            self.__value[lit ^ 1] = 0
+            self.__reason[v] = None
+            heapq.heappush(self.__order, (-self.__activity[v], v))
+        del self.__trail[start:]
+        del self.__trail_lim[level:]
+        self.__queue_head = start
+    
+    def __pick_branch_variable(self):
+        """Return the unassigned variable with the highest activity, or None"""
+        while self.__order:
+            _, v = heapq.heappop(self.__order)
+            if self.__value[2 * v] == 0:
+                return v
+        return None
+    
+    @staticmethod
+    def __luby(i: int) -> int:
+        """Return the i-th element (counting from 0) of the Luby sequence 1, 1, 2, 1, 1, 2, 4, ..."""
+        size, power = 1, 0
+        while size < i + 1:
+            power += 1
+            size = 2 * size + 1
+        while size - 1 != i:
+            size = (size - 1) >> 1
+            power -= 1
+            i %= size
+        return 1 << power
+    
+    def solve(self):
+        """
+        Decide satisfiability of the clauses. A solver instance can only be solved once.
+        
+        Returns:
+            None if the clauses are unsatisfiable, otherwise a satisfying assignment as a
+            dict mapping each letter that occurs in the clauses to True or False
+        """
+        heapq.heapify(self.__order)
+        for literals in self.__clauses:
+            if not self.__add_clause(literals):
+                return None
+        
+        restarts = 0
+        conflicts_until_restart = self.RESTART_BASE * self.__luby(restarts)
+        while True:
+            conflict = self.__propagate()
+            if conflict is not None:
+                if not self.__trail_lim:
+                    return None
+                learned, level = self.__analyze(conflict)
+                self.__backjump(level)
+                if len(learned) == 1:
+                    self.__assign(learned[0], None)
+                else:
+                    self.__watches[learned[0]].append(learned)
+                    self.__watches[learned[1]].append(learned)
+                    self.__assign(learned[0], learned)
+                self.__activity_inc *= self.ACTIVITY_DECAY
+                conflicts_until_restart -= 1
+                continue
+            
+            if conflicts_until_restart <= 0:
+                restarts += 1
+                conflicts_until_restart = self.RESTART_BASE * self.__luby(restarts)
+                self.__backjump(0)
+                continue
+            
+            v = self.__pick_branch_variable()
+            if v is None:
+                return {letter: self.__value[2 * v] == 1 for v, letter in enumerate(self.__letters)}
+            self.__trail_lim.append(len(self.__trail))
+            self.__assign(2 * v + self.__saved_phase[v], None)
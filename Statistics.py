@@ -0,0 +1,49 @@
+import time
+
+class Statistics:
+    """
+    Counters and phase timings collected by a ResolutionModel with statistics enabled.
+    
+    The counters are plain attributes so the engine can update them cheaply:
+        resolutions_attempted: Resolution steps tried by resolve() or saturate()
+        resolvents_kept: Resolvents added to the model
+        duplicates: Resolvents discarded because an equal clause was already in the model
+        tautologies: Resolvents discarded (by saturate()) because they are tautologies
+        subsumed: Resolvents discarded by forward subsumption
+        max_clauses: Largest number of clauses the model has held
+        phase_seconds: Cumulative seconds spent per phase, keyed by the names in PHASES
+    """
+    
+    PHASES = ("parse", "resolve", "dedup", "proof")
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self) -> None:
+        """Set every counter and timing back to zero"""
+        self.resolutions_attempted = 0
+        self.resolvents_kept = 0
+        self.duplicates = 0
+        self.tautologies = 0
+        self.subsumed = 0
+        self.max_clauses = 0
+        self.phase_seconds = dict.fromkeys(self.PHASES, 0.0)
+    
+    def add_time(self, phase: str, start: float) -> None:
+        """Add the time elapsed since start (a time.perf_counter() value) to phase"""
+        self.phase_seconds[phase] += time.perf_counter() - start
+    
+    def to_dict(self) -> dict:
+        """Return the statistics as a JSON-serializable dict"""
+        return {
+            "resolutions_attempted": self.resolutions_attempted,
+            "resolvents_kept": self.resolvents_kept,
+            "duplicates": self.duplicates,
+            "tautologies": self.tautologies,
+            "subsumed": self.subsumed,
+            "max_clauses": self.max_clauses,
+            "phase_seconds": dict(self.phase_seconds),
+        }
+    
+    def __repr__(self) -> str:
+        return f"Statistics({self.to_dict()!r})"
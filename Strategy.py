@@ -0,0 +1,167 @@
+import heapq
+from Clause import Clause
+
+class Strategy:
+    """
+    Base class for the clause-selection strategies used by ResolutionModel.saturate().
+    
+    A strategy is the passive queue of the given-clause loop: saturate() pushes clause
+    indices into it and pops the next given clause from it. It also decides which input
+    clauses start out passive and which resolution steps are allowed. Strategies keep
+    state, so each saturate() run needs a fresh instance.
+    
+    The base class selects clauses oldest first.
+    """
+    
+    def __init__(self):
+        self.__heap = []
+    
+    def key(self, clause: Clause, age: int, depth: int) -> tuple:
+        """
+        Return the priority of a clause; smaller keys are selected first.
+        
+        Args:
+            clause: The clause
+            age: The clause's index in the model (older clauses have smaller ages)
+            depth: Number of resolution steps on the longest path from an input clause
+        """
+        return (age,)
+    
+    def push(self, index: int, clause: Clause, depth: int) -> None:
+        """Add the clause at index to the passive queue"""
+        heapq.heappush(self.__heap, (self.key(clause, index, depth), index))
+    
+    def pop(self) -> int:
+        """Remove and return the index of the next given clause"""
+        return heapq.heappop(self.__heap)[1]
+    
+    def __len__(self) -> int:
+        return len(self.__heap)
+    
+    def starts_passive(self, clause: Clause, is_goal: bool, has_goals: bool) -> bool:
+        """
+        Return True if an input clause should be queued, False to make it active right away.
+        
+        Args:
+            clause: The input clause
+            is_goal: Whether the clause is marked as a goal clause
+            has_goals: Whether the model marks any goal clauses at all
+        """
+        return True
+    
+    def allows(self, given: Clause, partner: Clause, bit: int) -> bool:
+        """Return True if given and partner may be resolved on the letter with the given bit"""
+        return True
+
+
+class UnitPreferenceStrategy(Strategy):
+    """Select unit clauses (and the empty clause) before longer ones, oldest first otherwise"""
+    
+    def key(self, clause: Clause, age: int, depth: int) -> tuple:
+        return (len(clause) > 1, age)
+
+
+class SmallestFirstStrategy(Strategy):
+    """Select the clause with the fewest literals, breaking ties by age"""
+    
+    def key(self, clause: Clause, age: int, depth: int) -> tuple:
+        return (len(clause), age)
+
+
+class WeightAgeStrategy(Strategy):
+    """
+    Select by weight (number of literals, then depth) ratio times, then once by age.
+    
+    Picking the oldest clause every so often keeps heavy but old clauses from
+    starving, which plain smallest-first can do.
+    """
+    
+    def __init__(self, ratio: int = 4):
+        """
+        Args:
+            ratio: Number of weight picks per age pick (must be positive)
+        """
+        super().__init__()
+        if ratio < 1:
+            raise ValueError(f"ratio must be positive, got: {ratio}")
+        self.__ratio = ratio
+        self.__picks = 0
+        self.__by_weight = []
+        self.__by_age = []
+        self.__selected = set()
+        self.__pending = 0
+    
+    def push(self, index: int, clause: Clause, depth: int) -> None:
+        heapq.heappush(self.__by_weight, (len(clause), depth, index))
+        heapq.heappush(self.__by_age, index)
+        self.__pending += 1
+    
+    def pop(self) -> int:
+        self.__picks += 1
+        self.__pending -= 1
+        use_age = self.__picks % (self.__ratio + 1) == 0
+        while True:
+            if use_age:
+                index = heapq.heappop(self.__by_age)
+            else:
+                index = heapq.heappop(self.__by_weight)[2]
+            # Each clause sits in both heaps; skip the copy left behind by the other one
+            if index not in self.__selected:
+                self.__selected.add(index)
+                return index
+    
+    def __len__(self) -> int:
+        return self.__pending
+
+
+class SetOfSupportStrategy(Strategy):
+    """
+    Set-of-support resolution: every step must involve a goal clause or a descendant of one.
+    
+    Non-goal input clauses start out active and are never selected, so they are only
+    ever resolved against the set of support. If the model has no goal clauses every
+    input clause is treated as support.
+    """
+    
+    def starts_passive(self, clause: Clause, is_goal: bool, has_goals: bool) -> bool:
+        return is_goal or not has_goals
+
+
+class OrderedStrategy(Strategy):
+    """
+    Ordered resolution: only resolve on a letter that is the last letter (in var_id order,
+    which is alphabetical for A to Z) of both clauses. Clauses are selected oldest first.
+    """
+    
+    def allows(self, given: Clause, partner: Clause, bit: int) -> bool:
+        given_letters = given.positive_mask | given.negative_mask
+        partner_letters = partner.positive_mask | partner.negative_mask
+        return given_letters.bit_length() == partner_letters.bit_length() == bit.bit_length()
+
+
+# Strategies selectable by name in ResolutionModel.saturate()
+STRATEGIES = {
+    "fifo": Strategy,
+    "unit": UnitPreferenceStrategy,
+    "smallest": SmallestFirstStrategy,
+    "weight-age": WeightAgeStrategy,
+    "sos": SetOfSupportStrategy,
+    "ordered": OrderedStrategy,
+}
+
+
+def get_strategy(strategy) -> Strategy:
+    """
+    Return a fresh Strategy for a name in STRATEGIES, or the given Strategy instance.
+    
+    Raises:
+        ValueError: If the name is unknown
+        TypeError: If strategy is neither a string nor a Strategy
+    """
+    if isinstance(strategy, Strategy):
+        return strategy
+    if isinstance(strategy, str):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"unknown strategy '{strategy}', expected one of: {', '.join(STRATEGIES)}")
+        return STRATEGIES[strategy]()
+    raise TypeError(f"strategy must be a name or a Strategy, got: {type(strategy).__name__}")
@@ -1,10 +1,18 @@
+import os
+import sqlite3
 import streamlit as st
 import width
 import ResolutionModel as resolve
+from ResultCache import ResultCache, replay_proof
+
+@st.cache_resource
+def get_result_cache():
+    # Shared by every session, so repeated exercises are looked up instead of recomputed
+    return ResultCache(os.environ.get("RESOLUTION_CACHE_PATH", "resolution_cache.sqlite3"))
 
 if 'has_clause' not in st.session_state:
         st.session_state.has_clause = False
-    
+
 if 'first_clause' not in st.session_state:
     st.session_state.first_clause = None
 
@@ -20,23 +28,31 @@ if 'model' not in st.session_state:
 if 'clauses' not in st.session_state:
     st.session_state.clauses = None
 
+if 'assignment' not in st.session_state:
+    st.session_state.assignment = None
+
+if 'hint' not in st.session_state:
+    st.session_state.hint = None
+
 if st.session_state.current_state == 1:
 
     input = st.text_input("Enter clauses in the format {A,B} {~A,C} {~B,~C,D}")
     tryStart = st.button("Submit")
-
-
+    
+    
     if tryStart:
         try:
-            st.session_state.model = resolve.ResolutionModel.parse(input)
+            st.session_state.model = resolve.ResolutionModel.parse(input, statistics=True)
+            # CDCL answers satisfiability faster than a cache lookup could
+            st.session_state.assignment = st.session_state.model.satisfying_assignment()
             if st.session_state.model.num_clauses() > 0:
                 st.session_state.current_state = 2
                 st.rerun()
         except (ValueError) as e:
             st.error("Invalid format, try again.")
-        
-    
-    
+
+
+
 
 if st.session_state.current_state == 2:
     col1, col2 = st.columns([5, 1])
@@ -49,36 +65,88 @@ if st.session_state.current_state == 2:
             st.session_state.second_clause = None
             st.session_state.model = None
             st.session_state.clauses = None
+            st.session_state.assignment = None
             st.rerun()
-
+        undo = st.button("Undo", type="tertiary", disabled=st.session_state.model.version == 0)
+        if undo:
+            st.session_state.model.undo()
+            st.session_state.has_clause = False
+            st.session_state.first_clause = None
+            st.rerun()
+        redo = st.button("Redo", type="tertiary", disabled=st.session_state.model.version + 1 >= st.session_state.model.num_versions())
+        if redo:
+            st.session_state.model.redo()
+            st.session_state.has_clause = False
+            st.session_state.first_clause = None
+            if any(len(c.get_literals()) == 0 for c in st.session_state.model.get_clauses()):
+                st.session_state.current_state = 4
+            st.rerun()
+        solve = st.button("Solve", type="tertiary")
+        if solve:
+            st.session_state.has_clause = False
+            st.session_state.first_clause = None
+            if st.session_state.assignment is not None:
+                st.warning("No contradiction can be derived from these clauses.")
+            else:
+                # A cached refutation is replayed instead of saturating again; if the cache is
+                # unusable, saturate directly
+                try:
+                    proof = get_result_cache().solve(st.session_state.model)["proof"]
+                    if proof is not None:
+                        replay_proof(st.session_state.model, proof)
+                    refuted = proof is not None
+                except (sqlite3.Error, ValueError):
+                    refuted = st.session_state.model.saturate(max_clauses=ResultCache.SATURATION_LIMIT, strategy="unit")
+                if refuted:
+                    st.session_state.current_state = 4
+                    st.rerun()
+                else:
+                    st.warning(f"No contradiction was found within {ResultCache.SATURATION_LIMIT} clauses.")
+        hint = st.button("Hint", type="tertiary")
+        if hint:
+            # Keep the clauses so the hint disappears once the model changes
+            st.session_state.hint = (st.session_state.model.get_clauses(), st.session_state.model.suggest_next_step())
+    
     with col1:
+        if st.session_state.assignment is not None:
+            satisfying = ", ".join(f"{letter}={value}" for letter, value in sorted(st.session_state.assignment.items()))
+            st.info(f"These clauses are satisfiable ({satisfying}), so no contradiction can be derived.")
+        if st.session_state.hint is not None and st.session_state.hint[0] == st.session_state.model.get_clauses():
+            clauses, suggestion = st.session_state.hint
+            if suggestion is None:
+                st.info("No resolution step leads to a contradiction.")
+            else:
+                index1, index2, literal, steps = suggestion
+                remaining = f" ({steps} steps to the empty clause)" if steps is not None else ""
+                st.info(f"Hint: resolve {clauses[index1]} and {clauses[index2]} on {literal}{remaining}.")
         if st.session_state.has_clause:
         # Display the two clauses being resolved
             clause1 = st.session_state.model.get_clauses()[st.session_state.first_clause]
             st.write(f"Resolving: {clause1} and ...")
         else:
             st.write("Resolving: ... and ...")
-
+        
         st.session_state.clauses = st.session_state.model.get_clauses()
-
+        
         grid = []
-
+        
         width = width.width(len(st.session_state.clauses))
-
+        
         for i in range(width):
             grid.append(st.columns(width))
-
-
+        
+        
         # TODO add has started, has finished to session states, add states for initializing vs. carrying on model
-
+        
         def click_button(index: int):
             if st.session_state.has_clause:
-                if (st.session_state.model.numResolveLiterals(st.session_state.first_clause, index) == 0):
+                num_pairs = st.session_state.model.numResolveLiterals(st.session_state.first_clause, index)
+                if (num_pairs == 0):
                     st.warning("These clauses cannot be resolved on any literal-negation pair.")
                     st.session_state.first_clause = None
                     st.session_state.has_clause = False
                     return
-                if (st.session_state.model.numResolveLiterals(st.session_state.first_clause, index) == 1):
+                if (num_pairs == 1):
                     st.session_state.model.resolve(st.session_state.first_clause, index, st.session_state.model.getEasyLiteral(st.session_state.first_clause, index))
                     st.session_state.clauses = st.session_state.model.get_clauses()
                     if any(len(c.get_literals()) == 0 for c in st.session_state.clauses):
@@ -92,12 +160,12 @@ if st.session_state.current_state == 2:
                 st.session_state.first_clause = index
         
         st.session_state.clauses = st.session_state.model.get_clauses()
-
+        
         element = 0
         row = 0
         col = 0
         diagonal = 0
-
+        
         for diagonal in range(2*width):
             row = diagonal if diagonal < width else width - 1
             col = 0 if diagonal < width else diagonal - width + 1
@@ -107,6 +175,9 @@ if st.session_state.current_state == 2:
                     element += 1
                 row -= 1
                 col += 1
+        
+        with st.expander("Debug statistics"):
+            st.json(st.session_state.model.statistics.to_dict())
 
 
 if st.session_state.current_state == 3:
@@ -121,14 +192,15 @@ if st.session_state.current_state == 3:
             st.session_state.second_clause = None
             st.session_state.model = None
             st.session_state.clauses = None
+            st.session_state.assignment = None
             st.rerun()
-
+    
     with col1:        
         # Display the two clauses being resolved
         clause1 = st.session_state.model.get_clauses()[st.session_state.first_clause]
         clause2 = st.session_state.model.get_clauses()[st.session_state.second_clause]
         st.write(f"Resolving: {clause1} and {clause2}")
-
+        
         st.write("Select the literal to resolve on:")
         literals = st.session_state.model.get_literal_negation_pairs(st.session_state.first_clause, st.session_state.second_clause)
         for literal in literals:
@@ -139,14 +211,27 @@ if st.session_state.current_state == 3:
                 st.session_state.has_clause = False
                 if any(len(c.get_literals()) == 0 for c in st.session_state.clauses):
                         st.session_state.current_state = 4
-
+            
             st.button(f"{literal}", key=f"literal_{literal}", on_click=click_literal)
 
 if st.session_state.current_state == 4:
     st.write("Contradiction found, proof complete!")
     st.write("Proof of resolution steps:")
     proof = st.session_state.model.get_proof()
-    st.text(proof)
+    st.text(str(proof))
+    shorten = st.button("Shorten proof")
+    if shorten:
+        shorter, optimal = st.session_state.model.minimize_proof(budget=1.0)
+        note = "shortest possible" if optimal else "may not be the shortest"
+        st.write(f"Shortened proof ({shorter.num_resolutions()} resolution steps instead of {proof.num_resolutions()}, {note}):")
+        st.text(str(shorter))
+    with st.expander("Debug statistics"):
+        st.json(st.session_state.model.statistics.to_dict())
+    undo = st.button("Undo")
+    if undo:
+        st.session_state.model.undo()
+        st.session_state.current_state = 2
+        st.rerun()
     reset = st.button("Reset")
     if reset:
         st.session_state.current_state = 1
@@ -155,5 +240,6 @@ if st.session_state.current_state == 4:
         st.session_state.second_clause = None
         st.session_state.model = None
         st.session_state.clauses = None
+        st.session_state.assignment = None
         st.rerun()
 
@@ -0,0 +1,232 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from string import ascii_uppercase
+from Clause import Clause
+from ResolutionModel import ResolutionModel
+
+def _names(n: int) -> list:
+    """Return n variable names: letters for up to 26 variables, x_1, x_2, ... otherwise"""
+    if n <= len(ascii_uppercase):
+        return list(ascii_uppercase[:n])
+    return [f"x_{i}" for i in range(1, n + 1)]
+
+
+def _format(clauses: list) -> str:
+    """Format clauses given as lists of (name, is_negated) pairs in the input syntax of parse()"""
+    return " ".join("{" + ", ".join(("~" if negated else "") + name for name, negated in clause) + "}"
+                    for clause in clauses)
+
+
+def random_kcnf(n: int, k: int = 3, ratio: float = 4.26, seed: int = 0) -> str:
+    """
+    Random k-CNF over n variables with round(ratio * n) clauses, each on k distinct variables.
+    The default ratio is the satisfiability phase transition of random 3-CNF.
+    """
+    if k > n:
+        raise ValueError(f"k must be at most n, got: k={k}, n={n}")
+    rng = random.Random(seed)
+    names = _names(n)
+    clauses = []
+    for _ in range(round(ratio * n)):
+        clauses.append([(name, rng.random() < 0.5) for name in rng.sample(names, k)])
+    return _format(clauses)
+
+
+def pigeonhole(n: int) -> str:
+    """PHP(n): n + 1 pigeons in n holes, which is unsatisfiable"""
+    names = _names((n + 1) * n)
+    # names[i * n + j] says pigeon i sits in hole j
+    clauses = [[(names[i * n + j], False) for j in range(n)] for i in range(n + 1)]
+    for j in range(n):
+        for i in range(n + 1):
+            for other in range(i + 1, n + 1):
+                clauses.append([(names[i * n + j], True), (names[other * n + j], True)])
+    return _format(clauses)
+
+
+def tseitin_grid(n: int) -> str:
+    """
+    Tseitin parity formula on the n x n grid graph: every edge is a variable, and the edges
+    at each vertex must have odd parity at one corner and even parity elsewhere. The total
+    parity is odd, so the formula is unsatisfiable.
+    """
+    if n < 2:
+        raise ValueError(f"n must be at least 2, got: {n}")
+    edges = {}
+    for row in range(n):
+        for col in range(n):
+            if col + 1 < n:
+                edges[((row, col), (row, col + 1))] = len(edges)
+            if row + 1 < n:
+                edges[((row, col), (row + 1, col))] = len(edges)
+    names = _names(len(edges))
+    clauses = []
+    for row in range(n):
+        for col in range(n):
+            vertex = (row, col)
+            incident = [names[index] for edge, index in edges.items() if vertex in edge]
+            charge = vertex == (0, 0)
+            # Forbid every assignment of the incident edges with the wrong parity
+            for pattern in range(1 << len(incident)):
+                if bin(pattern).count("1") % 2 != charge:
+                    clauses.append([(name, bool(pattern >> bit & 1)) for bit, name in enumerate(incident)])
+    return _format(clauses)
+
+
+def implication_chain(n: int) -> str:
+    """The chain A1, A1 -> A2, ..., A(n-1) -> An, ~An, which is unsatisfiable"""
+    names = _names(n)
+    clauses = [[(names[0], False)]]
+    clauses += [[(names[i], True), (names[i + 1], False)] for i in range(n - 1)]
+    clauses.append([(names[-1], True)])
+    return _format(clauses)
+
+
+# Problem families and the sizes run by default
+FAMILIES = {
+    "random-3cnf": (random_kcnf, [5, 10, 15, 20]),
+    "pigeonhole": (pigeonhole, [2, 3, 4]),
+    "tseitin-grid": (tseitin_grid, [2, 3]),
+    "implication-chain": (implication_chain, [10, 50, 200]),
+}
+
+
+def _time(function, repeat: int) -> float:
+    """Return the fastest of repeat runs of function, in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark_instance(text: str, max_clauses: int = 2000, strategy: str = "unit", repeat: int = 3) -> dict:
+    """
+    Time the main operations on one problem instance.
+    
+    Args:
+        text: The clauses, in the input syntax of ResolutionModel.parse()
+        max_clauses: Cap on the model size during saturation
+        strategy: Clause-selection strategy for saturation
+        repeat: Number of runs per operation; the fastest is reported
+    
+    Returns:
+        A JSON-serializable dict with the instance size, per-operation timings in seconds,
+        the outcome of saturation and the engine statistics of the saturation run
+    """
+    model = ResolutionModel.parse(text)
+    clauses = model.get_clauses()
+    # Every clashing pair of input clauses, with a literal to resolve on
+    pairs = []
+    for i in range(len(clauses)):
+        for j in model.resolvable_partners(i):
+            if i < j:
+                pairs.append((i, j, model.getEasyLiteral(i, j)))
+    
+    def resolve_clauses():
+        for i, j, literal in pairs:
+            Clause.resolve(clauses[i], clauses[j], literal)
+    
+    def resolve_model():
+        fresh = ResolutionModel(clauses)
+        for i, j, literal in pairs:
+            fresh.resolve(i, j, literal)
+    
+    timings = {
+        "parse": _time(lambda: ResolutionModel.parse(text), repeat),
+        "clause_resolve": _time(resolve_clauses, repeat),
+        "model_resolve": _time(resolve_model, repeat),
+        "satisfying_assignment": _time(model.satisfying_assignment, repeat),
+        "canonical_form": _time(model.canonical_form, repeat),
+    }
+    
+    search = ResolutionModel(clauses, statistics=True)
+    start = time.perf_counter()
+    refuted = search.saturate(max_clauses=max_clauses, strategy=strategy)
+    timings["saturate"] = time.perf_counter() - start
+    if refuted:
+        timings["get_proof"] = _time(search.get_proof, repeat)
+    
+    return {
+        "variables": len({lit.var_id for clause in clauses for lit in clause.get_literals()}),
+        "clauses": len(clauses),
+        "resolvable_pairs": len(pairs),
+        "refuted": refuted,
+        "saturated_clauses": search.num_clauses(),
+        "proof_length": len(search.get_proof()) if refuted else None,
+        "timings": timings,
+        "statistics": search.statistics.to_dict(),
+    }
+
+
+def run_benchmarks(families: dict = None, max_clauses: int = 2000, strategy: str = "unit",
+                   repeat: int = 3, seed: int = 0) -> dict:
+    """
+    Benchmark every size of every family.
+    
+    Args:
+        families: Optional dict mapping names from FAMILIES to lists of sizes (default: all
+            families at their default sizes)
+        max_clauses: Cap on the model size during saturation
+        strategy: Clause-selection strategy for saturation
+        repeat: Number of runs per operation; the fastest is reported
+        seed: Seed for the random families
+    
+    Returns:
+        A JSON-serializable dict describing the environment and holding one result per instance
+    
+    Raises:
+        ValueError: If a family name is unknown
+    """
+    if families is None:
+        families = {name: sizes for name, (_, sizes) in FAMILIES.items()}
+    results = []
+    for name, sizes in families.items():
+        if name not in FAMILIES:
+            raise ValueError(f"unknown family '{name}', expected one of: {', '.join(FAMILIES)}")
+        generator = FAMILIES[name][0]
+        for size in sizes:
+            text = generator(size, seed=seed) if generator is random_kcnf else generator(size)
+            result = {"family": name, "size": size}
+            result.update(benchmark_instance(text, max_clauses, strategy, repeat))
+            results.append(result)
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "settings": {"max_clauses": max_clauses, "strategy": strategy, "repeat": repeat, "seed": seed},
+        "results": results,
+    }
+
+
+def main(argv: list = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark resolution on standard problem families")
+    parser.add_argument("--family", action="append", choices=list(FAMILIES),
+                        help="family to run (repeatable; default: all)")
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        help="sizes to run instead of each family's defaults")
+    parser.add_argument("--max-clauses", type=int, default=2000)
+    parser.add_argument("--strategy", default="unit")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+    
+    names = args.family or list(FAMILIES)
+    families = {name: args.sizes or FAMILIES[name][1] for name in names}
+    report = run_benchmarks(families, args.max_clauses, args.strategy, args.repeat, args.seed)
+    if args.output:
+        with open(args.output, "w") as stream:
+            json.dump(report, stream, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()